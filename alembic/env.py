@@ -24,9 +24,20 @@ from models.projects import Projects
 from models.tasks import Tasks
 from models.task_assignees import TasksAssignees
 from models.task_logs import TaskLogs
-from connection.database import Base
+from models.sync_state import SyncState
+from models.user_task_versions import UserTaskVersion
+from models.rollups import UserDailyRollup, ProjectDailyRollup, TaskDailyRollup
+from models.task_logs_archive import TaskLogArchive
+from models.embedding_outbox import EmbeddingOutbox
+from models.open_timers import OpenTimer
+from models.sync_jobs import SyncJobRecord, SyncBatchRecord, SyncScheduleRecord
+from connection.database import DATABASE_URL, Base
 target_metadata = Base.metadata
 
+# migrate the database the app uses; sqlalchemy.url in alembic.ini is only a fallback
+if DATABASE_URL:
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -0,0 +1,99 @@
+"""initial schema
+
+Revision ID: 0c5e8a2f7b19
+Revises: fbc504733127
+Create Date: 2026-10-18 19:04:12.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c5e8a2f7b19'
+down_revision: Union[str, Sequence[str], None] = 'fbc504733127'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# databases created by the old Base.metadata.create_all() already have some or all of these tables
+TABLES = ('users', 'projects', 'tasks', 'tasks_assignees', 'task_logs')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('user_id', sa.Uuid(), nullable=False),
+            sa.Column('ace_user_id', sa.Integer(), nullable=False),
+            sa.Column('guid', sa.String(length=250), nullable=True),
+            sa.Column('email', sa.String(length=200), nullable=False),
+            sa.Column('role', sa.String(length=150), nullable=True),
+            sa.PrimaryKeyConstraint('user_id'),
+            sa.UniqueConstraint('ace_user_id'),
+            sa.UniqueConstraint('email'),
+        )
+    if 'projects' not in existing:
+        op.create_table(
+            'projects',
+            sa.Column('project_id', sa.Uuid(), nullable=False),
+            sa.Column('ace_project_id', sa.Integer(), nullable=False),
+            sa.Column('project_name', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.String(length=255), nullable=True),
+            sa.Column('start_date', sa.DateTime(), nullable=True),
+            sa.Column('end_date', sa.DateTime(), nullable=True),
+            sa.Column('supervisor_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['supervisor_id'], ['users.ace_user_id']),
+            sa.PrimaryKeyConstraint('project_id'),
+            sa.UniqueConstraint('ace_project_id'),
+        )
+    if 'tasks' not in existing:
+        # tasks.status is added by 98a1f5c29107
+        op.create_table(
+            'tasks',
+            sa.Column('task_id', sa.Uuid(), nullable=False),
+            sa.Column('ace_task_id', sa.Integer(), nullable=False),
+            sa.Column('task_title', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.String(length=255), nullable=True),
+            sa.Column('ace_project_id', sa.Integer(), nullable=True),
+            sa.Column('start_date', sa.DateTime(), nullable=True),
+            sa.Column('end_date', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['ace_project_id'], ['projects.ace_project_id']),
+            sa.PrimaryKeyConstraint('task_id'),
+            sa.UniqueConstraint('ace_task_id'),
+        )
+    if 'tasks_assignees' not in existing:
+        op.create_table(
+            'tasks_assignees',
+            sa.Column('task_assignee_id', sa.Uuid(), nullable=False),
+            sa.Column('ace_task_id', sa.Integer(), nullable=True),
+            sa.Column('assigned_at', sa.DateTime(), nullable=True),
+            sa.Column('ace_user_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['ace_task_id'], ['tasks.ace_task_id']),
+            sa.ForeignKeyConstraint(['ace_user_id'], ['users.ace_user_id']),
+            sa.PrimaryKeyConstraint('task_assignee_id'),
+        )
+    if 'task_logs' not in existing:
+        op.create_table(
+            'task_logs',
+            sa.Column('log_id', sa.Uuid(), nullable=False),
+            sa.Column('ace_task_id', sa.Integer(), nullable=True),
+            sa.Column('user_id', sa.Uuid(), nullable=True),
+            sa.Column('duration', sa.Float(), nullable=True),
+            sa.Column('comment', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=True),
+            sa.Column('start_time', sa.DateTime(), nullable=True),
+            sa.Column('end_time', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['ace_task_id'], ['tasks.ace_task_id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+            sa.PrimaryKeyConstraint('log_id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_table(table)
@@ -0,0 +1,37 @@
+"""sync_state watermarks
+
+Revision ID: 3c7d2a91e4b8
+Revises: 98a1f5c29107
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d2a91e4b8'
+down_revision: Union[str, Sequence[str], None] = '98a1f5c29107'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_state',
+        sa.Column('sync_state_id', sa.Uuid(), nullable=False),
+        sa.Column('guid', sa.String(length=250), nullable=False),
+        sa.Column('entity', sa.String(length=50), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sync_state_id'),
+        sa.UniqueConstraint('guid', 'entity', name='uq_sync_state_guid_entity'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_state')
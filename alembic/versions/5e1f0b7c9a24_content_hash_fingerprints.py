@@ -0,0 +1,32 @@
+"""content_hash fingerprints
+
+Revision ID: 5e1f0b7c9a24
+Revises: 3c7d2a91e4b8
+Create Date: 2026-10-18 10:41:07.918342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f0b7c9a24'
+down_revision: Union[str, Sequence[str], None] = '3c7d2a91e4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('projects', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('tasks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'content_hash')
+    op.drop_column('projects', 'content_hash')
+    op.drop_column('users', 'content_hash')
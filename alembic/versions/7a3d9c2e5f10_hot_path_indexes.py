@@ -0,0 +1,63 @@
+"""hot path indexes
+
+Revision ID: 7a3d9c2e5f10
+Revises: 5e1f0b7c9a24
+Create Date: 2026-10-18 19:05:32.614027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3d9c2e5f10'
+down_revision: Union[str, Sequence[str], None] = '5e1f0b7c9a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TIMER = sa.text('end_time IS NULL')
+
+
+def dedupe_assignees() -> None:
+    """Drop duplicate (ace_task_id, ace_user_id) rows so the unique constraint can be added."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            'DELETE FROM tasks_assignees a USING tasks_assignees b '
+            'WHERE a.ace_task_id = b.ace_task_id AND a.ace_user_id = b.ace_user_id AND a.ctid > b.ctid'
+        )
+    elif dialect == 'mysql':
+        op.execute(
+            'DELETE a FROM tasks_assignees a JOIN tasks_assignees b '
+            'ON a.ace_task_id = b.ace_task_id AND a.ace_user_id = b.ace_user_id '
+            'AND a.task_assignee_id > b.task_assignee_id'
+        )
+    else:
+        op.execute(
+            'DELETE FROM tasks_assignees WHERE rowid NOT IN '
+            '(SELECT MIN(rowid) FROM tasks_assignees GROUP BY ace_task_id, ace_user_id)'
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dedupe_assignees()
+    with op.batch_alter_table('tasks_assignees') as batch_op:
+        batch_op.create_unique_constraint('uq_tasks_assignees_task_user', ['ace_task_id', 'ace_user_id'])
+    op.create_index('ix_tasks_assignees_user_task', 'tasks_assignees', ['ace_user_id', 'ace_task_id'])
+    op.create_index('ix_tasks_ace_project_id', 'tasks', ['ace_project_id'])
+    op.create_index(
+        'ix_task_logs_open_timer', 'task_logs', ['ace_task_id', 'user_id', 'end_time'],
+        postgresql_where=OPEN_TIMER, sqlite_where=OPEN_TIMER,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_logs_open_timer', table_name='task_logs')
+    op.drop_index('ix_tasks_ace_project_id', table_name='tasks')
+    op.drop_index('ix_tasks_assignees_user_task', table_name='tasks_assignees')
+    with op.batch_alter_table('tasks_assignees') as batch_op:
+        batch_op.drop_constraint('uq_tasks_assignees_task_user', type_='unique')
@@ -1,7 +1,7 @@
 """Status attribute added
 
 Revision ID: 98a1f5c29107
-Revises: fbc504733127
+Revises: 0c5e8a2f7b19
 Create Date: 2025-09-09 14:22:59.458798
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = '98a1f5c29107'
-down_revision: Union[str, Sequence[str], None] = 'fbc504733127'
+down_revision: Union[str, Sequence[str], None] = '0c5e8a2f7b19'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
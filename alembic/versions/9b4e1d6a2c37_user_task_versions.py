@@ -0,0 +1,34 @@
+"""user_task_versions
+
+Revision ID: 9b4e1d6a2c37
+Revises: 7a3d9c2e5f10
+Create Date: 2026-10-18 19:48:15.270194
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e1d6a2c37'
+down_revision: Union[str, Sequence[str], None] = '7a3d9c2e5f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_task_versions',
+        sa.Column('ace_user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('ace_user_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_task_versions')
@@ -0,0 +1,66 @@
+"""open timers table
+
+Revision ID: a9c4e2b7d518
+Revises: f3a6c8e1b254
+Create Date: 2026-10-19 09:14:52.407316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e2b7d518'
+down_revision: Union[str, Sequence[str], None] = 'f3a6c8e1b254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TIMER = sa.text('end_time IS NULL')
+
+
+def backfill_open_timers() -> None:
+    """One row per (task, user) with a running timer; the latest one wins if there are several."""
+    rows = op.get_bind().execute(sa.text(
+        'SELECT ace_task_id, user_id, log_id, start_time FROM task_logs '
+        'WHERE end_time IS NULL AND ace_task_id IS NOT NULL AND user_id IS NOT NULL '
+        'ORDER BY start_time'
+    )).mappings()
+    latest = {(row['ace_task_id'], row['user_id']): dict(row) for row in rows}
+    if latest:
+        op.bulk_insert(open_timers_table(), list(latest.values()))
+
+
+def open_timers_table() -> sa.Table:
+    return sa.table(
+        'open_timers',
+        sa.column('ace_task_id', sa.Integer()),
+        sa.column('user_id', sa.Uuid()),
+        sa.column('log_id', sa.Uuid()),
+        sa.column('start_time', sa.DateTime()),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'open_timers',
+        sa.Column('ace_task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('log_id', sa.Uuid(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('ace_task_id', 'user_id'),
+    )
+    backfill_open_timers()
+    # start_task and the batch endpoint now find open timers through open_timers
+    op.drop_index('ix_task_logs_open_timer', table_name='task_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_task_logs_open_timer', 'task_logs', ['ace_task_id', 'user_id', 'end_time'],
+        postgresql_where=OPEN_TIMER, sqlite_where=OPEN_TIMER,
+    )
+    op.drop_table('open_timers')
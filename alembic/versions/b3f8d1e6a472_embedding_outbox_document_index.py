@@ -0,0 +1,30 @@
+"""embedding outbox document index
+
+Revision ID: b3f8d1e6a472
+Revises: a9c4e2b7d518
+Create Date: 2026-10-19 10:02:38.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f8d1e6a472'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e2b7d518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_embedding_outbox_document', 'embedding_outbox', ['collection', 'document_id', 'outbox_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_embedding_outbox_document', table_name='embedding_outbox')
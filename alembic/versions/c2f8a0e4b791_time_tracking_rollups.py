@@ -0,0 +1,59 @@
+"""time tracking rollups
+
+Revision ID: c2f8a0e4b791
+Revises: 9b4e1d6a2c37
+Create Date: 2026-10-18 20:31:52.804611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a0e4b791'
+down_revision: Union[str, Sequence[str], None] = '9b4e1d6a2c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rollup_user_daily',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_duration', sa.Float(), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+    op.create_table(
+        'rollup_project_daily',
+        sa.Column('ace_project_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_duration', sa.Float(), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('ace_project_id', 'day'),
+    )
+    op.create_table(
+        'rollup_task_daily',
+        sa.Column('ace_task_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('ace_project_id', sa.Integer(), nullable=False),
+        sa.Column('total_duration', sa.Float(), nullable=False),
+        sa.Column('log_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('ace_task_id', 'user_id', 'day'),
+    )
+    op.create_index('ix_rollup_task_daily_user_day', 'rollup_task_daily', ['user_id', 'day'])
+    op.create_index('ix_rollup_task_daily_project_day', 'rollup_task_daily', ['ace_project_id', 'day'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rollup_task_daily_project_day', table_name='rollup_task_daily')
+    op.drop_index('ix_rollup_task_daily_user_day', table_name='rollup_task_daily')
+    op.drop_table('rollup_task_daily')
+    op.drop_table('rollup_project_daily')
+    op.drop_table('rollup_user_daily')
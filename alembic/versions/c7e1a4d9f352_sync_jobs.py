@@ -0,0 +1,69 @@
+"""sync jobs, batches and schedules
+
+Revision ID: c7e1a4d9f352
+Revises: b3f8d1e6a472
+Create Date: 2026-10-19 10:41:27.630914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1a4d9f352'
+down_revision: Union[str, Sequence[str], None] = 'b3f8d1e6a472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_jobs',
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('guid', sa.String(length=250), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('trigger', sa.String(length=20), nullable=False),
+        sa.Column('full_resync', sa.Boolean(), nullable=False),
+        sa.Column('stream', sa.Boolean(), nullable=False),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('current_stage', sa.String(length=50), nullable=True),
+        sa.Column('stages', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_sync_jobs_status_created', 'sync_jobs', ['status', 'created_at'])
+    op.create_index('ix_sync_jobs_guid_status', 'sync_jobs', ['guid', 'status'])
+    op.create_table(
+        'sync_batches',
+        sa.Column('batch_id', sa.String(length=36), nullable=False),
+        sa.Column('job_ids', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id'),
+    )
+    op.create_table(
+        'sync_schedules',
+        sa.Column('guid', sa.String(length=250), nullable=False),
+        sa.Column('interval_minutes', sa.Integer(), nullable=False),
+        sa.Column('full_resync', sa.Boolean(), nullable=False),
+        sa.Column('stream', sa.Boolean(), nullable=False),
+        sa.Column('next_run_time', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('guid'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sync_schedules')
+    op.drop_table('sync_batches')
+    op.drop_index('ix_sync_jobs_guid_status', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_status_created', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
@@ -0,0 +1,28 @@
+"""task_logs start_time index
+
+Revision ID: d5a7c3f1e068
+Revises: c2f8a0e4b791
+Create Date: 2026-10-18 21:14:09.552180
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c3f1e068'
+down_revision: Union[str, Sequence[str], None] = 'c2f8a0e4b791'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_logs_start_time', 'task_logs', ['start_time', 'log_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_logs_start_time', table_name='task_logs')
@@ -0,0 +1,181 @@
+"""task_logs monthly partitioning and archive table
+
+Revision ID: e8b2d4f6a913
+Revises: d5a7c3f1e068
+Create Date: 2026-10-18 22:02:41.317554
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2d4f6a913'
+down_revision: Union[str, Sequence[str], None] = 'd5a7c3f1e068'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_TIMER = sa.text('end_time IS NULL')
+# monthly partitions created beyond the current month; the maintenance job keeps this topped up
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_months(table: str) -> list:
+    """Every month from the oldest row in ``table`` up to MONTHS_AHEAD past today."""
+    oldest = op.get_bind().execute(sa.text(f'SELECT MIN(start_time) FROM {table}')).scalar()
+    current = date.today().replace(day=1)
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+    months = []
+    while month <= add_months(current, MONTHS_AHEAD):
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def task_logs_columns() -> list:
+    return [
+        sa.Column('log_id', sa.Uuid(), nullable=False),
+        sa.Column('ace_task_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Uuid(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+    ]
+
+
+def create_task_logs_indexes() -> None:
+    op.create_index(
+        'ix_task_logs_open_timer', 'task_logs', ['ace_task_id', 'user_id', 'end_time'],
+        postgresql_where=OPEN_TIMER, sqlite_where=OPEN_TIMER,
+    )
+    op.create_index('ix_task_logs_start_time', 'task_logs', ['start_time', 'log_id'])
+
+
+def drop_task_logs_indexes(table: str = 'task_logs') -> None:
+    op.drop_index('ix_task_logs_open_timer', table_name=table)
+    op.drop_index('ix_task_logs_start_time', table_name=table)
+
+
+def mysql_foreign_keys() -> list:
+    """task_logs FKs were created by create_all, so their names are whatever MySQL generated."""
+    return sa.inspect(op.get_bind()).get_foreign_keys('task_logs')
+
+
+# -------- PostgreSQL --------
+def upgrade_postgresql() -> None:
+    # a partitioned table cannot be converted in place: build it next to the old one and copy
+    drop_task_logs_indexes()
+    op.rename_table('task_logs', 'task_logs_unpartitioned')
+    op.execute('ALTER TABLE task_logs_unpartitioned RENAME CONSTRAINT task_logs_pkey TO task_logs_unpartitioned_pkey')
+    op.create_table(
+        'task_logs',
+        *task_logs_columns(),
+        sa.ForeignKeyConstraint(['ace_task_id'], ['tasks.ace_task_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('log_id', 'start_time'),
+        postgresql_partition_by='RANGE (start_time)',
+    )
+    op.execute('CREATE TABLE task_logs_default PARTITION OF task_logs DEFAULT')
+    for month in partition_months('task_logs_unpartitioned'):
+        op.execute(
+            f"CREATE TABLE task_logs_p{month:%Y%m} PARTITION OF task_logs "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+    op.execute('INSERT INTO task_logs SELECT * FROM task_logs_unpartitioned')
+    op.drop_table('task_logs_unpartitioned')
+    create_task_logs_indexes()
+
+
+def downgrade_postgresql() -> None:
+    drop_task_logs_indexes()
+    op.rename_table('task_logs', 'task_logs_partitioned')
+    op.create_table(
+        'task_logs',
+        *task_logs_columns(),
+        sa.ForeignKeyConstraint(['ace_task_id'], ['tasks.ace_task_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('log_id', name='task_logs_pkey_unpartitioned'),
+    )
+    op.execute('INSERT INTO task_logs SELECT * FROM task_logs_partitioned')
+    # dropping the parent drops every partition with it
+    op.drop_table('task_logs_partitioned')
+    op.execute('ALTER TABLE task_logs RENAME CONSTRAINT task_logs_pkey_unpartitioned TO task_logs_pkey')
+    create_task_logs_indexes()
+
+
+# -------- MySQL --------
+def upgrade_mysql() -> None:
+    # InnoDB does not allow foreign keys on partitioned tables, and every unique key
+    # (the primary key included) has to contain the partitioning column
+    for fk in mysql_foreign_keys():
+        op.drop_constraint(fk['name'], 'task_logs', type_='foreignkey')
+    op.execute('ALTER TABLE task_logs DROP PRIMARY KEY, ADD PRIMARY KEY (log_id, start_time)')
+    ranges = ', '.join(
+        f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d}')"
+        for month in partition_months('task_logs')
+    )
+    op.execute(
+        f'ALTER TABLE task_logs PARTITION BY RANGE COLUMNS(start_time) '
+        f'({ranges}, PARTITION pmax VALUES LESS THAN MAXVALUE)'
+    )
+
+
+def downgrade_mysql() -> None:
+    op.execute('ALTER TABLE task_logs REMOVE PARTITIONING')
+    op.execute('ALTER TABLE task_logs DROP PRIMARY KEY, ADD PRIMARY KEY (log_id)')
+    op.create_foreign_key(None, 'task_logs', 'tasks', ['ace_task_id'], ['ace_task_id'])
+    op.create_foreign_key(None, 'task_logs', 'users', ['user_id'], ['user_id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    # start_time becomes part of the key: give the (few) rows without one their end time
+    op.execute('UPDATE task_logs SET start_time = COALESCE(end_time, CURRENT_TIMESTAMP) WHERE start_time IS NULL')
+    with op.batch_alter_table('task_logs') as batch_op:
+        batch_op.alter_column('start_time', existing_type=sa.DateTime(), nullable=False)
+
+    if dialect == 'postgresql':
+        upgrade_postgresql()
+    elif dialect == 'mysql':
+        upgrade_mysql()
+
+    op.create_table(
+        'task_logs_archive',
+        sa.Column('log_id', sa.Uuid(), nullable=False),
+        sa.Column('ace_task_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Uuid(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('log_id'),
+    )
+    op.create_index('ix_task_logs_archive_start_time', 'task_logs_archive', ['start_time'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    op.drop_index('ix_task_logs_archive_start_time', table_name='task_logs_archive')
+    op.drop_table('task_logs_archive')
+
+    if dialect == 'postgresql':
+        downgrade_postgresql()
+    elif dialect == 'mysql':
+        downgrade_mysql()
+
+    with op.batch_alter_table('task_logs') as batch_op:
+        batch_op.alter_column('start_time', existing_type=sa.DateTime(), nullable=True)
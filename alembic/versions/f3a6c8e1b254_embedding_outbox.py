@@ -0,0 +1,43 @@
+"""embedding outbox
+
+Revision ID: f3a6c8e1b254
+Revises: e8b2d4f6a913
+Create Date: 2026-10-18 22:47:15.208391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6c8e1b254'
+down_revision: Union[str, Sequence[str], None] = 'e8b2d4f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'embedding_outbox',
+        sa.Column('outbox_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+        sa.Column('collection', sa.String(length=100), nullable=False),
+        sa.Column('document_id', sa.String(length=64), nullable=False),
+        sa.Column('document', sa.Text(), nullable=False),
+        sa.Column('document_metadata', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('outbox_id'),
+    )
+    op.create_index('ix_embedding_outbox_status_available', 'embedding_outbox', ['status', 'available_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_embedding_outbox_status_available', table_name='embedding_outbox')
+    op.drop_table('embedding_outbox')
@@ -0,0 +1,62 @@
+import threading
+from typing import Any, Dict, Iterable, Optional
+from cachetools import TTLCache
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+# short on purpose: role or email changes made outside login show up within this many seconds
+AUTH_PRINCIPAL_CACHE_TTL = int(os.getenv('AUTH_PRINCIPAL_CACHE_TTL', '60'))
+AUTH_PRINCIPAL_CACHE_SIZE = int(os.getenv('AUTH_PRINCIPAL_CACHE_SIZE', '10000'))
+
+
+class PrincipalCache:
+    """Column values of the ``Users`` row behind a token subject (the user's guid).
+
+    Only plain values are stored, never ORM instances, so nothing cached is
+    tied to a session or shared between requests. ``UserService`` drops a
+    subject's entry whenever a login rewrites the row.
+    """
+
+    def __init__(self, maxsize: int = AUTH_PRINCIPAL_CACHE_SIZE, ttl: int = AUTH_PRINCIPAL_CACHE_TTL):
+        self._users: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            values = self._users.get(subject)
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return values
+
+    def set(self, subject: str, values: Dict[str, Any]):
+        with self._lock:
+            self._users[subject] = values
+
+    def invalidate(self, subjects: Iterable[Optional[str]]):
+        with self._lock:
+            for subject in subjects:
+                if subject is not None:
+                    self._users.pop(subject, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._users),
+        }
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
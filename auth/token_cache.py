@@ -0,0 +1,70 @@
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+from cachetools import TLRUCache
+from dotenv import load_dotenv
+import os
+
+from auth.jwt_handler import decode_token
+
+load_dotenv()
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', '10000'))
+
+
+def token_digest(token: str) -> str:
+    # the raw token is never kept in memory as a key
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """Claims of already verified JWTs, keyed by token digest.
+
+    A token's signature and claims cannot change, so once ``decode_token``
+    accepted it the result stays valid until the token's own ``exp``; each
+    entry expires exactly then. Tokens without ``exp`` are verified every
+    time. Rejected tokens are never cached.
+    """
+
+    def __init__(self, maxsize: int = AUTH_TOKEN_CACHE_SIZE):
+        self._claims: TLRUCache = TLRUCache(maxsize=maxsize, ttu=lambda _key, claims, _now: claims["exp"], timer=time.time)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims; raises ``JWTError`` like ``decode_token``."""
+        key = token_digest(token)
+        with self._lock:
+            claims = self._claims.get(key)
+            if claims is not None:
+                self.hits += 1
+                return claims
+            self.misses += 1
+        claims = decode_token(token)
+        if isinstance(claims.get("exp"), (int, float)):
+            with self._lock:
+                self._claims[key] = claims
+        return claims
+
+    def clear(self):
+        with self._lock:
+            self._claims.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._claims),
+        }
+
+
+_token_cache: Optional[VerifiedTokenCache] = None
+
+def get_token_cache() -> VerifiedTokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache()
+    return _token_cache
@@ -0,0 +1,115 @@
+"""Per-request cost of authentication (middleware + get_current_user).
+
+Usage:
+    python -m benchmarks.bench_auth [--requests 20000] [--budget-us 1000]
+
+Drives ``AuthContextMiddleware`` directly as an ASGI app around a no-op
+endpoint, so only the auth work is timed, and resolves the principal
+through ``get_current_user``. Three paths are reported:
+
+    baseline   the no-op endpoint without the middleware
+    cold       every token verified from scratch and the user loaded from the database
+    warm       verified-claims and principal caches hit (the steady state)
+
+Exits non-zero when the warm p95 overhead exceeds ``--budget-us``.
+Uses an in-memory SQLite database and a throwaway signing key.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from uuid import uuid4
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+from fastapi import Request
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from auth.jwt_handler import create_access_token
+from auth.principal_cache import get_principal_cache
+from auth.token_cache import get_token_cache
+from connection.database import Base
+from dependencies.auth_dependencies import get_current_user
+from middleware.auth_context import AuthContextMiddleware
+from models.users import Users
+
+
+SUBJECT = str(uuid4())
+# the scope the endpoint received, i.e. what a route handler would see
+received = {}
+
+
+async def endpoint(scope, receive, send):
+    received["scope"] = scope
+
+
+def make_scope(token: str) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/tasks/1",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode("latin-1"))],
+        "state": {},
+    }
+
+
+def percentiles(timings: list) -> tuple:
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95) - 1]
+
+
+async def run(app, token: str, db, requests: int, cold: bool, resolve_user: bool) -> list:
+    timings = []
+    for _ in range(requests):
+        if cold:
+            get_token_cache().clear()
+            get_principal_cache().invalidate([SUBJECT])
+        scope = make_scope(token)
+        started = time.perf_counter()
+        await app(scope, None, None)
+        if resolve_user:
+            get_current_user(Request(received["scope"]), db)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Users.__table__])
+    db = sessionmaker(bind=engine)()
+    db.execute(insert(Users), [{"user_id": uuid4(), "ace_user_id": 1, "guid": SUBJECT, "email": "bench@example.com", "role": "user"}])
+    db.commit()
+    token = create_access_token({"sub": SUBJECT, "role": "user"})
+    middleware = AuthContextMiddleware(endpoint)
+
+    results = {
+        "baseline": asyncio.run(run(endpoint, token, db, args.requests, cold=False, resolve_user=False)),
+        "cold": asyncio.run(run(middleware, token, db, max(args.requests // 10, 1), cold=True, resolve_user=True)),
+        "warm": asyncio.run(run(middleware, token, db, args.requests, cold=False, resolve_user=True)),
+    }
+    baseline_p95 = percentiles(results["baseline"])[1]
+    for name, timings in results.items():
+        p50, p95 = percentiles(timings)
+        print(f"{name:<9} p50 {p50:9.1f}us  p95 {p95:9.1f}us")
+
+    overhead = percentiles(results["warm"])[1] - baseline_p95
+    verdict = "ok" if overhead <= args.budget_us else f"FAIL over {args.budget_us:.0f}us budget"
+    print(f"warm auth overhead p95 {overhead:.1f}us  {verdict}")
+    db.close()
+    sys.exit(0 if overhead <= args.budget_us else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Embedding throughput (texts/sec) per backend and calling pattern.
+
+Usage:
+    python -m benchmarks.bench_embeddings [--texts 2000] [--backends torch onnx onnx-int8] [--clients 16]
+
+For every backend three patterns are measured on the same synthetic
+task-log texts:
+
+    single      one model.encode call per text (how embeddings used to be computed)
+    batched     model.encode over EMBEDDING_BATCH_SIZE texts at a time (upper bound)
+    concurrent  --clients threads each embedding one text per call through the
+                EmbeddingService micro-batcher (the shared service under load)
+
+The ONNX backends need ``optimum[onnxruntime]``; a backend that cannot be
+loaded is reported and skipped.
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.embedding_service import (
+    EMBEDDING_BACKENDS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_WAIT_MS,
+    EmbeddingService,
+    load_model,
+)
+
+WORDS = (
+    "fixed login bug reviewed pull request deployed staging wrote tests for sync meeting with client "
+    "refactored report export investigated slow query updated documentation planning sprint backlog"
+).split()
+
+
+def make_texts(n: int) -> list:
+    rng = random.Random(7)
+    return [
+        f"Project {rng.randint(1, 40)} - Task {rng.randint(1, 5000)}: {' '.join(rng.choices(WORDS, k=rng.randint(4, 24)))}"
+        for _ in range(n)
+    ]
+
+
+def rate(count: int, started: float) -> float:
+    return count / (time.perf_counter() - started)
+
+
+def bench_backend(backend: str, texts: list, clients: int, batch_size: int, max_wait_ms: float) -> dict:
+    model = load_model(backend=backend)
+    model.encode(texts[:batch_size], batch_size=batch_size, show_progress_bar=False)  # warm up
+
+    started = time.perf_counter()
+    for text in texts:
+        model.encode([text], show_progress_bar=False)
+    single = rate(len(texts), started)
+
+    started = time.perf_counter()
+    model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    batched = rate(len(texts), started)
+
+    # the cache is off so every text costs a forward pass
+    service = EmbeddingService(backend=backend, batch_size=batch_size, max_wait_ms=max_wait_ms, model=model, use_cache=False)
+    service.warmup()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(service.embed_one, texts))
+    concurrent = rate(len(texts), started)
+    return {
+        "single": single,
+        "batched": batched,
+        "concurrent": concurrent,
+        "avg_batch": service.stats()["avg_batch_size"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--backends", nargs="+", choices=EMBEDDING_BACKENDS, default=list(EMBEDDING_BACKENDS))
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=EMBEDDING_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    print(f"texts={len(texts)} clients={args.clients} batch_size={args.batch_size} max_wait_ms={args.max_wait_ms}")
+    print(f"{'backend':<10} {'single':>12} {'batched':>12} {'concurrent':>12} {'avg batch':>10}")
+    failures = 0
+    for backend in args.backends:
+        try:
+            result = bench_backend(backend, texts, args.clients, args.batch_size, args.max_wait_ms)
+        except Exception as e:
+            failures += 1
+            print(f"{backend:<10} skipped: {e}")
+            continue
+        print(
+            f"{backend:<10} {result['single']:>8.1f} t/s {result['batched']:>8.1f} t/s "
+            f"{result['concurrent']:>8.1f} t/s {result['avg_batch']:>10.1f}"
+        )
+    sys.exit(1 if failures == len(args.backends) else 0)
+
+
+if __name__ == "__main__":
+    main()
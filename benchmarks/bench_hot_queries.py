@@ -0,0 +1,191 @@
+"""Query-plan regression check for the hot read paths.
+
+Usage:
+    python -m benchmarks.bench_hot_queries [--tasks 100000] [--logs 200000] [--budget-ms 10]
+
+Seeds large synthetic tables on DATABASE_URL (an in-memory SQLite database
+when unset), then for each hot query asserts that the plan reaches the hot
+table through an index instead of a full scan and that the p95 latency stays
+under ``--budget-ms``. Exits non-zero on any regression. Every run starts
+from empty tables, so point DATABASE_URL at a scratch database.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from uuid import uuid4
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from connection.database import Base, DATABASE_URL
+from models.users import Users
+from models.projects import Projects
+from models.tasks import Tasks
+from models.task_assignees import TasksAssignees
+from models.task_logs import TaskLogs
+from models.open_timers import OpenTimer
+
+SEED_BATCH = 5000
+
+
+# -------- Seeding --------
+def seed(db, n_users: int, n_tasks: int, per_task: int, n_logs: int):
+    rng = random.Random(42)
+    closed_at = datetime(2025, 1, 1)
+    users = [{"user_id": uuid4(), "ace_user_id": i, "email": f"user{i}@example.com", "role": "user"}
+             for i in range(1, n_users + 1)]
+    n_projects = max(n_tasks // 100, 1)
+    _insert(db, Users, users)
+    _insert(db, Projects, [
+        {"ace_project_id": p, "project_name": f"Project {p}", "supervisor_id": rng.randint(1, n_users)}
+        for p in range(1, n_projects + 1)
+    ])
+    _insert(db, Tasks, [
+        {"ace_task_id": t, "task_title": f"Task {t}", "ace_project_id": rng.randint(1, n_projects)}
+        for t in range(1, n_tasks + 1)
+    ])
+    _insert(db, TasksAssignees, [
+        {"ace_task_id": t, "ace_user_id": u}
+        for t in range(1, n_tasks + 1)
+        for u in rng.sample(range(1, n_users + 1), min(per_task, n_users))
+    ])
+    # almost every log is closed; open timers are the rare rows start_task looks for
+    logs = [
+        {"log_id": uuid4(), "ace_task_id": rng.randint(1, n_tasks), "user_id": rng.choice(users)["user_id"],
+         "start_time": closed_at, "end_time": None if i % 50 == 0 else closed_at}
+        for i in range(n_logs)
+    ]
+    _insert(db, TaskLogs, logs)
+    open_timers = {(log["ace_task_id"], log["user_id"]): log for log in logs if log["end_time"] is None}
+    _insert(db, OpenTimer, [
+        {"ace_task_id": task_id, "user_id": user_id, "log_id": log["log_id"], "start_time": log["start_time"]}
+        for (task_id, user_id), log in open_timers.items()
+    ])
+    db.commit()
+    if db.get_bind().dialect.name != "mysql":
+        db.execute(text("ANALYZE"))
+    else:
+        for model in (Users, Projects, Tasks, TasksAssignees, TaskLogs, OpenTimer):
+            db.execute(text(f"ANALYZE TABLE {model.__tablename__}"))
+    db.commit()
+    return users
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), SEED_BATCH):
+        db.execute(insert(model), rows[start:start + SEED_BATCH])
+
+
+# -------- Hot queries (mirroring TaskService / DataService) --------
+def hot_queries(users, n_tasks: int, batch_size: int):
+    user = users[len(users) // 2]
+    task_ids = list(range(1, min(batch_size, n_tasks) + 1))
+    return {
+        "start_task open timer": (
+            "open_timers",
+            select(OpenTimer.log_id, OpenTimer.start_time).where(
+                OpenTimer.ace_task_id == n_tasks // 2,
+                OpenTimer.user_id == user["user_id"],
+            ),
+        ),
+        "fetch_assigned_tasks": (
+            "tasks_assignees",
+            select(Tasks.ace_task_id, Projects.project_name, Tasks.task_title, Users.email, Tasks.status)
+            .join(TasksAssignees, TasksAssignees.ace_task_id == Tasks.ace_task_id)
+            .join(Projects, Projects.ace_project_id == Tasks.ace_project_id)
+            .outerjoin(Users, Users.ace_user_id == Projects.supervisor_id)
+            .where(TasksAssignees.ace_user_id == user["ace_user_id"]),
+        ),
+        "assignee dedup probe": (
+            "tasks_assignees",
+            select(TasksAssignees.ace_task_id, TasksAssignees.ace_user_id)
+            .where(TasksAssignees.ace_task_id.in_(task_ids)),
+        ),
+        "tasks by project": (
+            "tasks",
+            select(Tasks.ace_task_id).where(Tasks.ace_project_id == 1),
+        ),
+    }
+
+
+# -------- Plans --------
+def full_scans(db, stmt) -> list:
+    """Return the tables the plan reads with a full scan."""
+    dialect = db.get_bind().dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        # "SCAN <table>" is a full scan, "SCAN <table> USING [COVERING] INDEX" is not
+        return [row[-1].split()[1] for row in rows if row[-1].startswith("SCAN ") and " INDEX " not in row[-1]]
+    if dialect.name == "postgresql":
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return [node["Relation Name"] for node in _pg_nodes(plan[0]["Plan"]) if node["Node Type"] == "Seq Scan"]
+    rows = db.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    return [row["table"] for row in rows if row["type"] == "ALL"]
+
+
+def _pg_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _pg_nodes(child)
+
+
+def p95_ms(db, stmt, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        db.execute(stmt).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--assignees-per-task", type=int, default=3)
+    parser.add_argument("--logs", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(DATABASE_URL)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    print(f"dialect={engine.dialect.name} users={args.users} tasks={args.tasks} logs={args.logs}")
+    started = time.perf_counter()
+    users = seed(db, args.users, args.tasks, args.assignees_per_task, args.logs)
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    failures = 0
+    for name, (table, stmt) in hot_queries(users, args.tasks, batch_size=100).items():
+        scanned = full_scans(db, stmt)
+        latency = p95_ms(db, stmt, args.runs)
+        problems = []
+        if table in scanned:
+            problems.append(f"full scan on {table}")
+        if latency > args.budget_ms:
+            problems.append(f"p95 over {args.budget_ms}ms budget")
+        failures += bool(problems)
+        verdict = "FAIL " + ", ".join(problems) if problems else "ok"
+        print(f"{name:<24} p95 {latency:8.3f}ms  {verdict}")
+    db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Compare the per-row ACE ingestion path with the set-based BulkUpserter.
+
+Usage:
+    python -m benchmarks.bench_ingestion [--tasks 20000] [--assignees-per-task 4]
+
+Runs against DATABASE_URL (an in-memory SQLite database when unset) and
+prints rows/sec for both paths on the same synthetic payload. Every run
+starts from empty tables, so point DATABASE_URL at a scratch database.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from connection.database import Base, DATABASE_URL
+from models.users import Users
+from models.projects import Projects
+from models.tasks import Tasks
+from models.task_assignees import TasksAssignees
+from models.task_logs import TaskLogs
+from services.data_service import DataService
+
+
+def make_payload(n_tasks: int, per_task: int):
+    n_users = max(per_task * 10, 50)
+    n_projects = max(n_tasks // 100, 1)
+    users = [{"USER_ID": i, "EMAIL_ALERT": f"user{i}@example.com", "ROLE": "user"} for i in range(1, n_users + 1)]
+    projects = [
+        {"PROJECT_ID": p, "PROJECT_NAME": f"Project {p}", "PROJECT_DESC": "", "PROJECT_CREATOR_ID": 1,
+         "DATE_CREATED": "2025-01-01T00:00:00", "DATE_MODIFIED": "2025-02-01T00:00:00"}
+        for p in range(1, n_projects + 1)
+    ]
+    tasks = [
+        {"TASK_ID": t, "PROJECT_ID": (t % n_projects) + 1, "TASK_RESUME": f"Task {t}", "TASK_DESC_CREATOR": "",
+         "DATE_TASK_CREATED": "2025-01-01T00:00:00", "DATE_TASK_MODIFIED": "2025-01-02T00:00:00",
+         "ASSIGNED_ID": ",".join(str(((t + k) % n_users) + 1) for k in range(per_task))}
+        for t in range(1, n_tasks + 1)
+    ]
+    return users, projects, tasks
+
+
+# -------- Per-row path (one SELECT per ACE row, as before BulkUpserter) --------
+def legacy_ingest(db, users, projects, tasks):
+    service = DataService(db)
+    for item in users:
+        existing = db.query(Users).filter((Users.ace_user_id == item["USER_ID"]) | (Users.email == item["EMAIL_ALERT"])).first()
+        if not existing:
+            db.add(Users(ace_user_id=item["USER_ID"], email=item["EMAIL_ALERT"], role=item["ROLE"]))
+    db.commit()
+    for project in projects:
+        if not db.query(Projects).filter_by(ace_project_id=project["PROJECT_ID"]).first():
+            db.add(Projects(ace_project_id=project["PROJECT_ID"], project_name=project["PROJECT_NAME"],
+                            description=project["PROJECT_DESC"], supervisor_id=project["PROJECT_CREATOR_ID"],
+                            start_date=service._parse_date(project["DATE_CREATED"]),
+                            end_date=service._parse_date(project["DATE_MODIFIED"])))
+    db.commit()
+    for task in tasks:
+        if not db.query(Tasks).filter_by(ace_task_id=task["TASK_ID"]).first():
+            db.add(Tasks(ace_task_id=task["TASK_ID"], task_title=task["TASK_RESUME"],
+                         description=task["TASK_DESC_CREATOR"], ace_project_id=task["PROJECT_ID"],
+                         start_date=service._parse_date(task["DATE_TASK_CREATED"]),
+                         end_date=service._parse_date(task["DATE_TASK_MODIFIED"])))
+    db.commit()
+    for task in tasks:
+        if not db.query(Tasks).filter_by(ace_task_id=task["TASK_ID"]).first():
+            continue
+        for assignee_id in service._parse_assignee_ids(task["ASSIGNED_ID"]):
+            exists = db.query(TasksAssignees).filter(
+                TasksAssignees.ace_task_id == task["TASK_ID"], TasksAssignees.ace_user_id == assignee_id
+            ).first()
+            if not exists:
+                db.add(TasksAssignees(ace_task_id=task["TASK_ID"], ace_user_id=assignee_id,
+                                      assigned_at=service._parse_date(task["DATE_TASK_CREATED"])))
+    db.commit()
+
+
+def bulk_ingest(db, users, projects, tasks):
+    service = DataService(db)
+    service.save_users(users)
+    service.save_projects(projects)
+    service.save_tasks(tasks)
+    service.save_assignees(tasks)
+
+
+def run(label, ingest, session_factory, engine, payload):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    users, projects, tasks = payload
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        ingest(db, users, projects, tasks)
+        elapsed = time.perf_counter() - started
+        rows = sum(db.query(model).count() for model in (Users, Projects, Tasks, TasksAssignees))
+    finally:
+        db.close()
+    print(f"{label:<10} {rows:>9} rows  {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/sec")
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--assignees-per-task", type=int, default=4)
+    args = parser.parse_args()
+
+    if DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(DATABASE_URL, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(DATABASE_URL)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    payload = make_payload(args.tasks, args.assignees_per_task)
+
+    print(f"dialect={engine.dialect.name} tasks={args.tasks} assignees/task={args.assignees_per_task}")
+    legacy = run("per-row", legacy_ingest, session_factory, engine, payload)
+    bulk = run("bulk", bulk_ingest, session_factory, engine, payload)
+    print(f"speedup    {bulk / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Archive old task logs and keep the monthly task_logs partitions in shape.
+
+Usage:
+    python -m cli.archive_task_logs [--months 12] [--dry-run]
+
+Closed logs that started before the first day of the month ``--months``
+whole months ago are moved to task_logs_archive in batches. On PostgreSQL
+and MySQL the partitions for the coming months are created and partitions
+emptied by the move are dropped. The app runs the same job every
+TASK_LOG_MAINTENANCE_HOURS; use this for a one-off run or a first backfill.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from connection.database import SessionLocal
+from models.task_logs import TaskLogs
+from services.task_log_maintenance import TASK_LOG_ARCHIVE_MONTHS, TaskLogArchiver, run_task_log_maintenance
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months", type=int, default=TASK_LOG_ARCHIVE_MONTHS, help="whole months kept in task_logs")
+    parser.add_argument("--dry-run", action="store_true", help="only count the logs that would be archived")
+    args = parser.parse_args(argv)
+    if args.months < 1:
+        parser.error("--months must be at least 1")
+
+    cutoff = TaskLogArchiver.cutoff(args.months)
+    if args.dry_run:
+        db = SessionLocal()
+        try:
+            pending = db.execute(
+                select(func.count()).select_from(TaskLogs)
+                .where(TaskLogs.start_time < datetime.combine(cutoff, datetime.min.time()), TaskLogs.end_time.is_not(None))
+            ).scalar()
+        finally:
+            db.close()
+        print(f"{pending} closed logs started before {cutoff.isoformat()}")
+        return 0
+
+    started = time.perf_counter()
+    report = run_task_log_maintenance(args.months)
+    print(f"archived {report['archived']} logs started before {report['cutoff']}")
+    print(f"partitions created: {', '.join(report['partitions_created']) or '-'}")
+    print(f"partitions dropped: {', '.join(report['partitions_dropped']) or '-'}")
+    print(f"done in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
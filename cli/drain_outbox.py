@@ -0,0 +1,44 @@
+"""Deliver queued task-log embeddings to Chroma.
+
+Usage:
+    python -m cli.drain_outbox [--batches 10] [--requeue-dead] [--stats]
+
+The app drains the outbox every OUTBOX_POLL_SECONDS; use this when the
+in-app worker is disabled (OUTBOX_POLL_SECONDS=0), to catch up after an
+outage, or with --requeue-dead to retry rows that ran out of attempts.
+"""
+import argparse
+import sys
+import time
+
+from connection.database import SessionLocal
+from services.embedding_outbox import EmbeddingOutboxService, EmbeddingOutboxWorker
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, help="stop after this many batches (default: until nothing is due)")
+    parser.add_argument("--requeue-dead", action="store_true", help="reset dead-lettered rows before draining")
+    parser.add_argument("--stats", action="store_true", help="only print the outbox counters")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.requeue_dead:
+            print(f"requeued {EmbeddingOutboxService(db).requeue_dead()} dead rows")
+            db.commit()
+        if args.stats:
+            print(EmbeddingOutboxService(db).stats())
+            return 0
+    finally:
+        db.close()
+
+    started = time.perf_counter()
+    report = EmbeddingOutboxWorker().drain(max_batches=args.batches)
+    print(f"delivered {report['delivered']}, failed {report['failed']}, dead-lettered {report['dead']}")
+    print(f"done in {time.perf_counter() - started:.2f}s")
+    return 0 if not report["failed"] and not report["dead"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Rebuild the daily time-tracking rollups from task_logs.
+
+Usage:
+    python -m cli.rebuild_rollups [--start 2025-01-01] [--end 2025-01-31]
+
+Without a range every rollup row is recomputed. The delete and re-insert
+run in one transaction, so reports never see a half-rebuilt range; run it
+after bulk edits to task_logs or to backfill the rollups after upgrading.
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from connection.database import SessionLocal
+from services.rollup_service import RollupService
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, help="first day to rebuild (inclusive)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day to rebuild (inclusive)")
+    args = parser.parse_args(argv)
+    if args.start and args.end and args.start > args.end:
+        parser.error("--start must not be after --end")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = RollupService(db).rebuild(args.start, args.end)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for table, rows in written.items():
+        print(f"{table:<24} {rows:>9} rows")
+    print(f"rebuilt in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Sync many ACE tenants in one run.
+
+Usage:
+    python -m cli.sync_tenants GUID [GUID ...] [--file guids.txt] [--workers 4] [--full-resync] [--stream]
+
+Each guid runs in its own session on a bounded worker pool; per-guid ACE
+concurrency and rate limits come from the shared ACE client settings. A
+failing tenant is reported and does not stop the others; the exit code is
+non-zero when any tenant failed.
+"""
+import argparse
+import json
+import sys
+
+from services.sync_jobs import SYNC_TENANT_WORKERS, sync_tenants
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("guids", nargs="*")
+    parser.add_argument("--file", help="file with one guid per line")
+    parser.add_argument("--workers", type=int, default=SYNC_TENANT_WORKERS)
+    parser.add_argument("--full-resync", action="store_true")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print full per-tenant reports as JSON lines")
+    args = parser.parse_args(argv)
+
+    guids = list(args.guids)
+    if args.file:
+        with open(args.file) as handle:
+            guids += [line.strip() for line in handle if line.strip() and not line.startswith("#")]
+    if not guids:
+        parser.error("no guids given")
+
+    reports = sync_tenants(guids, workers=args.workers, full_resync=args.full_resync, stream=args.stream)
+    for report in reports:
+        if args.json:
+            print(json.dumps(report, default=str))
+        else:
+            detail = report["error"] or json.dumps(report["result"])
+            print(f"{report['guid']:<40} {report['status']:<10} {report['elapsed_seconds']:>8.2f}s  {detail}")
+
+    return 0 if all(report["status"] == "succeeded" for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+import backoff
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+ACE_API_URL = os.getenv('ACE_API_URL')
+ACE_CONNECT_TIMEOUT = float(os.getenv('ACE_CONNECT_TIMEOUT', '5'))
+ACE_READ_TIMEOUT = float(os.getenv('ACE_READ_TIMEOUT', '60'))
+ACE_POOL_SIZE = int(os.getenv('ACE_POOL_SIZE', '20'))
+ACE_MAX_TRIES = int(os.getenv('ACE_MAX_TRIES', '3'))
+ACE_BACKOFF_MAX_SECONDS = float(os.getenv('ACE_BACKOFF_MAX_SECONDS', '10'))
+ACE_BREAKER_THRESHOLD = int(os.getenv('ACE_BREAKER_THRESHOLD', '5'))
+ACE_BREAKER_RESET_SECONDS = float(os.getenv('ACE_BREAKER_RESET_SECONDS', '30'))
+ACE_ASYNC_MAX_CONNECTIONS = int(os.getenv('ACE_ASYNC_MAX_CONNECTIONS', '200'))
+# per-guid limits so one tenant cannot monopolise ACE; a rate of 0 disables rate limiting
+ACE_TENANT_MAX_CONCURRENCY = int(os.getenv('ACE_TENANT_MAX_CONCURRENCY', '3'))
+ACE_TENANT_RATE_PER_SECOND = float(os.getenv('ACE_TENANT_RATE_PER_SECOND', '5'))
+ACE_TENANT_BURST = int(os.getenv('ACE_TENANT_BURST', '5'))
+
+
+class AceUnavailableError(requests.RequestException):
+    """Raised without calling ACE while the circuit breaker is open."""
+
+
+# everything the sync and async clients can raise for a failed ACE call
+ACE_ERRORS = (requests.RequestException, httpx.HTTPError)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``threshold`` failed calls in a row the circuit opens and calls
+    fail fast for ``reset_seconds``; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit. A trial
+    that ends without an outcome (cancelled, or an error that is not an ACE
+    failure) must hand its slot back with ``release_trial``.
+    """
+
+    def __init__(self, threshold: int = ACE_BREAKER_THRESHOLD, reset_seconds: float = ACE_BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class AceMetrics:
+    """Per-ACE-function call counters and latency, safe to share between threads."""
+
+    def __init__(self):
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, fct: str, elapsed_ms: float, ok: bool, attempts: int = 1):
+        with self._lock:
+            stats = self._entry(fct)
+            stats["calls"] += 1
+            stats["retries"] += max(attempts - 1, 0)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_ms"] = elapsed_ms
+            if not ok:
+                stats["errors"] += 1
+
+    def reject(self, fct: str):
+        with self._lock:
+            stats = self._entry(fct)
+            stats["rejected"] += 1
+
+    def _entry(self, fct: str) -> dict:
+        return self._stats.setdefault(
+            fct, {"calls": 0, "errors": 0, "retries": 0, "rejected": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        )
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                fct: {
+                    **stats,
+                    "total_ms": round(stats["total_ms"], 3),
+                    "avg_ms": round(stats["total_ms"] / stats["calls"], 3) if stats["calls"] else 0.0,
+                }
+                for fct, stats in self._stats.items()
+            }
+
+
+class TenantLimiter:
+    """Per-guid concurrency cap plus token-bucket rate limit for ACE calls.
+
+    ``reserve`` books the next token and returns how long the caller must
+    wait for it, so the sync client can ``time.sleep`` and the async client
+    ``asyncio.sleep`` on the same buckets. The clients reserve once per
+    attempt, so retries count against the rate as well.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ACE_TENANT_MAX_CONCURRENCY,
+        rate_per_second: float = ACE_TENANT_RATE_PER_SECOND,
+        burst: int = ACE_TENANT_BURST,
+    ):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.rate = rate_per_second
+        self.burst = max(burst, 1)
+        self._buckets: Dict[str, tuple] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._async_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, tenant: str) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(tenant, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+            self._buckets[tenant] = (tokens, now)
+            return -tokens / self.rate if tokens < 0 else 0.0
+
+    def semaphore(self, tenant: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if tenant not in self._semaphores:
+                self._semaphores[tenant] = threading.BoundedSemaphore(self.max_concurrency)
+            return self._semaphores[tenant]
+
+    def async_semaphore(self, tenant: str) -> asyncio.Semaphore:
+        # only ever used from the application's event loop
+        if tenant not in self._async_semaphores:
+            self._async_semaphores[tenant] = asyncio.Semaphore(self.max_concurrency)
+        return self._async_semaphores[tenant]
+
+
+def _is_permanent(error: Exception) -> bool:
+    """4xx answers and an open circuit are not worth retrying."""
+    if isinstance(error, AceUnavailableError):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code < 500
+
+
+class AceClient:
+    """Process-wide ACE API client.
+
+    Uses one keep-alive ``requests.Session`` with a pooled adapter, applies
+    connect/read timeouts to every call, retries transient failures with
+    exponential backoff and fails fast through a circuit breaker while ACE
+    is down. Latency per ACE function is collected in ``metrics``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = ACE_API_URL,
+        timeout=(ACE_CONNECT_TIMEOUT, ACE_READ_TIMEOUT),
+        pool_size: int = ACE_POOL_SIZE,
+        max_tries: int = ACE_MAX_TRIES,
+        breaker: CircuitBreaker | None = None,
+        limiter: TenantLimiter | None = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or TenantLimiter()
+        self.metrics = AceMetrics()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._send = backoff.on_exception(
+            backoff.expo,
+            requests.RequestException,
+            max_tries=max_tries,
+            max_value=ACE_BACKOFF_MAX_SECONDS,
+            giveup=_is_permanent,
+            on_backoff=self._count_attempt,
+        )(self._send_once)
+        self._attempts = threading.local()
+
+    def get(self, params: dict, stream: bool = False) -> requests.Response:
+        """GET the ACE API and return the (status-checked) response."""
+        fct = params.get("fct", "unknown")
+        if not self.breaker.allow():
+            self.metrics.reject(fct)
+            raise AceUnavailableError(f"ACE API circuit is open, not calling {fct}")
+
+        trial = self.breaker.state == "half_open"
+        tenant = params.get("guid")
+        self._attempts.count = 1
+        started = time.perf_counter()
+        try:
+            if tenant:
+                with self.limiter.semaphore(tenant):
+                    response = self._send(params, stream)
+            else:
+                response = self._send(params, stream)
+        except requests.RequestException as e:
+            if not _is_permanent(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=False, attempts=self._attempts.count)
+            raise
+        except BaseException:
+            # says nothing about ACE's health, but a trial holding its slot would keep the circuit open for good
+            if trial:
+                self.breaker.release_trial()
+            self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=False, attempts=self._attempts.count)
+            raise
+        self.breaker.record_success()
+        self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=True, attempts=self._attempts.count)
+        return response
+
+    def get_json(self, params: dict) -> dict:
+        response = self.get(params)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise requests.RequestException(f"Invalid JSON from ACE API: {e}") from e
+
+    def status(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "calls": self.metrics.snapshot(),
+        }
+
+    def _send_once(self, params: dict, stream: bool) -> requests.Response:
+        tenant = params.get("guid")
+        if tenant:
+            # every attempt, retries included, spends a token of the tenant's rate limit
+            time.sleep(self.limiter.reserve(tenant))
+        response = self.session.get(self.base_url, params=params, timeout=self.timeout, stream=stream)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def _count_attempt(self, details):
+        self._attempts.count = details["tries"] + 1
+
+
+class AsyncAceClient:
+    """``httpx.AsyncClient`` counterpart of ``AceClient`` for async handlers.
+
+    Shares the circuit breaker, tenant limits and metrics of the sync client,
+    so both paths see the same view of ACE health. Must be used from the
+    application's event loop; ``close_async_ace_client`` runs on shutdown.
+    """
+
+    def __init__(
+        self,
+        base_url: str = ACE_API_URL,
+        timeout=(ACE_CONNECT_TIMEOUT, ACE_READ_TIMEOUT),
+        pool_size: int = ACE_POOL_SIZE,
+        max_connections: int = ACE_ASYNC_MAX_CONNECTIONS,
+        max_tries: int = ACE_MAX_TRIES,
+        breaker: CircuitBreaker | None = None,
+        metrics: AceMetrics | None = None,
+        limiter: TenantLimiter | None = None,
+    ):
+        self.base_url = base_url
+        self.max_tries = max_tries
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or AceMetrics()
+        self.limiter = limiter or TenantLimiter()
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=pool_size),
+        )
+
+    async def get(self, params: dict) -> httpx.Response:
+        fct = params.get("fct", "unknown")
+        if not self.breaker.allow():
+            self.metrics.reject(fct)
+            raise AceUnavailableError(f"ACE API circuit is open, not calling {fct}")
+
+        trial = self.breaker.state == "half_open"
+        tenant = params.get("guid")
+        attempts = 0
+
+        @backoff.on_exception(
+            backoff.expo,
+            httpx.HTTPError,
+            max_tries=self.max_tries,
+            max_value=ACE_BACKOFF_MAX_SECONDS,
+            giveup=_is_permanent,
+        )
+        async def send() -> httpx.Response:
+            nonlocal attempts
+            attempts += 1
+            if tenant:
+                await asyncio.sleep(self.limiter.reserve(tenant))
+            response = await self.client.get(self.base_url, params=params)
+            response.raise_for_status()
+            return response
+
+        started = time.perf_counter()
+        try:
+            if tenant:
+                async with self.limiter.async_semaphore(tenant):
+                    response = await send()
+            else:
+                response = await send()
+        except httpx.HTTPError as e:
+            if not _is_permanent(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=False, attempts=attempts)
+            raise
+        except BaseException:
+            # e.g. CancelledError when the client disconnects mid-call
+            if trial:
+                self.breaker.release_trial()
+            self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=False, attempts=attempts)
+            raise
+        self.breaker.record_success()
+        self.metrics.observe(fct, (time.perf_counter() - started) * 1000, ok=True, attempts=attempts)
+        return response
+
+    async def get_json(self, params: dict) -> dict:
+        response = await self.get(params)
+        try:
+            # multi-MB list payloads are decoded off the event loop so other requests keep being served
+            return await asyncio.to_thread(response.json)
+        except ValueError as e:
+            raise httpx.DecodingError(f"Invalid JSON from ACE API: {e}", request=response.request) from e
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_client: AceClient | None = None
+_async_client: AsyncAceClient | None = None
+_client_lock = threading.Lock()
+
+def get_ace_client() -> AceClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = AceClient()
+    return _client
+
+def get_async_ace_client() -> AsyncAceClient:
+    global _async_client
+    if _async_client is None:
+        client = get_ace_client()
+        _async_client = AsyncAceClient(breaker=client.breaker, metrics=client.metrics, limiter=client.limiter)
+    return _async_client
+
+async def close_async_ace_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
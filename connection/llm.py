@@ -1,16 +1,26 @@
 import os
 from fastapi import HTTPException
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 
-client = genai.Client()
+_client = None
+
+def get_genai_client():
+    # google-genai is only imported (and the client built) on first use
+    global _client
+    if _client is None:
+        from google import genai
+
+        _client = genai.Client()
+    return _client
+
 def call_gemini(context:str,question:str,) -> str :
     if not os.getenv('GEMINI_API_KEY'):
         raise HTTPException(status_code=500, detail="GEMINI_API_KEY not configured")
     
     try:
-        response =  response = client.models.generate_content(
+        from google.genai import types
+
+        response =  response = get_genai_client().models.generate_content(
                     model="gemini-2.5-flash",
                     config=types.GenerateContentConfig(
                         system_instruction="You are a helpful assistant. Answer questions based only on the provided context."),
@@ -1,16 +1,19 @@
-import chromadb
-from chromadb.api import ClientAPI
-from chromadb.api.models.Collection import Collection
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 import os
 
+if TYPE_CHECKING:
+	from chromadb.api import ClientAPI
+
 load_dotenv()
 
-_client: ClientAPI | None = None
+_client: "ClientAPI | None" = None
 
-def get_chroma_client() -> ClientAPI:
+def get_chroma_client() -> "ClientAPI":
 	global _client
 	if _client is None:
+		import chromadb
+
 		_client = chromadb.CloudClient(
             api_key=os.getenv("CHROMA_API_KEY"),
             tenant=os.getenv("CHROMA_TENANT"),
@@ -1,5 +1,6 @@
 from fastapi import Depends, Request, HTTPException, status
 from sqlalchemy.orm import Session
+from auth.principal_cache import get_principal_cache
 from dependencies.get_db import get_db
 from models.users import Users
 from fastapi.security import HTTPBearer
@@ -7,15 +8,23 @@ from fastapi.security import HTTPBearer
 access_scheme  = HTTPBearer(auto_error=False, scheme_name="bearerAuth")
 refresh_scheme = HTTPBearer(auto_error=False, scheme_name="refreshAuth")
 
+USER_COLUMNS = [column.key for column in Users.__table__.columns]
+
 def get_current_user(request: Request, db: Session = Depends(get_db)) -> Users:
+    """The authenticated user as a detached ``Users`` instance (merge it into a session before changing it)."""
     claims = getattr(request.state, "auth", None)
     if not claims or not claims.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    user_id = int(claims["sub"])
-    user = db.query(Users).filter(Users.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
-    return user
+    # tokens carry the ACE guid as their subject (see UserService._handle_login)
+    subject = str(claims["sub"])
+    principals = get_principal_cache()
+    values = principals.get(subject)
+    if values is None:
+        user = db.query(Users).filter(Users.guid == subject).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        values = {key: getattr(user, key) for key in USER_COLUMNS}
+        principals.set(subject, values)
 
+    return Users(**values)
@@ -1,18 +1,22 @@
-from typing import Optional
-from chromadb.api import ClientAPI
+from typing import TYPE_CHECKING
 from fastapi import Depends
 from connection.vectordb import get_chroma_client
-from chromadb.api.models.Collection import Collection
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from chromadb.api.models.Collection import Collection
 
-def get_chroma_collection(client: ClientAPI = Depends(get_chroma_client)) -> Collection:
-	
-    year = datetime.now().year  # default to current year
 
-    collection_name = f"Tasks_{year}"
+def task_collection_name(year: int | None = None) -> str:
+    return f"Tasks_{year or datetime.now().year}"  # default to current year
+
+
+# the client parameter is left unannotated so FastAPI does not need chromadb at import time
+def get_chroma_collection(client=Depends(get_chroma_client)) -> "Collection":
+	
+    collection_name = task_collection_name()
 
     # get_or_create_collection is safe to call multiple times;
     # ChromaDB will return the existing collection if it exists
     collection = client.get_or_create_collection(name=collection_name)
-    return collection
\ No newline at end of file
+    return collection
@@ -1,10 +1,16 @@
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-llm = ChatGoogleGenerativeAI(
+_llm = None
+
+def get_llm():
+    # langchain-google-genai is imported and the chat model built on first use (or in warmup)
+    global _llm
+    if _llm is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        _llm = ChatGoogleGenerativeAI(
             model="gemini-1.5-flash",   # or gemini-1.5-pro / gemini-1.5-flash
             temperature=0,
             google_api_key=os.getenv('GEMINI_API_KEY')
             )
-
-
+    return _llm
@@ -1,15 +1,28 @@
-from langchain_chroma import Chroma
+from typing import TYPE_CHECKING
 from datetime import datetime
-from langchain_huggingface import HuggingFaceEmbeddings
 import os
 
-embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+from services.embedding_service import LangChainEmbeddings, get_embedding_service
+
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+
+_embeddings = None
+
+def get_embeddings():
+    # queries share the process-wide embedding service (and its batches) with ingest
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = LangChainEmbeddings(get_embedding_service())
+    return _embeddings
+
+def get_langchain_chroma() -> "Chroma":
+    from langchain_chroma import Chroma
 
-def get_langchain_chroma() -> Chroma:
     year = datetime.now().year  # default to current year
     return Chroma(
     collection_name=f"Tasks_{year}",
-    embedding_function=embeddings,
+    embedding_function=get_embeddings(),
     chroma_cloud_api_key=os.getenv("CHROMA_API_KEY"),
     tenant=os.getenv("CHROMA_TENANT"),
     database=os.getenv("CHROMA_DATABASE"),
@@ -12,3 +12,5 @@ class AskResponse(BaseModel):
     parsed_query: Dict[str, Any]
     answer: str
     sources: List[Dict[str, Any]]
+    # parse / embed / search / llm / total, in milliseconds
+    timings_ms: Dict[str, float] = {}
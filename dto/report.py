@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+from uuid import UUID
+
+# ---- TIME REPORTS ----
+class DailyTotal(BaseModel):
+    day: date
+    total_duration: float
+    log_count: int
+
+class ProjectTotal(BaseModel):
+    ace_project_id: int
+    project_name: Optional[str] = None
+    total_duration: float
+    log_count: int
+
+class UserTotal(BaseModel):
+    user_id: UUID
+    email: Optional[str] = None
+    total_duration: float
+    log_count: int
+
+class TimeReport(BaseModel):
+    start: Optional[date] = None
+    end: Optional[date] = None
+    total_duration: float
+    log_count: int
+    days: List[DailyTotal] = []
+    projects: List[ProjectTotal] = []
+    users: List[UserTotal] = []
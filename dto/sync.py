@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class SyncScheduleRequest(BaseModel):
+    interval_minutes: int = Field(gt=0)
+    full_resync: bool = False
+    stream: bool = False
+
+class MultiTenantSyncRequest(BaseModel):
+    guids: List[str] = Field(min_length=1)
+    full_resync: bool = False
+    stream: bool = False
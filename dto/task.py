@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -27,3 +27,40 @@ class TaskStopRequest(BaseModel):
 
 class TaskStopMessageResponse(BaseModel):
     message: str
+
+# ---- BATCH START/STOP ----
+class TimerStartEvent(BaseModel):
+    type: Literal["start"]
+    user_id: UUID
+    ace_task_id: int
+    # generated on the device so later stop events in the same (or a later) batch can refer to it
+    log_id: Optional[UUID] = None
+    # when the timer was started on the device; defaults to the time the batch is received
+    at: Optional[datetime] = None
+
+class TimerStopEvent(BaseModel):
+    type: Literal["stop"]
+    log_id: UUID
+    status: str
+    comment: Optional[str] = None
+    duration: float
+    at: Optional[datetime] = None
+
+TimerEvent = Annotated[Union[TimerStartEvent, TimerStopEvent], Field(discriminator="type")]
+
+class TaskBatchRequest(BaseModel):
+    events: List[TimerEvent] = Field(min_length=1)
+
+class TaskBatchResult(BaseModel):
+    index: int
+    type: str
+    # started -> new log, resumed -> an open timer already existed, stopped -> log closed,
+    # conflict -> a concurrent start opened a timer for the task and user first; nothing was written
+    outcome: str
+    log_id: UUID
+    start_time: datetime
+    end_time: Optional[datetime] = None
+
+class TaskBatchResponse(BaseModel):
+    message: str
+    results: List[TaskBatchResult]
@@ -0,0 +1,165 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from dependencies.gemini_dependency import get_llm
+from dependencies.langchain_dependency import get_embeddings
+from utils.query_parser import parse_user_query
+
+if TYPE_CHECKING:
+    from langchain_chroma import Chroma
+    from langchain_core.documents import Document
+
+ANSWER_PROMPT = """
+You are a productivity assistant. Use the following context
+(task details and metadata) to answer the question. Do not send the user_id in the summary.
+
+{context}
+
+Question: {question}
+"""
+
+_chain = None
+
+def get_answer_chain():
+    # prompt and chain are built once per process; langchain is imported on the first question
+    global _chain
+    if _chain is None:
+        from langchain.prompts import PromptTemplate
+
+        prompt = PromptTemplate(input_variables=["context", "question"], template=ANSWER_PROMPT)
+        _chain = prompt | get_llm()
+    return _chain
+
+
+def build_filter(user_id: str, parsed_query: Dict[str, Any]) -> Dict[str, Any]:
+    """Chroma metadata filter for the user's documents, narrowed by the parsed query."""
+    start_date = parsed_query.get("start_date")
+    end_date = parsed_query.get("end_date")
+
+    # project_name is not filtered on: task-log documents carry no project metadata, so it would match nothing
+    filters = [{"user_id": {"$eq": user_id}}]  # always include user_id
+    if start_date and end_date:
+        filters.append({"date": {"$gte": int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())}})
+        # end_date is inclusive: stop before midnight of the following day
+        end_exclusive = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+        filters.append({"date": {"$lt": int(end_exclusive.timestamp())}})
+        return {"$and": filters}
+    return filters[0]
+
+
+def format_docs(docs: List["Document"]) -> str:
+    return "\n\n".join(f"Task: {doc.page_content}\nMetadata: {doc.metadata}" for doc in docs)
+
+
+def answer_text(result) -> str:
+    return result.content if hasattr(result, "content") else str(result)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events frame; ``data`` is sent as a single JSON line."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Retrieval:
+    def __init__(self, question: str, parsed_query: Dict[str, Any], docs: List["Document"], timings: Dict[str, float]):
+        self.question = question
+        self.parsed_query = parsed_query
+        self.docs = docs
+        self.timings = timings
+
+    @property
+    def context(self) -> str:
+        return format_docs(self.docs)
+
+    @property
+    def sources(self) -> List[Dict[str, Any]]:
+        return [{"document": doc.page_content, "metadata": doc.metadata} for doc in self.docs]
+
+
+class RagPipeline:
+    """Parse -> embed -> search -> LLM over the task-log vector store.
+
+    The question is embedded and searched exactly once; the same documents
+    feed the prompt context and the ``sources`` of the answer. Each stage's
+    wall time is recorded in milliseconds.
+    """
+
+    def __init__(self, vectordb: "Chroma"):
+        self.vectordb = vectordb
+
+    @staticmethod
+    @contextmanager
+    def _timed(timings: Dict[str, float], stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def retrieve(self, question: str, user_id: str, top_k: Optional[int] = 3) -> Retrieval:
+        timings: Dict[str, float] = {}
+        with self._timed(timings, "parse"):
+            parsed_query = await run_in_threadpool(parse_user_query, question)
+        with self._timed(timings, "embed"):
+            vector = await get_embeddings().aembed_query(question)
+        with self._timed(timings, "search"):
+            docs = await run_in_threadpool(
+                self.vectordb.similarity_search_by_vector,
+                vector,
+                k=top_k or 3,
+                filter=build_filter(user_id, parsed_query),
+            )
+        return Retrieval(question, parsed_query, docs, timings)
+
+    async def generate(self, retrieval: Retrieval) -> str:
+        with self._timed(retrieval.timings, "llm"):
+            result = await get_answer_chain().ainvoke({"context": retrieval.context, "question": retrieval.question})
+        return answer_text(result)
+
+    async def stream(self, retrieval: Retrieval) -> AsyncIterator[str]:
+        """SSE frames for an answer: ``retrieval`` first, then one ``token`` per LLM chunk, then ``done``.
+
+        Retrieval has already happened, so its failures surface as a normal
+        error response; a failure while generating ends the stream with an
+        ``error`` event since the status line is already sent.
+        """
+        yield sse_event("retrieval", {
+            "question": retrieval.question,
+            "parsed_query": retrieval.parsed_query,
+            "sources": retrieval.sources,
+            "timings_ms": retrieval.timings,
+        })
+        started = time.perf_counter()
+        parts: List[str] = []
+        try:
+            async for chunk in get_answer_chain().astream({"context": retrieval.context, "question": retrieval.question}):
+                text = answer_text(chunk)
+                if not text:
+                    continue
+                if not parts:
+                    retrieval.timings["first_token"] = round((time.perf_counter() - started) * 1000, 2)
+                parts.append(text)
+                yield sse_event("token", {"text": text})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+        retrieval.timings["llm"] = round((time.perf_counter() - started) * 1000, 2)
+        yield sse_event("done", {"answer": "".join(parts), "timings_ms": retrieval.timings})
+
+    async def run(self, question: str, user_id: str, top_k: Optional[int] = 3) -> Dict[str, Any]:
+        started = time.perf_counter()
+        retrieval = await self.retrieve(question, user_id, top_k)
+        answer = await self.generate(retrieval)
+        retrieval.timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+        return {
+            "question": question,
+            "parsed_query": retrieval.parsed_query,
+            "answer": answer,
+            "sources": retrieval.sources,
+            "timings_ms": retrieval.timings,
+        }
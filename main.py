@@ -1,20 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from connection.database import engine, Base
+from connection.database import dispose_async_engine
 from routes.data_routes import router as data_router
 from routes.user_routes import router as user_router
 from routes.task_routes import router as task_router
 from routes.project_routes import router as project_router
 from routes.genai_routes import genai_router
 from routes.auth_routes import router as auth_router
+from routes.metrics_routes import router as metrics_router
+from routes.health_routes import router as health_router
+from routes.report_routes import router as report_router
 from models.users import Users
 from models.projects import Projects
 from models.tasks import Tasks
 from models.task_assignees import TasksAssignees
 from models.task_logs import TaskLogs
+from models.sync_state import SyncState
+from models.user_task_versions import UserTaskVersion
+from models.rollups import UserDailyRollup, ProjectDailyRollup, TaskDailyRollup
+from models.task_logs_archive import TaskLogArchive
+from models.embedding_outbox import EmbeddingOutbox
+from models.sync_jobs import SyncJobRecord, SyncBatchRecord, SyncScheduleRecord
+from services.sync_jobs import get_sync_job_manager
+from connection.ace_client import close_async_ace_client
+from services.warmup import get_model_warmup
+from middleware.auth_context import AuthContextMiddleware
+from services.task_log_maintenance import TASK_LOG_MAINTENANCE_HOURS, run_task_log_maintenance
+from services.embedding_outbox import OUTBOX_POLL_SECONDS, drain_embedding_outbox
 
-Base.metadata.create_all(bind=engine)
-app = FastAPI()
+# the schema is managed by Alembic (alembic upgrade head)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	sync_jobs = get_sync_job_manager()
+	# every worker serves the sync-job API; the one that takes the scheduler role also runs jobs and maintenance
+	sync_jobs.start(loop=asyncio.get_running_loop())
+	sync_jobs.set_maintenance("task-log-maintenance", run_task_log_maintenance, TASK_LOG_MAINTENANCE_HOURS * 3600)
+	sync_jobs.set_maintenance("embedding-outbox", drain_embedding_outbox, OUTBOX_POLL_SECONDS)
+	get_model_warmup().start()
+	yield
+	sync_jobs.shutdown()
+	await close_async_ace_client()
+	await dispose_async_engine()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration to allow frontend dev server access
 origins = [
@@ -28,12 +59,17 @@ app.add_middleware(
 	allow_credentials=True,
 	allow_methods=["*"],
 	allow_headers=["*"],
+	expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(AuthContextMiddleware)
 app.include_router(genai_router)
 app.include_router(data_router)
 app.include_router(user_router)
 app.include_router(task_router)
 app.include_router(auth_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
+app.include_router(report_router)
 
 
 
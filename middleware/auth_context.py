@@ -1,27 +1,48 @@
 # middleware/auth_context.py
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from jose import JWTError
-from auth.jwt_handler import decode_token
+from auth.token_cache import get_token_cache
 
-class AuthContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.auth = None
-        auth_header = request.headers.get("Authorization", "")
+class AuthContextMiddleware:
+    """Pure ASGI middleware that puts the bearer token's claims on ``request.state.auth``.
 
-        if auth_header.startswith("Bearer "):
-            token = auth_header.split(" ", 1)[1].strip()
+    Unlike ``BaseHTTPMiddleware`` it does not wrap the response, so streamed
+    bodies pass straight through, and verified tokens come from the
+    ``VerifiedTokenCache`` instead of re-checking the signature per request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.tokens = get_token_cache()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        # a per-request copy so lifespan state shared between requests is never mutated
+        state = dict(scope.get("state") or {})
+        state["auth"] = None
+        token = self._bearer_token(scope)
+        if token:
             try:
-                payload = decode_token(token)  # may raise on invalid/expired
-                # Normalize expected claims: sub (user id) and role (if present)
-                request.state.auth = {
+                payload = self.tokens.verify(token)  # may raise on invalid/expired
+                # Normalize expected claims: sub (user guid) and role (if present)
+                state["auth"] = {
                     "sub": payload.get("sub"),
                     "role": payload.get("role")
                 }
             except JWTError as e:
                 # Leave state.auth as None; dependencies will reject if required
-                request.state.auth = None
-                request.state.auth_error = str(e)  # keep cause; dependency can use/log it
+                state["auth_error"] = str(e)  # keep cause; dependency can use/log it
+
+        await self.app({**scope, "state": state}, receive, send)
 
-        response = await call_next(request)
-        return response
+    @staticmethod
+    def _bearer_token(scope):
+        for name, value in scope.get("headers", ()):
+            if name == b"authorization":
+                header = value.decode("latin-1")
+                if header.startswith("Bearer "):
+                    return header.split(" ", 1)[1].strip()
+                return None
+        return None
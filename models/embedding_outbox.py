@@ -0,0 +1,24 @@
+from sqlalchemy import Column, BigInteger, DateTime, Index, Integer, JSON, String, Text
+from connection.database import Base
+from datetime import datetime as dt
+
+class EmbeddingOutbox(Base):
+    __tablename__ = "embedding_outbox"
+    __table_args__ = (
+        Index("ix_embedding_outbox_status_available", "status", "available_at"),
+        # the worker's newer-row check and its cleanup of superseded rows look rows up per document
+        Index("ix_embedding_outbox_document", "collection", "document_id", "outbox_id"),
+    )
+
+    # written in the same transaction as the task log; drained into Chroma by the outbox worker
+    outbox_id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    collection = Column(String(100), nullable=False)
+    document_id = Column(String(64), nullable=False)
+    document = Column(Text, nullable=False)
+    document_metadata = Column(JSON)
+    # pending -> picked up once available_at has passed; dead -> gave up after OUTBOX_MAX_ATTEMPTS
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=dt.utcnow)
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=dt.utcnow)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Uuid, Integer, DateTime
+from connection.database import Base
+
+class OpenTimer(Base):
+    __tablename__ = "open_timers"
+
+    # one row per running timer, kept next to the partitioned task_logs so a start never scans it;
+    # written and deleted in the same transaction as the log it points at
+    ace_task_id = Column(Integer, primary_key=True)
+    user_id = Column(Uuid, primary_key=True)
+    log_id = Column(Uuid, nullable=False)
+    # with log_id, the task_logs primary key: the log is read from its own partition
+    start_time = Column(DateTime, nullable=False)
@@ -13,3 +13,5 @@ class Projects(Base):
     start_date = Column(DateTime)
     end_date = Column(DateTime)
     supervisor_id = Column(Integer, ForeignKey("users.ace_user_id"), nullable=True)
+    # sha256 of the ACE fields this row was last synced from
+    content_hash = Column(String(64))
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Date, Float, Index, Integer, Uuid
+from connection.database import Base
+
+# Daily time-tracking totals maintained by TaskService.stop_task (and cli.rebuild_rollups).
+# total_duration is in the same unit as task_logs.duration; the day is the log's start date.
+
+class UserDailyRollup(Base):
+    __tablename__ = "rollup_user_daily"
+
+    user_id = Column(Uuid, primary_key=True)
+    day = Column(Date, primary_key=True)
+    total_duration = Column(Float, nullable=False, default=0)
+    log_count = Column(Integer, nullable=False, default=0)
+
+class ProjectDailyRollup(Base):
+    __tablename__ = "rollup_project_daily"
+
+    ace_project_id = Column(Integer, primary_key=True, autoincrement=False)
+    day = Column(Date, primary_key=True)
+    total_duration = Column(Float, nullable=False, default=0)
+    log_count = Column(Integer, nullable=False, default=0)
+
+class TaskDailyRollup(Base):
+    __tablename__ = "rollup_task_daily"
+    __table_args__ = (
+        Index("ix_rollup_task_daily_user_day", "user_id", "day"),
+        Index("ix_rollup_task_daily_project_day", "ace_project_id", "day"),
+    )
+
+    ace_task_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Uuid, primary_key=True)
+    day = Column(Date, primary_key=True)
+    ace_project_id = Column(Integer, nullable=False)
+    total_duration = Column(Float, nullable=False, default=0)
+    log_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,50 @@
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, JSON, String, Text
+from connection.database import Base
+from datetime import datetime as dt
+
+# Background sync state shared by every app worker; the worker holding the scheduler lock runs the jobs.
+
+class SyncJobRecord(Base):
+    __tablename__ = "sync_jobs"
+    __table_args__ = (
+        # dispatch and the one-active-job-per-guid check
+        Index("ix_sync_jobs_status_created", "status", "created_at"),
+        Index("ix_sync_jobs_guid_status", "guid", "status"),
+    )
+
+    job_id = Column(String(36), primary_key=True)
+    guid = Column(String(250), nullable=False)
+    # queued -> running -> succeeded | failed | cancelled
+    status = Column(String(20), nullable=False, default="queued")
+    trigger = Column(String(20), nullable=False, default="manual")
+    full_resync = Column(Boolean, nullable=False, default=False)
+    stream = Column(Boolean, nullable=False, default=False)
+    # set by any worker; the worker running the job stops at its next checkpoint
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    current_stage = Column(String(50))
+    stages = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=dt.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # heartbeat while running; a running job that stops beating is marked failed
+    updated_at = Column(DateTime, nullable=False, default=dt.utcnow)
+
+class SyncBatchRecord(Base):
+    __tablename__ = "sync_batches"
+
+    batch_id = Column(String(36), primary_key=True)
+    job_ids = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=dt.utcnow)
+
+class SyncScheduleRecord(Base):
+    __tablename__ = "sync_schedules"
+
+    guid = Column(String(250), primary_key=True)
+    interval_minutes = Column(Integer, nullable=False)
+    full_resync = Column(Boolean, nullable=False, default=False)
+    stream = Column(Boolean, nullable=False, default=False)
+    # written back by the scheduler worker
+    next_run_time = Column(DateTime)
+    updated_at = Column(DateTime, nullable=False, default=dt.utcnow, onupdate=dt.utcnow)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Uuid, UniqueConstraint
+from uuid import uuid4
+from connection.database import Base
+from datetime import datetime as dt
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+    __table_args__ = (UniqueConstraint("guid", "entity", name="uq_sync_state_guid_entity"),)
+
+    sync_state_id = Column(Uuid, primary_key=True, default=uuid4, nullable=False)
+    guid = Column(String(250), nullable=False)
+    entity = Column(String(50), nullable=False)
+    watermark = Column(DateTime)
+    updated_at = Column(DateTime, default=dt.utcnow, onupdate=dt.utcnow)
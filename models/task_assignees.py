@@ -1,10 +1,15 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Uuid
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Uuid, Index, UniqueConstraint
 from uuid import uuid4
 from connection.database import Base
 from datetime import datetime as dt
 
 class TasksAssignees(Base):
     __tablename__ = "tasks_assignees"
+    __table_args__ = (
+        UniqueConstraint("ace_task_id", "ace_user_id", name="uq_tasks_assignees_task_user"),
+        # assigned-task listing filters on the user and joins on the task
+        Index("ix_tasks_assignees_user_task", "ace_user_id", "ace_task_id"),
+    )
     
     task_assignee_id = Column(Uuid, primary_key=True, default=uuid4, nullable=False)
     ace_task_id = Column(Integer, ForeignKey("tasks.ace_task_id"))
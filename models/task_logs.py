@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String,Text, ForeignKey, Uuid, Float, Integer, DateTime
+from sqlalchemy import Column, String,Text, ForeignKey, Uuid, Float, Integer, DateTime, Index
 from uuid import uuid4
 from connection.database import Base
 
 class TaskLogs(Base):
     __tablename__ = "task_logs"
+    __table_args__ = (
+        # date-range exports read logs in start_time order; open timers are found through open_timers
+        Index("ix_task_logs_start_time", "start_time", "log_id"),
+    )
 
     log_id = Column(Uuid, primary_key=True, default=uuid4, nullable=False)
     ace_task_id = Column(Integer, ForeignKey("tasks.ace_task_id"))
@@ -11,6 +15,9 @@ class TaskLogs(Base):
     duration = Column(Float)                 
     comment = Column(Text)     
     status = Column(String(50)) 
-    start_time = Column(DateTime)
+    # part of the key because task_logs is range-partitioned by month on start_time (PostgreSQL/MySQL).
+    # Alembic leaves SQLite on the baseline PRIMARY KEY (log_id); mapping start_time into the ORM key
+    # is still correct there because log_id alone is unique and start_time never changes after insert
+    start_time = Column(DateTime, primary_key=True, nullable=False)
     end_time = Column(DateTime)
 
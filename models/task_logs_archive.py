@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Text, Uuid, Float, Integer, DateTime, Index
+from connection.database import Base
+
+class TaskLogArchive(Base):
+    __tablename__ = "task_logs_archive"
+    __table_args__ = (Index("ix_task_logs_archive_start_time", "start_time"),)
+
+    # same columns as task_logs, without foreign keys so archived history outlives tasks and users
+    log_id = Column(Uuid, primary_key=True, nullable=False)
+    ace_task_id = Column(Integer)
+    user_id = Column(Uuid)
+    duration = Column(Float)
+    comment = Column(Text)
+    status = Column(String(50))
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
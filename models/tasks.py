@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Uuid, Index
 from uuid import uuid4
 from connection.database import Base
 from datetime import datetime as dt
 
 class Tasks(Base):
     __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_ace_project_id", "ace_project_id"),)
     
     task_id = Column(Uuid, primary_key=True, default=uuid4)
     ace_task_id = Column(Integer, nullable=False, unique=True)
@@ -14,3 +15,5 @@ class Tasks(Base):
     ace_project_id = Column(Integer, ForeignKey("projects.ace_project_id"))
     start_date = Column(DateTime)
     end_date = Column(DateTime)
+    # sha256 of the ACE fields this row was last synced from
+    content_hash = Column(String(64))
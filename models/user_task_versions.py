@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, Integer
+from connection.database import Base
+from datetime import datetime as dt
+
+class UserTaskVersion(Base):
+    __tablename__ = "user_task_versions"
+
+    # bumped whenever anything shown in the user's assigned-task listing changes
+    ace_user_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=dt.utcnow, onupdate=dt.utcnow)
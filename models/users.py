@@ -11,3 +11,6 @@ class Users(Base):
     guid = Column(String(250))
     email = Column(String(200), unique=True, nullable=False)
     role = Column(String(150))
+    # sha256 of the ACE fields this row was last synced from
+    content_hash = Column(String(64))
+
@@ -1,31 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from dependencies.get_db import get_db
-from services.data_service import DataService
+from fastapi import APIRouter, HTTPException, Response, status
 from dto.response import SuccessResponse
+from dto.sync import MultiTenantSyncRequest, SyncScheduleRequest
+from services.sync_jobs import get_sync_job_manager
 
 router = APIRouter(prefix="/data", tags=["Data"])
 
-@router.post("/save")
-def save_all_data(guid: str, db: Session = Depends(get_db)):
-    service = DataService(db)
-    try:
-        users_data = service.fetch_users(guid)
-        projects_data = service.fetch_projects(guid)
-        tasks_data = service.fetch_tasks(guid)
-        assignees_inserted = service.save_task_assignees(guid)
-        return SuccessResponse (
-            message="Users, Projects, Tasks & Assignees saved successfully",
-            data={
-                "users_count": len(users_data),
-                "projects_count": len(projects_data),
-                "tasks_count": len(tasks_data),
-                "assignees_inserted": assignees_inserted
-            },
-            error=None
-        )
-
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.post("/save", status_code=status.HTTP_202_ACCEPTED)
+async def save_all_data(guid: str, full_resync: bool = False, stream: bool = False):
+    job = get_sync_job_manager().submit(guid, full_resync=full_resync, stream=stream)
+    return SuccessResponse(
+        message="Sync job accepted",
+        data={"job_id": job.job_id, "status": job.status},
+        error=None
+    )
+
+@router.post("/save-many", status_code=status.HTTP_202_ACCEPTED)
+async def save_many_tenants(request: MultiTenantSyncRequest):
+    batch = get_sync_job_manager().submit_many(request.guids, full_resync=request.full_resync, stream=request.stream)
+    return SuccessResponse(
+        message="Multi-tenant sync accepted",
+        data={"batch_id": batch.batch_id, "job_ids": {job.guid: job.job_id for job in batch.jobs}},
+        error=None
+    )
+
+@router.get("/batches/{batch_id}")
+async def get_sync_batch(batch_id: str):
+    batch = get_sync_job_manager().get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync batch not found")
+    return SuccessResponse(message="Multi-tenant sync progress", data=batch.to_dict(), error=None)
+
+# -------- Sync Jobs --------
+@router.get("/jobs")
+async def list_sync_jobs(guid: str | None = None):
+    jobs = get_sync_job_manager().list_jobs(guid)
+    return SuccessResponse(message="Sync jobs", data=[job.to_dict() for job in jobs], error=None)
+
+@router.get("/jobs/{job_id}")
+async def get_sync_job(job_id: str):
+    job = get_sync_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return SuccessResponse(message="Sync job progress", data=job.to_dict(), error=None)
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_sync_job(job_id: str):
+    job = get_sync_job_manager().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return SuccessResponse(message="Sync job cancellation requested", data=job.to_dict(), error=None)
+
+# -------- Recurring Schedules --------
+@router.get("/schedules")
+async def list_sync_schedules():
+    return SuccessResponse(message="Sync schedules", data=get_sync_job_manager().list_schedules(), error=None)
+
+@router.put("/schedules/{guid}")
+async def set_sync_schedule(guid: str, request: SyncScheduleRequest):
+    schedule = get_sync_job_manager().set_schedule(
+        guid, request.interval_minutes, full_resync=request.full_resync, stream=request.stream
+    )
+    return SuccessResponse(message="Sync schedule saved", data=schedule, error=None)
+
+@router.delete("/schedules/{guid}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_sync_schedule(guid: str):
+    if not get_sync_job_manager().remove_schedule(guid):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync schedule not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
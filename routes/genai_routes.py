@@ -1,6 +1,4 @@
 from fastapi import APIRouter, Depends
-from langchain_chroma import Chroma
-from chromadb.api.models.Collection import Collection
 
 from dto.document import DocumentActionResponse, DocumentRequest
 from dto.prompt_dto import AskRequest, AskResponse
@@ -15,18 +13,27 @@ from services.llm_service import AskService
 
 genai_router = APIRouter(prefix="/genai", tags=["Embeddings"])
 
+# vector store dependencies are unannotated so chromadb/langchain load on first request, not at import
+
 @genai_router.post("/embeddings",response_model = DocumentActionResponse )
 async def add_documents(
     request: DocumentRequest,
-    col: Collection = Depends(get_chroma_collection)
+    col = Depends(get_chroma_collection)
 ):
     return await DocumentService(col).add_documents(request)
 
 @genai_router.post("/ask", response_model=AskResponse)
 async def ask_gemini(
     request: AskRequest,
-    vectordb: Chroma = Depends(get_langchain_chroma)
+    vectordb = Depends(get_langchain_chroma)
 ):
     return await AskService(vectordb).ask_question(request)
 
+@genai_router.post("/ask/stream")
+async def ask_gemini_stream(
+    request: AskRequest,
+    vectordb = Depends(get_langchain_chroma)
+):
+    return await AskService(vectordb).ask_question_stream(request)
+
 
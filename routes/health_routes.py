@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+from connection.database import engine
+from dto.response import ErrorCode, ErrorResponse, SuccessResponse
+from services.warmup import get_model_warmup
+
+router = APIRouter(tags=["Health"])
+
+@router.get("/health")
+def health():
+    return SuccessResponse(message="ok", data=None, error=None)
+
+@router.get("/ready", response_model=SuccessResponse | ErrorResponse)
+def ready(response: Response):
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database = {"ready": True, "error": None}
+    except Exception as e:
+        database = {"ready": False, "error": str(e)}
+
+    models = get_model_warmup().to_dict()
+    data = {"database": database, "models": models}
+    if not (database["ready"] and models["ready"]):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ErrorResponse(
+            message="Service is not ready",
+            error="Service Unavailable",
+            error_code=ErrorCode.SERVICE_UNAVAILABLE,
+            data=data
+        )
+    return SuccessResponse(message="Service is ready", data=data, error=None)
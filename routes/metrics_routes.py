@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from dto.response import SuccessResponse
+from auth.principal_cache import get_principal_cache
+from auth.token_cache import get_token_cache
+from connection.ace_client import get_ace_client
+from dependencies.get_db import get_db
+from services.embedding_outbox import EmbeddingOutboxService
+from services.embedding_service import get_embedding_service
+from services.task_cache import get_task_cache
+from utils.query_parser import parser_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/ace")
+def ace_metrics():
+    return SuccessResponse(message="ACE client metrics", data=get_ace_client().status(), error=None)
+
+@router.get("/cache")
+def cache_metrics():
+    return SuccessResponse(message="Assigned-task cache metrics", data=get_task_cache().stats(), error=None)
+
+@router.get("/outbox")
+def outbox_metrics(db: Session = Depends(get_db)):
+    return SuccessResponse(message="Embedding outbox metrics", data=EmbeddingOutboxService(db).stats(), error=None)
+
+@router.get("/auth")
+def auth_metrics():
+    data = {"tokens": get_token_cache().stats(), "principals": get_principal_cache().stats()}
+    return SuccessResponse(message="Auth cache metrics", data=data, error=None)
+
+@router.get("/embeddings")
+def embedding_metrics():
+    return SuccessResponse(message="Embedding service metrics", data=get_embedding_service().stats(), error=None)
+
+@router.get("/query-parser")
+def query_parser_metrics():
+    return SuccessResponse(message="Question parser metrics", data=parser_stats.stats(), error=None)
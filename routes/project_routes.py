@@ -9,6 +9,6 @@ router = APIRouter(
 )
 
 @router.post("/fetch-projects")
-def fetch_projects(guid: str, db: Session = Depends(get_db)):
+async def fetch_projects(guid: str, db: Session = Depends(get_db)):
     project_service = ProjectService(db)
-    return project_service.fetch_and_store_projects(guid)
+    return await project_service.afetch_and_store_projects(guid)
@@ -0,0 +1,47 @@
+from datetime import date
+from typing import Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from connection.database import SessionLocal
+from dependencies.get_db import get_db
+from dto.response import SuccessResponse
+from services.export_service import EXPORT_FORMATS, TaskLogExporter
+from services.report_service import ReportService
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+@router.get("/users/{user_id}")
+def user_report(user_id: UUID, start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db)):
+    report = ReportService(db).user_report(user_id, start, end)
+    return SuccessResponse(message="Time by day and project for the user", data=report, error=None)
+
+@router.get("/projects")
+def projects_report(start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db)):
+    report = ReportService(db).projects_report(start, end)
+    return SuccessResponse(message="Time by project", data=report, error=None)
+
+@router.get("/projects/{ace_project_id}")
+def project_report(ace_project_id: int, start: Optional[date] = None, end: Optional[date] = None, db: Session = Depends(get_db)):
+    report = ReportService(db).project_report(ace_project_id, start, end)
+    return SuccessResponse(message="Time by day and user for the project", data=report, error=None)
+
+# -------- Exports --------
+@router.get("/task-logs/export")
+def export_task_logs(
+    format: Literal["csv", "ndjson"] = "csv",
+    user_id: Optional[UUID] = None,
+    project_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    if start and end and start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+    exporter = TaskLogExporter(SessionLocal, user_id=user_id, ace_project_id=project_id, start=start, end=end)
+    filename = f"task_logs_{start or 'all'}_{end or 'all'}.{format}"
+    return StreamingResponse(
+        exporter.iter_format(format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from dependencies.chromadb_dependency import get_chroma_collection
-from chromadb.api.models.Collection import Collection
 
-from dto.task import TaskStartRequest, TaskStartResponse, TaskStopRequest, TaskStopMessageResponse
-from services.task_service import TaskService
-from dependencies.get_db import get_db
+from dto.task import TaskBatchRequest, TaskBatchResponse, TaskStartRequest, TaskStartResponse, TaskStopRequest, TaskStopMessageResponse
+from services.task_service import TASK_PAGE_MAX, TASK_PAGE_SIZE, TaskService
+from services.task_versions import TaskVersionService
+from services.task_cache import get_task_cache
+from services.timer_batch_service import aapply_batch
+from utils.etag import etag_matches, make_etag
+from dependencies.get_db import get_async_db, get_db
 
 router = APIRouter(
     prefix="/tasks", 
@@ -13,14 +17,45 @@ router = APIRouter(
 )
 
 @router.get("/{user_id}")
-def fetch_tasks(user_id: int, db: Session = Depends(get_db)):
-    service = TaskService(db)
-    return service.fetch_assigned_tasks(user_id)
+def fetch_tasks(
+    user_id: int,
+    response: Response,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_PAGE_MAX),
+    cursor: Optional[str] = None,
+    task_status: Optional[str] = Query(None, alias="status"),
+    project_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    # the version is read before the rows, so a concurrent change can only cause an extra refetch
+    version = TaskVersionService(db).get(user_id)
+    etag = make_etag(user_id, version, limit, cursor, task_status, project_id)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    items, next_cursor = get_task_cache().get_or_load(
+        user_id,
+        version,
+        (limit, cursor, task_status, project_id),
+        lambda: TaskService(db).fetch_assigned_tasks(
+            user_id, limit=limit, cursor=cursor, task_status=task_status, project_id=project_id
+        ),
+    )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.post("/start", response_model=TaskStartResponse)
-def start_task(request: TaskStartRequest, db: Session = Depends(get_db)):
-    return TaskService(db).start_task(request)
+async def start_task(request: TaskStartRequest, db: AsyncSession = Depends(get_async_db)):
+    return await TaskService(db).start_task(request)
 
 @router.post("/stop", response_model=TaskStopMessageResponse)
-async def stop_task(request: TaskStopRequest, db: Session = Depends(get_db),col : Collection = Depends(get_chroma_collection)):
-    return await TaskService(db).stop_task(request,col)
+async def stop_task(request: TaskStopRequest, db: AsyncSession = Depends(get_async_db)):
+    return await TaskService(db).stop_task(request)
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def apply_timer_batch(request: TaskBatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """Queued start/stop events from an offline client, applied all-or-nothing in one transaction."""
+    return await aapply_batch(db, request)
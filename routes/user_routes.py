@@ -11,8 +11,8 @@ router = APIRouter(
 )
 
 @router.post("/login", response_model=SuccessResponse | ErrorResponse)
-def login_user(request: UserRequest, response: Response, db: Session = Depends(get_db)):
+async def login_user(request: UserRequest, response: Response, db: Session = Depends(get_db)):
     service = UserService(db)
-    result, status_code = service.login_and_store_user(request)
+    result, status_code = await service.alogin_and_store_user(request)
     response.status_code = status_code
     return result
@@ -5,196 +5,307 @@ from models.projects import Projects
 from models.tasks import Tasks
 from models.task_assignees import TasksAssignees
 from models.users import Users
+from models.sync_state import SyncState
+from connection.ace_client import ACE_ERRORS, get_ace_client, get_async_ace_client
+from services.ingestion import BulkUpserter
+from services.project_index import get_project_index
+from services.task_versions import TaskVersionService
+from utils.json_stream import JsonArrayStream
+from typing import Iterator, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
-ACE_API_URL = os.getenv('ACE_API_URL')
+
+# ACE field used as the incremental-sync watermark for each entity
+WATERMARK_FIELDS = {
+    "projects": "DATE_MODIFIED",
+    "tasks": "DATE_TASK_MODIFIED",
+}
+# ACE-sourced columns covered by each table's content_hash
+USER_FIELDS = ("email", "role")
+PROJECT_FIELDS = ("project_name", "description", "start_date", "end_date", "supervisor_id")
+TASK_FIELDS = ("task_title", "description", "ace_project_id", "start_date", "end_date")
+ACE_STREAM_CHUNK_BYTES = int(os.getenv('ACE_STREAM_CHUNK_BYTES', '65536'))
+
+
+# -------- ACE Fetch --------
+def fetch_ace_results(fct: str, guid: str) -> list:
+    """Call one ACE list function and return its ``results``.
+
+    Touches no database session, so it is safe to run from worker threads.
+    """
+    params = {"fct": fct, "guid": guid, "format": "json"}
+    try:
+        data = get_ace_client().get_json(params)
+    except requests.RequestException as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+    return _ace_results(fct, data)
+
+
+async def afetch_ace_results(fct: str, guid: str) -> list:
+    """``fetch_ace_results`` on the shared async client."""
+    params = {"fct": fct, "guid": guid, "format": "json"}
+    try:
+        data = await get_async_ace_client().get_json(params)
+    except ACE_ERRORS as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+    return _ace_results(fct, data)
+
+
+def _ace_results(fct: str, data: dict) -> list:
+    # getprojects is only checked for a non-empty results list
+    if fct != "getprojects" and data.get("status") != "ok":
+        return []
+    return data.get("results", []) or []
+
+
+def open_ace_stream(fct: str, guid: str) -> requests.Response:
+    """Start an ACE list call without reading its body (see ``iter_ace_results``)."""
+    params = {"fct": fct, "guid": guid, "format": "json"}
+    try:
+        return get_ace_client().get(params, stream=True)
+    except requests.RequestException as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+
+
+def iter_ace_results(fct: str, response: requests.Response) -> Iterator[dict]:
+    """Yield the ``results`` of a streamed ACE response one record at a time.
+
+    Applies the same status check as ``fetch_ace_results`` and always closes
+    the response. ACE sends ``status`` before ``results``, so a failed call
+    yields nothing. A non-ok ``status`` read only after the array is too late
+    to hold back records the caller may already have committed, so it raises
+    instead and the stage fails without advancing its watermark.
+    """
+    stream = JsonArrayStream(response.iter_content(chunk_size=ACE_STREAM_CHUNK_BYTES))
+    yielded = 0
+    try:
+        for item in stream:
+            if not _stream_ok(fct, stream):
+                return
+            yielded += 1
+            yield item
+        if yielded and not _stream_ok(fct, stream):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"ACE API reported status {stream.fields.get('status')!r} after {yielded} {fct} records",
+            )
+    except requests.RequestException as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+    finally:
+        response.close()
+
+
+def _stream_ok(fct: str, stream: JsonArrayStream) -> bool:
+    # getprojects is only checked for a non-empty results list, as in _ace_results
+    return fct == "getprojects" or stream.fields.get("status", "ok") == "ok"
+
 
 class DataService:
     def __init__(self, db: Session):
         self.db = db
+        self.upserter = BulkUpserter(db)
+        self.versions = TaskVersionService(db)
 
     # -------- Fetch & Save Users (no GUID) --------
     def fetch_users(self, guid: str):
-        params = {"fct": "getusers", "guid": guid, "format": "json"}
-        try:
-            response = requests.get(ACE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "ok":
-                return []
-
-            users_data = data.get("results", []) or []
-            inserted = 0
-
-            for item in users_data:
-                ace_user_id = item.get("USER_ID") or item.get("ACE_USER_ID") or item.get("ID_USER")
-                email = item.get("EMAIL_ALERT") or item.get("EMAIL")
-                role = item.get("ROLE") or item.get("USER_ROLE")
-
-                if ace_user_id is None or email is None:
-                    continue
-
-                try:
-                    ace_user_id_int = int(ace_user_id)
-                except Exception:
-                    continue
-
-                existing = (
-                    self.db.query(Users)
-                    .filter((Users.ace_user_id == ace_user_id_int) | (Users.email == email))
-                    .first()
-                )
-                if existing:
-                    continue
-
-                self.db.add(Users(ace_user_id=ace_user_id_int, email=email, role=role))
-                inserted += 1
+        users_data = fetch_ace_results("getusers", guid)
+        self.save_users(users_data)
+        return users_data
 
-            if inserted:
-                self.db.commit()
+    def save_users(self, users_data, commit: bool = True) -> Tuple[int, int]:
+        rows = []
+        for item in users_data:
+            ace_user_id = item.get("USER_ID") or item.get("ACE_USER_ID") or item.get("ID_USER")
+            email = item.get("EMAIL_ALERT") or item.get("EMAIL")
+            role = item.get("ROLE") or item.get("USER_ROLE")
 
-            return users_data
+            if ace_user_id is None or email is None:
+                continue
 
-        except requests.RequestException as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+            try:
+                ace_user_id_int = int(ace_user_id)
+            except Exception:
+                continue
+
+            rows.append({"ace_user_id": ace_user_id_int, "email": email, "role": role})
+
+        # a new user is skipped when its email already belongs to another user
+        changed = set()
+        inserted, updated = self.upserter.upsert_changed(
+            Users, rows, "ace_user_id", USER_FIELDS, unique_keys=[("email",)], changed_keys=changed
+        )
+        # supervisor emails are shown in the assigned-task listings
+        self.versions.bump_supervisors(changed)
+        if (inserted or updated) and commit:
+            self.db.commit()
+        return inserted, updated
 
     # -------- Fetch & Save Projects --------
-    def fetch_projects(self, guid: str):
-        params = {"fct": "getprojects", "guid": guid, "format": "json"}
-        try:
-            response = requests.get(ACE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if "results" not in data or not data["results"]:
-                return []
-
-            projects_data = data["results"]
-
-            for project in projects_data:
-                existing = self.db.query(Projects).filter_by(ace_project_id=project["PROJECT_ID"]).first()
-                if not existing:
-                    new_project = Projects(
-                        ace_project_id=project["PROJECT_ID"],
-                        project_name=project.get("PROJECT_NAME", ""),
-                        description=project.get("PROJECT_DESC", ""),
-                        start_date=self._parse_date(project.get("DATE_CREATED")),
-                        end_date=self._parse_date(project.get("DATE_MODIFIED")),
-                        supervisor_id=project.get("PROJECT_CREATOR_ID", "")
-                    )
-                    self.db.add(new_project)
-
+    def fetch_projects(self, guid: str, full_resync: bool = False):
+        projects_data = fetch_ace_results("getprojects", guid)
+        changed, newest = self.changed_since(guid, "projects", projects_data, full_resync)
+        self.save_projects(changed)
+        self.set_watermark(guid, "projects", newest)
+        return projects_data
+
+    def save_projects(self, projects_data, commit: bool = True) -> Tuple[int, int]:
+        rows = [
+            {
+                "ace_project_id": int(project["PROJECT_ID"]),
+                "project_name": project.get("PROJECT_NAME", ""),
+                "description": project.get("PROJECT_DESC", ""),
+                "start_date": self._parse_date(project.get("DATE_CREATED")),
+                "end_date": self._parse_date(project.get("DATE_MODIFIED")),
+                "supervisor_id": project.get("PROJECT_CREATOR_ID", ""),
+            }
+            for project in projects_data
+        ]
+        changed = set()
+        inserted, updated = self.upserter.upsert_changed(
+            Projects, rows, "ace_project_id", PROJECT_FIELDS, changed_keys=changed
+        )
+        self.versions.bump_projects(changed)
+        if commit:
             self.db.commit()
-            return projects_data
-
-        except requests.RequestException as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+        if changed:
+            get_project_index().invalidate()
+        return inserted, updated
 
     # -------- Fetch & Save Tasks --------
-    def fetch_tasks(self, guid: str):
-        params = {"fct": "gettasks", "guid": guid, "format": "json"}
-        try:
-            response = requests.get(ACE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "ok":
-                return []
-
-            tasks_data = data.get("results", [])
-
-            for task in tasks_data:
-                existing = self.db.query(Tasks).filter_by(ace_task_id=task["TASK_ID"]).first()
-                if not existing:
-                    new_task = Tasks(
-                        ace_task_id=task["TASK_ID"],
-                        task_title=task.get("TASK_RESUME", ""),
-                        description=task.get("TASK_DESC_CREATOR", ""),
-                        ace_project_id=task["PROJECT_ID"],  # Links to Projects.ace_project_id
-                        start_date=self._parse_date(task.get("DATE_TASK_CREATED")),
-                        end_date=self._parse_date(task.get("DATE_TASK_MODIFIED"))
-                    )
-                    self.db.add(new_task)
-
+    def fetch_tasks(self, guid: str, full_resync: bool = False):
+        tasks_data = fetch_ace_results("gettasks", guid)
+        changed, newest = self.changed_since(guid, "tasks", tasks_data, full_resync)
+        self.save_tasks(changed)
+        self.set_watermark(guid, "tasks", newest)
+        return tasks_data
+
+    def save_tasks(self, tasks_data, commit: bool = True) -> Tuple[int, int]:
+        rows = [
+            {
+                "ace_task_id": int(task["TASK_ID"]),
+                "task_title": task.get("TASK_RESUME", ""),
+                "description": task.get("TASK_DESC_CREATOR", ""),
+                "ace_project_id": int(task["PROJECT_ID"]),  # Links to Projects.ace_project_id
+                "start_date": self._parse_date(task.get("DATE_TASK_CREATED")),
+                "end_date": self._parse_date(task.get("DATE_TASK_MODIFIED")),
+            }
+            for task in tasks_data
+        ]
+        changed = set()
+        inserted, updated = self.upserter.upsert_changed(
+            Tasks, rows, "ace_task_id", TASK_FIELDS, changed_keys=changed
+        )
+        self.versions.bump_tasks(changed)
+        if commit:
             self.db.commit()
-            return tasks_data
-
-        except requests.RequestException as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+        return inserted, updated
 
     # -------- Save Task Assignees (after tasks exist) --------
     def save_task_assignees(self, guid: str):
-        params = {"fct": "gettasks", "guid": guid, "format": "json"}
-        try:
-            response = requests.get(ACE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "ok":
-                return 0
+        return self.save_assignees(fetch_ace_results("gettasks", guid))
 
-            tasks_data = data.get("results", [])
-            inserted = 0
+    def save_assignees(self, tasks_data, commit: bool = True) -> int:
+        task_ids = []
+        for task in tasks_data:
+            try:
+                task_ids.append(int(task.get("TASK_ID")))
+            except (TypeError, ValueError):
+                task_ids.append(None)
+
+        # ensure task exists to satisfy FK
+        known_tasks = self.upserter.load_keys_for(Tasks.ace_task_id, values=task_ids)
+        rows = []
+
+        for task, ace_task_id in zip(tasks_data, task_ids):
+            if ace_task_id is None or ace_task_id not in known_tasks:
+                continue
+
+            assigned_at = self._parse_date(task.get("DATE_TASK_CREATED"))
+            for assignee_id in self._parse_assignee_ids(task.get("ASSIGNED_ID")):
+                rows.append({
+                    "ace_task_id": ace_task_id,
+                    "ace_user_id": assignee_id,
+                    "assigned_at": assigned_at,
+                })
+
+        # (ace_task_id, ace_user_id) is backed by uq_tasks_assignees_task_user
+        new_pairs = set()
+        inserted = self.upserter.insert_missing(
+            TasksAssignees, rows, [("ace_task_id", "ace_user_id")], inserted_keys=new_pairs
+        )
+        self.versions.bump_users(ace_user_id for _, ace_user_id in new_pairs)
+        if inserted and commit:
+            self.db.commit()
 
-            for task in tasks_data:
-                ace_task_id = task.get("TASK_ID")
-                if ace_task_id is None:
-                    continue
-                # ensure task exists to satisfy FK
-                task_exists = self.db.query(Tasks).filter_by(ace_task_id=ace_task_id).first()
-                if not task_exists:
+        return inserted
+
+    # -------- Incremental Sync Watermarks --------
+    def get_watermark(self, guid: str, entity: str):
+        state = self.db.query(SyncState).filter_by(guid=guid, entity=entity).first()
+        return state.watermark if state else None
+
+    def set_watermark(self, guid: str, entity: str, watermark):
+        if watermark is None:
+            return
+        state = self.db.query(SyncState).filter_by(guid=guid, entity=entity).first()
+        if not state:
+            state = SyncState(guid=guid, entity=entity)
+            self.db.add(state)
+        if state.watermark is None or watermark > state.watermark:
+            state.watermark = watermark
+        self.db.commit()
+
+    def changed_since(self, guid: str, entity: str, records, full_resync: bool = False):
+        """Split off the records modified at or after the stored watermark.
+
+        Returns ``(changed_records, newest_modified)``; the caller stores
+        ``newest_modified`` once the changed records are committed. With
+        ``full_resync`` every record is returned.
+        """
+        watermark = None if full_resync else self.get_watermark(guid, entity)
+        return self.filter_changed(entity, records, watermark)
+
+    def filter_changed(self, entity: str, records, watermark, newest=None):
+        """``changed_since`` against an already loaded watermark.
+
+        ``newest`` carries the running maximum across streamed chunks.
+        Records without a parseable modification date are always treated
+        as changed.
+        """
+        field = WATERMARK_FIELDS[entity]
+        if newest is None:
+            newest = watermark
+        changed = []
+
+        for record in records:
+            modified = self._parse_date(record.get(field))
+            if modified is not None and (newest is None or modified > newest):
+                newest = modified
+            # >= so rows written in the same second as the last sync are not lost
+            if watermark is None or modified is None or modified >= watermark:
+                changed.append(record)
+
+        return changed, newest
+
+    # -------- Assignee Parser --------
+    def _parse_assignee_ids(self, val):
+        if val is None:
+            return []
+        if isinstance(val, int):
+            return [val]
+        if isinstance(val, str):
+            parts = [p.strip() for p in val.split(",") if p and p.strip()]
+            ids = []
+            for p in parts:
+                try:
+                    ids.append(int(p))
+                except Exception:
                     continue
-
-                assigned_at = self._parse_date(task.get("DATE_TASK_CREATED"))
-                assigned_ids_raw = task.get("ASSIGNED_ID")
-
-                def _parse_assignee_ids(val):
-                    if val is None:
-                        return []
-                    if isinstance(val, int):
-                        return [val]
-                    if isinstance(val, str):
-                        parts = [p.strip() for p in val.split(",") if p and p.strip()]
-                        ids = []
-                        for p in parts:
-                            try:
-                                ids.append(int(p))
-                            except Exception:
-                                continue
-                        return ids
-                    return []
-
-                assignee_ids = _parse_assignee_ids(assigned_ids_raw)
-
-                for assignee_id in assignee_ids:
-                    exists_assignment = (
-                        self.db.query(TasksAssignees)
-                        .filter(
-                            TasksAssignees.ace_task_id == ace_task_id,
-                            TasksAssignees.ace_user_id == assignee_id,
-                        )
-                        .first()
-                    )
-                    if not exists_assignment:
-                        self.db.add(
-                            TasksAssignees(
-                                ace_task_id=ace_task_id,
-                                ace_user_id=assignee_id,
-                                assigned_at=assigned_at,
-                            )
-                        )
-                        inserted += 1
-
-            if inserted:
-                self.db.commit()
-
-            return inserted
-        except requests.RequestException as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calling ACE API: {str(e)}")
+            return ids
+        return []
 
     # -------- Date Parser --------
     def _parse_date(self, date_str):
@@ -1,32 +1,39 @@
+from typing import TYPE_CHECKING
 from datetime import datetime
 from fastapi import HTTPException
-from chromadb.api.models.Collection import Collection
-from sentence_transformers import SentenceTransformer
 
 from dto.document import DocumentActionResponse, DocumentRequest
+from services.embedding_service import get_embedding_service
+
+if TYPE_CHECKING:
+    from chromadb.api.models.Collection import Collection
+
+def normalize_metadata(metadata):
+    """Turn the string timestamps of task-log metadata into epoch seconds Chroma can filter on."""
+    if metadata:
+        for meta in metadata:
+            date_str_start_time = meta.get("start_time")
+            if date_str_start_time and isinstance(date_str_start_time, str):
+                dt = datetime.fromisoformat(date_str_start_time)
+                meta["date"] = int(dt.timestamp())
+            if date_str_end_time := meta.get("end_time"):
+                if isinstance(date_str_end_time, str):
+                    dt = datetime.fromisoformat(date_str_end_time)
+                    meta["end_time"] = int(dt.timestamp())
+    return metadata
 
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
 
 class DocumentService:
-    def __init__(self, col: Collection):
+    def __init__(self, col: "Collection"):
         self.col = col
 
     async def add_documents(self, req: DocumentRequest) -> DocumentActionResponse:
         try:
-            if req.metadata:
-                for meta in req.metadata:
-                    date_str_start_time = meta.get("start_time")
-                    if date_str_start_time and isinstance(date_str_start_time, str):
-                        dt = datetime.strptime(date_str_start_time, "%Y-%m-%d")
-                        meta["date"] = int(dt.timestamp())
-                    if date_str_end_time := meta.get("end_time"):
-                        if isinstance(date_str_end_time, str):
-                            dt = datetime.strptime(date_str_end_time, "%Y-%m-%d")
-                            meta["end_time"] = int(dt.timestamp())
-
+            normalize_metadata(req.metadata)
             self.col.add(
                 ids=req.id,
                 documents=req.document,
+                embeddings=await get_embedding_service().aembed(req.document),
                 metadatas=req.metadata
             )
             return DocumentActionResponse(
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from cachetools import LRUCache
+from dotenv import load_dotenv
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, the directory must not be shared
+    fcntl = None
+
+load_dotenv()
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '20000'))
+# empty disables the on-disk tier; otherwise a directory that one process locks and owns
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', '')
+EMBEDDING_DISK_CACHE_ROWS = int(os.getenv('EMBEDDING_DISK_CACHE_ROWS', '200000'))
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode- and whitespace-normalized text; variants that embed identically share a key."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(model_id: str, text: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class DiskTier:
+    """Fixed-size ring of float32 vectors in a memory-mapped file.
+
+    ``vectors.f32`` holds ``rows x dim`` floats; ``index.log`` is an
+    append-only list of ``<key> <row>`` lines, replayed on start so the
+    cache survives restarts. When the ring is full the oldest row is
+    overwritten. The first process to open a directory holds an exclusive
+    ``flock`` on it for its lifetime; opening it from another process (or a
+    second time) raises ``BlockingIOError``, so app workers sharing
+    ``EMBEDDING_CACHE_DIR`` never write the same files.
+    """
+
+    def __init__(self, directory: Path, dim: int, rows: int = EMBEDDING_DISK_CACHE_ROWS):
+        import numpy as np
+
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(directory / "lock", "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                raise
+        meta_path = directory / "meta.json"
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else None
+        if meta != {"dim": dim, "rows": rows}:
+            # a different shape makes the old file unreadable; start over
+            for name in ("vectors.f32", "index.log"):
+                (directory / name).unlink(missing_ok=True)
+            meta_path.write_text(json.dumps({"dim": dim, "rows": rows}))
+        self.dim = dim
+        self.rows = rows
+        vectors_path = directory / "vectors.f32"
+        mode = "r+" if vectors_path.exists() else "w+"
+        self.vectors = np.memmap(vectors_path, dtype=np.float32, mode=mode, shape=(rows, dim))
+        self.index_path = directory / "index.log"
+        self.keys: Dict[str, int] = {}
+        self.row_keys: Dict[int, str] = {}
+        self.next_row = 0
+        self._load_index()
+        self._index = open(self.index_path, "a", encoding="ascii")
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        lines = 0
+        with open(self.index_path, encoding="ascii") as index:
+            for line in index:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue  # torn write from a crash
+                key, row = parts[0], int(parts[1])
+                if row >= self.rows:
+                    continue
+                self._assign(key, row)
+                self.next_row = (row + 1) % self.rows
+                lines += 1
+        if lines > 2 * len(self.keys) + 1000:
+            # compact: only the live mapping, in write order
+            ordered = sorted(self.row_keys.items(), key=lambda item: (item[0] - self.next_row) % self.rows)
+            temporary = self.index_path.with_suffix(".tmp")
+            temporary.write_text("".join(f"{key} {row}\n" for row, key in ordered), encoding="ascii")
+            temporary.replace(self.index_path)
+
+    def _assign(self, key: str, row: int):
+        previous = self.row_keys.get(row)
+        if previous is not None and self.keys.get(previous) == row:
+            del self.keys[previous]
+        self.keys[key] = row
+        self.row_keys[row] = key
+
+    def get(self, key: str) -> Optional[Tuple[float, ...]]:
+        row = self.keys.get(key)
+        if row is None:
+            return None
+        return tuple(self.vectors[row].tolist())
+
+    def put(self, key: str, vector: Sequence[float]):
+        if key in self.keys or len(vector) != self.dim:
+            return
+        row = self.next_row
+        self.vectors[row] = vector
+        self._assign(key, row)
+        self.next_row = (row + 1) % self.rows
+        # the vector is written before its index line, so a crashed process never indexes garbage
+        self._index.write(f"{key} {row}\n")
+
+    def flush(self):
+        # mapped pages already live in the OS page cache; msync-ing the whole map per batch is not worth it
+        self._index.flush()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: an in-memory LRU in front of an optional ``DiskTier``.
+
+    Keys are ``sha256(model_id + normalized text)``, so vectors from another
+    model, backend or normalization setting are never served. Vectors found
+    on disk are promoted to the memory tier. If the disk tier cannot be
+    opened (unwritable directory, or another process holds it) the cache
+    carries on with the memory tier alone.
+    """
+
+    def __init__(self, model_id: str, size: int = EMBEDDING_CACHE_SIZE, directory: str = EMBEDDING_CACHE_DIR):
+        self.model_id = model_id
+        self._memory: LRUCache = LRUCache(maxsize=max(size, 1))
+        self._disk_dir = (
+            Path(directory) / hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:16] if directory else None
+        )
+        self._disk: Optional[DiskTier] = None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        return cache_key(self.model_id, text)
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[List[float]]]:
+        found = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self.memory_hits += 1
+                elif self._disk is not None and (vector := self._disk.get(key)) is not None:
+                    self.disk_hits += 1
+                    self._memory[key] = vector
+                else:
+                    self.misses += 1
+                found.append(list(vector) if vector is not None else None)
+        return found
+
+    def put_many(self, keys: Sequence[str], vectors: Sequence[Sequence[float]]):
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                vector = tuple(vector)
+                self._memory[key] = vector
+                disk = self._disk_for(len(vector))
+                if disk is not None:
+                    disk.put(key, vector)
+            if self._disk is not None:
+                self._disk.flush()
+
+    def _disk_for(self, dim: int) -> Optional[DiskTier]:
+        # opened on the first write because the vector size is only known then;
+        # an existing directory is opened earlier by ``open_disk``
+        if self._disk is None and self._disk_dir is not None:
+            self._open_tier(dim)
+        return self._disk
+
+    def _open_tier(self, dim: int):
+        try:
+            self._disk = DiskTier(self._disk_dir, dim)
+        except OSError as e:
+            logger.warning("Embedding disk cache at %s disabled: %s", self._disk_dir, e)
+            self._disk_dir = None
+
+    def open_disk(self):
+        """Open an existing disk tier up front so its vectors are served before the first write."""
+        meta = self._disk_dir / "meta.json" if self._disk_dir else None
+        if meta is not None and meta.exists():
+            with self._lock:
+                if self._disk is None:
+                    self._open_tier(json.loads(meta.read_text())["dim"])
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk) if self._disk is not None else None,
+        }
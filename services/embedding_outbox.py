@@ -0,0 +1,280 @@
+import copy
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from dotenv import load_dotenv
+import os
+
+from connection.database import SessionLocal
+from dependencies.chromadb_dependency import task_collection_name
+from dto.document import DocumentRequest
+from models.embedding_outbox import EmbeddingOutbox
+from services.document_service import normalize_metadata
+from services.embedding_service import get_embedding_service
+
+load_dotenv()
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '100'))
+# how often the scheduler drains the outbox; 0 disables the in-app worker
+OUTBOX_POLL_SECONDS = int(os.getenv('OUTBOX_POLL_SECONDS', '5'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+# a claimed row becomes available again after this long if its worker died mid-batch
+OUTBOX_LEASE_SECONDS = int(os.getenv('OUTBOX_LEASE_SECONDS', '120'))
+OUTBOX_BACKOFF_SECONDS = int(os.getenv('OUTBOX_BACKOFF_SECONDS', '10'))
+OUTBOX_BACKOFF_MAX_SECONDS = int(os.getenv('OUTBOX_BACKOFF_MAX_SECONDS', '3600'))
+
+PENDING = "pending"
+DEAD = "dead"
+LOCKING_DIALECTS = ("postgresql", "mysql")
+
+
+def task_log_document(log, task_title: Optional[str], project_name: Optional[str]) -> Dict:
+    """The Chroma document for a stopped log (a TaskLogs row or a dict with its columns)."""
+    value = log.get if isinstance(log, dict) else lambda name: getattr(log, name)
+    return {
+        "id": str(value("log_id")),
+        "document": f"{project_name} - {task_title}: {value('comment')}",
+        "metadata": {
+            "status": value("status"),
+            "duration": value("duration"),
+            "start_time": str(value("start_time")),
+            "end_time": str(value("end_time")),
+        },
+    }
+
+
+class EmbeddingOutboxService:
+    """Writes documents to the outbox inside the caller's transaction.
+
+    Nothing reaches the vector store here: the rows become visible to the
+    worker only when the caller commits, so a log and its pending embedding
+    are stored (or rolled back) together.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, req: DocumentRequest, collection: Optional[str] = None) -> int:
+        if not req.id:
+            return 0
+        collection = collection or task_collection_name()
+        metadata = req.metadata or [None] * len(req.id)
+        now = datetime.utcnow()
+        self.db.execute(insert(EmbeddingOutbox), [
+            {
+                "collection": collection,
+                "document_id": document_id,
+                "document": document,
+                "document_metadata": meta,
+                "status": PENDING,
+                "attempts": 0,
+                "available_at": now,
+                "created_at": now,
+            }
+            for document_id, document, meta in zip(req.id, req.document, metadata)
+        ])
+        return len(req.id)
+
+    def stats(self) -> Dict:
+        now = datetime.utcnow()
+        counts = dict(self.db.execute(
+            select(EmbeddingOutbox.status, func.count()).group_by(EmbeddingOutbox.status)
+        ).all())
+        oldest = self.db.execute(
+            select(func.min(EmbeddingOutbox.created_at)).where(EmbeddingOutbox.status == PENDING)
+        ).scalar()
+        return {
+            "pending": counts.get(PENDING, 0),
+            "dead": counts.get(DEAD, 0),
+            "oldest_pending_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        }
+
+    def requeue_dead(self) -> int:
+        """Give dead-lettered rows a fresh set of attempts (e.g. after a Chroma outage)."""
+        result = self.db.execute(
+            update(EmbeddingOutbox)
+            .where(EmbeddingOutbox.status == DEAD)
+            .values(status=PENDING, attempts=0, available_at=datetime.utcnow())
+        )
+        return result.rowcount
+
+
+async def aenqueue_documents(db: AsyncSession, req: DocumentRequest) -> int:
+    """``EmbeddingOutboxService.enqueue`` for an AsyncSession (the timer endpoints)."""
+    return await db.run_sync(lambda session: EmbeddingOutboxService(session).enqueue(req))
+
+
+class EmbeddingOutboxWorker:
+    """Drains the outbox into Chroma in batches.
+
+    Rows are claimed with a lease (``available_at`` pushed forward and
+    ``attempts`` incremented) in a short transaction, using ``SKIP LOCKED``
+    where the database supports it so several app workers can drain
+    concurrently. Delivered rows are deleted; failed ones are retried with
+    exponential backoff and dead-lettered after ``OUTBOX_MAX_ATTEMPTS``.
+    Chroma writes use ``upsert``, so a retried or re-claimed row is harmless.
+    A row is only claimed while no newer row exists for its document, and
+    delivering a document (or dead-lettering its newest row) deletes its
+    older rows, so a retried or backed-off row does not overwrite newer
+    content and superseded rows never linger as pending.
+    """
+
+    def __init__(self, session_factory=SessionLocal, client=None, batch_size: int = OUTBOX_BATCH_SIZE):
+        self.session_factory = session_factory
+        self._client = client
+        self.batch_size = max(int(batch_size), 1)
+
+    @property
+    def client(self):
+        if self._client is None:
+            from connection.vectordb import get_chroma_client
+
+            self._client = get_chroma_client()
+        return self._client
+
+    def drain(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        report = {"delivered": 0, "failed": 0, "dead": 0}
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            rows = self.claim()
+            if not rows:
+                break
+            batches += 1
+            for key, value in self.deliver(rows).items():
+                report[key] += value
+        return report
+
+    def claim(self) -> List[Dict]:
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            newer = aliased(EmbeddingOutbox)
+            stmt = (
+                select(EmbeddingOutbox)
+                .where(
+                    EmbeddingOutbox.status == PENDING,
+                    EmbeddingOutbox.available_at <= now,
+                    # superseded rows wait for the newer one, whose delivery or death deletes them
+                    # (ix_embedding_outbox_document serves this lookup)
+                    ~exists().where(
+                        newer.collection == EmbeddingOutbox.collection,
+                        newer.document_id == EmbeddingOutbox.document_id,
+                        newer.outbox_id > EmbeddingOutbox.outbox_id,
+                    ),
+                )
+                .order_by(EmbeddingOutbox.available_at, EmbeddingOutbox.outbox_id)
+                .limit(self.batch_size)
+            )
+            if db.get_bind().dialect.name in LOCKING_DIALECTS:
+                stmt = stmt.with_for_update(skip_locked=True)
+            rows = [
+                {
+                    "outbox_id": row.outbox_id,
+                    "collection": row.collection,
+                    "document_id": row.document_id,
+                    "document": row.document,
+                    "document_metadata": row.document_metadata,
+                    "attempts": row.attempts + 1,
+                }
+                for row in db.execute(stmt).scalars()
+            ]
+            if rows:
+                db.execute(
+                    update(EmbeddingOutbox)
+                    .where(EmbeddingOutbox.outbox_id.in_([row["outbox_id"] for row in rows]))
+                    .values(
+                        available_at=now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+                        attempts=EmbeddingOutbox.attempts + 1,
+                    )
+                )
+            db.commit()
+            return rows
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def deliver(self, rows: List[Dict]) -> Dict[str, int]:
+        by_collection: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_collection.setdefault(row["collection"], []).append(row)
+
+        delivered, failed, written = [], {}, []
+        for collection, group in by_collection.items():
+            # a log stopped twice is queued twice; only its latest document is written
+            latest = list({row["document_id"]: row for row in sorted(group, key=lambda row: row["outbox_id"])}.values())
+            try:
+                documents = [row["document"] for row in latest]
+                self.client.get_or_create_collection(name=collection).upsert(
+                    ids=[row["document_id"] for row in latest],
+                    documents=documents,
+                    embeddings=get_embedding_service().embed(documents),
+                    metadatas=normalize_metadata([copy.deepcopy(row["document_metadata"]) for row in latest]),
+                )
+                delivered.extend(row["outbox_id"] for row in group)
+                written.extend(latest)
+            except Exception as e:
+                for row in group:
+                    failed[row["outbox_id"]] = (row, str(e)[:2000])
+        return self._settle(delivered, failed, written)
+
+    def _settle(self, delivered: List[int], failed: Dict[int, tuple], written: List[Dict]) -> Dict[str, int]:
+        dying = [row for row, _ in failed.values() if row["attempts"] >= OUTBOX_MAX_ATTEMPTS]
+        db = self.session_factory()
+        try:
+            # older rows of a delivered or dead-lettered document (backing off, leased elsewhere or dead)
+            # are superseded now; ids are selected first because MySQL cannot delete from a table it reads
+            # in a subquery
+            stale = self._older_rows(db, written + dying)
+            if delivered or stale:
+                db.execute(delete(EmbeddingOutbox).where(EmbeddingOutbox.outbox_id.in_(delivered + stale)))
+            now = datetime.utcnow()
+            for outbox_id, (row, error) in failed.items():
+                values = {"last_error": error}
+                if row["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                    values["status"] = DEAD
+                else:
+                    values["available_at"] = now + timedelta(seconds=self.backoff(row["attempts"]))
+                db.execute(update(EmbeddingOutbox).where(EmbeddingOutbox.outbox_id == outbox_id).values(**values))
+            db.commit()
+            return {"delivered": len(delivered), "failed": len(failed) - len(dying), "dead": len(dying)}
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _older_rows(db: Session, rows: List[Dict]) -> List[int]:
+        if not rows:
+            return []
+        return list(db.execute(
+            select(EmbeddingOutbox.outbox_id).where(or_(*(
+                and_(
+                    EmbeddingOutbox.collection == row["collection"],
+                    EmbeddingOutbox.document_id == row["document_id"],
+                    EmbeddingOutbox.outbox_id < row["outbox_id"],
+                )
+                for row in rows
+            )))
+        ).scalars())
+
+    @staticmethod
+    def backoff(attempts: int) -> float:
+        return min(OUTBOX_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), OUTBOX_BACKOFF_MAX_SECONDS)
+
+
+_worker: EmbeddingOutboxWorker | None = None
+
+def get_embedding_outbox_worker() -> EmbeddingOutboxWorker:
+    global _worker
+    if _worker is None:
+        _worker = EmbeddingOutboxWorker()
+    return _worker
+
+
+def drain_embedding_outbox() -> Dict[str, int]:
+    """Scheduled job: deliver everything that is currently due."""
+    return get_embedding_outbox_worker().drain()
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional, Sequence
+from dotenv import load_dotenv
+import os
+
+from services.embedding_cache import EMBEDDING_CACHE_SIZE, EmbeddingCache
+
+load_dotenv()
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+# torch -> sentence-transformers on PyTorch, onnx -> ONNX Runtime, onnx-int8 -> ONNX Runtime with an int8 model
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch')
+# quantized export shipped in the model repo; use onnx/model_qint8_avx512_vnni.onnx or onnx/model_qint8_arm64.onnx where supported
+EMBEDDING_ONNX_FILE = os.getenv('EMBEDDING_ONNX_FILE', 'onnx/model_quint8_avx2.onnx')
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '64'))
+# how long the first queued text waits for others to join its batch
+EMBEDDING_MAX_WAIT_MS = float(os.getenv('EMBEDDING_MAX_WAIT_MS', '5'))
+EMBEDDING_NORMALIZE = os.getenv('EMBEDDING_NORMALIZE', 'true').lower() in ('1', 'true', 'yes')
+# how long a blocking embed() waits for its batch before giving up
+EMBEDDING_TIMEOUT_SECONDS = float(os.getenv('EMBEDDING_TIMEOUT_SECONDS', '60'))
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+logger = logging.getLogger(__name__)
+
+
+def model_id(backend: str = EMBEDDING_BACKEND, normalize: bool = EMBEDDING_NORMALIZE) -> str:
+    """Identifies everything that changes the vectors; part of every embedding cache key."""
+    weights = EMBEDDING_ONNX_FILE if backend == "onnx-int8" else backend
+    return f"{EMBEDDING_MODEL}|{weights}|{'normalized' if normalize else 'raw'}"
+
+
+def load_model(name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND):
+    """Load the sentence-transformers model for ``backend`` on CPU."""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(name, device="cpu")
+    model_kwargs = {"file_name": EMBEDDING_ONNX_FILE} if backend == "onnx-int8" else {}
+    return SentenceTransformer(
+        name, device="cpu", backend="onnx", model_kwargs={"provider": "CPUExecutionProvider", **model_kwargs}
+    )
+
+
+def _resolve(future: Future, value: Any = None, error: Optional[BaseException] = None):
+    """Settle ``future`` unless its caller already cancelled it."""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+    except InvalidStateError:
+        pass
+
+
+class _Request:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+
+
+class EmbeddingService:
+    """One process-wide embedding model behind a micro-batching queue.
+
+    Callers on any thread (or the event loop, via ``aembed``) submit texts;
+    a single worker thread takes the first waiting request, keeps collecting
+    for up to ``max_wait_ms`` or until ``batch_size`` texts are queued, and
+    encodes them in one forward pass. Concurrent single-text calls, like
+    /genai/ask queries, thus share batches with bulk ingest instead of each
+    running the model alone. Texts already in the ``EmbeddingCache`` (and
+    repeats within one call) never reach the queue.
+    """
+
+    def __init__(
+        self,
+        backend: str = EMBEDDING_BACKEND,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_wait_ms: float = EMBEDDING_MAX_WAIT_MS,
+        normalize: bool = EMBEDDING_NORMALIZE,
+        model=None,
+        use_cache: bool = EMBEDDING_CACHE_SIZE > 0,
+    ):
+        self.backend = backend
+        self.batch_size = max(int(batch_size), 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.normalize = normalize
+        self._model = model
+        self.cache = EmbeddingCache(model_id(backend, normalize)) if use_cache else None
+        if self.cache is not None:
+            self.cache.open_disk()
+        self._model_lock = threading.Lock()
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = load_model(backend=self.backend)
+        return self._model
+
+    def warmup(self):
+        """Load the model and run one encode so the first request does not pay for it."""
+        self.embed(["warmup"])
+
+    # -------- API --------
+    def embed(self, texts: Sequence[str], timeout: Optional[float] = EMBEDDING_TIMEOUT_SECONDS) -> List[List[float]]:
+        return self.submit(texts).result(timeout=timeout)
+
+    def embed_one(self, text: str, timeout: Optional[float] = EMBEDDING_TIMEOUT_SECONDS) -> List[float]:
+        return self.embed([text], timeout=timeout)[0]
+
+    async def aembed(self, texts: Sequence[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        texts = list(texts)
+        if self.cache is None or not texts:
+            return self._enqueue(texts)
+
+        keys = [self.cache.key(text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        # each distinct missing key is embedded once, however often it repeats
+        missing: Dict[str, int] = {}
+        for index, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[index], index)
+        result: Future = Future()
+        if not missing:
+            result.set_result(vectors)
+            return result
+
+        def fill(pending: Future):
+            if pending.exception() is not None:
+                _resolve(result, error=pending.exception())
+                return
+            computed = dict(zip(missing, pending.result()))
+            # callers get their vectors first; a failing cache write must never leave them waiting
+            _resolve(result, [vector if vector is not None else list(computed[key]) for key, vector in zip(keys, vectors)])
+            try:
+                self.cache.put_many(list(computed), list(computed.values()))
+            except Exception:
+                logger.exception("Embedding cache write failed")
+
+        self._enqueue([texts[index] for index in missing.values()]).add_done_callback(fill)
+        return result
+
+    def _enqueue(self, texts: List[str]) -> Future:
+        request = _Request(texts)
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    # -------- Worker --------
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].texts)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request.texts)
+            try:
+                self._encode(batch)
+            except Exception:
+                # the thread must outlive any one batch, or every later embed waits forever
+                logger.exception("Embedding batch failed")
+                for request in batch:
+                    _resolve(request.future, error=RuntimeError("Embedding batch failed"))
+
+    def _encode(self, batch: List[_Request]):
+        # a caller that gave up (a cancelled aembed) is dropped; the rest can no longer be cancelled
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for request in batch for text in request.texts]
+        try:
+            started = time.perf_counter()
+            vectors = self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ).tolist()
+            self.encode_seconds += time.perf_counter() - started
+            self.batches += 1
+            self.texts += len(texts)
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        offset = 0
+        for request in batch:
+            request.future.set_result(vectors[offset:offset + len(request.texts)])
+            offset += len(request.texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "loaded": self._model is not None,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "texts_per_second": round(self.texts / self.encode_seconds, 1) if self.encode_seconds else 0.0,
+            "queued": self._queue.qsize(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+
+class LangChainEmbeddings:
+    """LangChain ``Embeddings`` interface over the shared service (for langchain_chroma)."""
+
+    def __init__(self, service: EmbeddingService):
+        self.service = service
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.service.embed(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.service.embed_one(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.service.aembed(texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.service.aembed([text]))[0]
+
+
+_service: EmbeddingService | None = None
+
+def get_embedding_service() -> EmbeddingService:
+    global _service
+    if _service is None:
+        _service = EmbeddingService()
+    return _service
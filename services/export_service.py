@@ -0,0 +1,148 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterator, Optional
+from uuid import UUID
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+import os
+
+from models.projects import Projects
+from models.task_logs import TaskLogs
+from models.task_logs_archive import TaskLogArchive
+from models.tasks import Tasks
+from models.users import Users
+
+load_dotenv()
+# rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+# bytes buffered before a chunk is handed to the response
+EXPORT_CHUNK_BYTES = int(os.getenv('EXPORT_CHUNK_BYTES', '65536'))
+
+
+def export_columns(model=TaskLogs) -> tuple:
+    """The exported columns, read from ``task_logs`` or ``task_logs_archive``."""
+    return (
+        model.log_id,
+        model.user_id,
+        Users.email.label("user_email"),
+        model.ace_task_id,
+        Tasks.task_title,
+        Tasks.ace_project_id,
+        Projects.project_name,
+        model.status,
+        model.start_time,
+        model.end_time,
+        model.duration,
+        model.comment,
+    )
+
+
+EXPORT_FIELDS = [column.key for column in export_columns()]
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class TaskLogExporter:
+    """Streams task logs joined with task, project and user names.
+
+    Rows come from a server-side cursor (``stream_results`` + ``yield_per``)
+    and are encoded into fixed-size chunks, so memory stays flat however many
+    rows match. Logs moved to ``task_logs_archive`` are exported alongside
+    the live ones. The exporter owns its session because the response body
+    is produced after the request's dependencies have been torn down.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        user_id: Optional[UUID] = None,
+        ace_project_id: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ):
+        self.session_factory = session_factory
+        self.user_id = user_id
+        self.ace_project_id = ace_project_id
+        self.start = start
+        self.end = end
+
+    def query(self):
+        source = union_all(*[self._logs(model) for model in (TaskLogs, TaskLogArchive)]).subquery()
+        return select(source).order_by(source.c.start_time, source.c.log_id)
+
+    def _logs(self, model):
+        stmt = (
+            select(*export_columns(model))
+            .outerjoin(Tasks, Tasks.ace_task_id == model.ace_task_id)
+            .outerjoin(Projects, Projects.ace_project_id == Tasks.ace_project_id)
+            .outerjoin(Users, Users.user_id == model.user_id)
+        )
+        if self.user_id is not None:
+            stmt = stmt.where(model.user_id == self.user_id)
+        if self.ace_project_id is not None:
+            stmt = stmt.where(Tasks.ace_project_id == self.ace_project_id)
+        # both tables are indexed on start_time, so each branch reads only the requested range
+        if self.start is not None:
+            stmt = stmt.where(model.start_time >= datetime.combine(self.start, time.min))
+        if self.end is not None:
+            stmt = stmt.where(model.start_time < datetime.combine(self.end + timedelta(days=1), time.min))
+        return stmt
+
+    def rows(self) -> Iterator[dict]:
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                self.query().execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+            )
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            db.close()
+
+    # -------- Encoders --------
+    def iter_csv(self) -> Iterator[bytes]:
+        def lines():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            yield _drain(buffer)
+            for row in self.rows():
+                writer.writerow([_csv_value(row[field]) for field in EXPORT_FIELDS])
+                yield _drain(buffer)
+
+        return _chunks(lines())
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        return _chunks(json.dumps(row, default=str) + "\n" for row in self.rows())
+
+    def iter_format(self, fmt: str) -> Iterator[bytes]:
+        return self.iter_csv() if fmt == "csv" else self.iter_ndjson()
+
+
+def _chunks(lines: Iterator[str]) -> Iterator[bytes]:
+    """Join encoded lines into ~EXPORT_CHUNK_BYTES chunks; the first line is sent on its own
+    so the client gets bytes as soon as the query starts returning."""
+    pending, size = [], 0
+    for index, line in enumerate(lines):
+        pending.append(line)
+        size += len(line)
+        if index == 0 or size >= EXPORT_CHUNK_BYTES:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+def _drain(buffer: io.StringIO) -> str:
+    line = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return line
@@ -0,0 +1,239 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '1000'))
+# auto    -> dialect-native upsert on PostgreSQL / MySQL, key preloading elsewhere
+# native  -> always use INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE
+# preload -> always load existing keys once per table and insert only new rows
+INGEST_STRATEGY = os.getenv('INGEST_STRATEGY', 'auto')
+
+NATIVE_DIALECTS = ("postgresql", "mysql")
+HASH_COLUMN = "content_hash"
+
+
+def fingerprint(row: Dict[str, Any], fields: Sequence[str]) -> str:
+    """Stable sha256 over the given fields of a mapped ACE row."""
+    payload = json.dumps([row.get(field) for field in fields], default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BulkUpserter:
+    """Set-based writer for ACE payloads.
+
+    Instead of probing the database once per incoming row, existing keys are
+    loaded with a single query per table (or left to the database through an
+    ``ON CONFLICT`` / ``ON DUPLICATE KEY UPDATE`` clause) and new rows are
+    written with executemany in batches of ``batch_size``.
+    """
+
+    def __init__(self, db: Session, batch_size: int = INGEST_BATCH_SIZE, strategy: str = INGEST_STRATEGY):
+        if strategy not in ("auto", "native", "preload"):
+            raise ValueError(f"Unknown ingest strategy: {strategy}")
+        self.db = db
+        self.batch_size = max(int(batch_size), 1)
+        self.dialect = db.get_bind().dialect.name
+        if strategy == "auto":
+            strategy = "native" if self.dialect in NATIVE_DIALECTS else "preload"
+        if strategy == "native" and self.dialect not in NATIVE_DIALECTS:
+            raise ValueError(f"Native upsert is not supported for dialect {self.dialect}")
+        self.strategy = strategy
+
+    # -------- Key preloading --------
+    def load_keys(self, *columns, where=None) -> Set[Any]:
+        """Return every existing value (or value tuple) of ``columns`` in one query."""
+        stmt = select(*columns)
+        if where is not None:
+            stmt = stmt.where(where)
+        rows = self.db.execute(stmt).all()
+        if len(columns) == 1:
+            return {row[0] for row in rows}
+        return {tuple(row) for row in rows}
+
+    def load_keys_for(self, *columns, values) -> Set[Any]:
+        """Like ``load_keys`` but scoped to ``values`` of the first column.
+
+        Small inputs (up to ``batch_size`` distinct values, e.g. one streamed
+        chunk) are probed with a single ``IN`` query; larger ones load the
+        whole key set, which is cheaper than a huge ``IN`` list.
+        """
+        rows = self._scoped_rows(*columns, values=values)
+        if len(columns) == 1:
+            return {row[0] for row in rows}
+        return {tuple(row) for row in rows}
+
+    def _scoped_rows(self, *columns, values):
+        values = {value for value in values if value is not None}
+        if not values:
+            return []
+        stmt = select(*columns)
+        if len(values) <= self.batch_size:
+            stmt = stmt.where(columns[0].in_(values))
+        return self.db.execute(stmt).all()
+
+    # -------- Inserts --------
+    def insert_missing(
+        self,
+        model,
+        rows: Iterable[Dict[str, Any]],
+        unique_keys: Sequence[Sequence[str]],
+        use_native: bool = True,
+        inserted_keys: Optional[Set[Any]] = None,
+    ) -> int:
+        """Insert ``rows`` whose values are not yet present for any of ``unique_keys``.
+
+        ``unique_keys`` lists the column groups that identify a row, e.g.
+        ``[("ace_user_id",), ("email",)]``. Rows are de-duplicated against each
+        other as well as against the table. ``use_native`` must only be left on
+        when every key group is backed by a unique constraint in the database.
+        ``inserted_keys``, when given, collects the first key of every inserted
+        row.
+        """
+        rows = self._dedupe(rows, unique_keys)
+        if not rows:
+            return 0
+
+        native = self.strategy == "native" and use_native
+        if native and self.dialect == "postgresql":
+            return self._insert_native(model, rows, unique_keys, inserted_keys)
+
+        # MySQL has no way to report which rows of a batch were new (its drivers connect with
+        # CLIENT.FOUND_ROWS, so no-op duplicates count as affected), so it filters like preload
+        existing = [
+            self.load_keys_for(*[getattr(model, col) for col in key], values=[row.get(key[0]) for row in rows])
+            for key in unique_keys
+        ]
+        new_rows = [
+            row for row in rows
+            if not any(self._key(row, key) in seen for key, seen in zip(unique_keys, existing))
+        ]
+        if inserted_keys is not None:
+            inserted_keys.update(self._key(row, unique_keys[0]) for row in new_rows)
+        if native:
+            return self._insert_mysql(model, new_rows)
+        return self.insert_rows(model, new_rows)
+
+    def upsert_changed(
+        self,
+        model,
+        rows: Iterable[Dict[str, Any]],
+        key: str,
+        fields: Sequence[str],
+        unique_keys: Sequence[Sequence[str]] = (),
+        changed_keys: Optional[Set[Any]] = None,
+    ) -> Tuple[int, int]:
+        """Insert new rows and update only rows whose content fingerprint changed.
+
+        Each row gets a ``content_hash`` over ``fields``; existing rows are
+        matched on ``key`` and loaded together with their stored hash in one
+        query, so unchanged rows cost no write at all. ``unique_keys`` lists
+        further single-column unique keys (e.g. ``("email",)``): new rows
+        clashing with them are skipped, and so are updates that would move a
+        value already owned by another row. ``changed_keys``, when given,
+        collects the ``key`` of every inserted or updated row. Returns
+        ``(inserted, updated)``.
+        """
+        rows = self._dedupe(rows, [(key,), *unique_keys])
+        if not rows:
+            return 0, 0
+        for row in rows:
+            row[HASH_COLUMN] = fingerprint(row, fields)
+
+        pk = model.__mapper__.primary_key[0]
+        key_column = getattr(model, key)
+        existing = {
+            value: (pk_value, stored_hash)
+            for value, pk_value, stored_hash in self._scoped_rows(
+                key_column, pk, getattr(model, HASH_COLUMN), values=[row[key] for row in rows]
+            )
+        }
+
+        new_rows, changed = [], []
+        for row in rows:
+            current = existing.get(row[key])
+            if current is None:
+                new_rows.append(row)
+            elif current[1] != row[HASH_COLUMN]:
+                changed.append({pk.key: current[0], **row})
+
+        for unique_key in unique_keys:
+            column = unique_key[0]
+            owners = dict(self._scoped_rows(getattr(model, column), key_column, values=[row[column] for row in changed]))
+            changed = [row for row in changed if owners.get(row[column], row[key]) == row[key]]
+
+        inserted = self.insert_missing(model, new_rows, [(key,), *unique_keys], inserted_keys=changed_keys)
+        for batch in self._batches(changed):
+            self.db.execute(update(model), batch)
+        if changed_keys is not None:
+            changed_keys.update(row[key] for row in changed)
+        return inserted, len(changed)
+
+    def insert_rows(self, model, rows: List[Dict[str, Any]]) -> int:
+        """Plain batched executemany insert of already-filtered rows."""
+        for batch in self._batches(rows):
+            self.db.execute(insert(model), batch)
+        return len(rows)
+
+    def _insert_native(
+        self,
+        model,
+        rows: List[Dict[str, Any]],
+        unique_keys: Sequence[Sequence[str]],
+        inserted_keys: Optional[Set[Any]] = None,
+    ) -> int:
+        """PostgreSQL: ``ON CONFLICT DO NOTHING RETURNING`` reports exactly the inserted keys."""
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        table = model.__table__
+        key_columns = [table.c[col] for col in unique_keys[0]]
+        inserted = 0
+        for batch in self._batches(rows):
+            stmt = pg_insert(table).on_conflict_do_nothing().returning(*key_columns)
+            returned = self.db.execute(stmt, batch).all()
+            inserted += len(returned)
+            if inserted_keys is not None:
+                inserted_keys.update(row[0] if len(key_columns) == 1 else tuple(row) for row in returned)
+        return inserted
+
+    def _insert_mysql(self, model, rows: List[Dict[str, Any]]) -> int:
+        """MySQL: insert pre-filtered rows; a duplicate written concurrently since the key probe is kept as is.
+
+        Unlike ``INSERT IGNORE`` the no-op ``ON DUPLICATE KEY UPDATE pk = pk``
+        only absorbs duplicate keys; foreign-key, truncation and bad-value
+        errors still raise.
+        """
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        table = model.__table__
+        pk = model.__mapper__.primary_key[0]
+        for batch in self._batches(rows):
+            self.db.execute(mysql_insert(table).on_duplicate_key_update({pk.name: table.c[pk.name]}), batch)
+        return len(rows)
+
+    # -------- Helpers --------
+    def _batches(self, rows: List[Dict[str, Any]]):
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start:start + self.batch_size]
+
+    @staticmethod
+    def _key(row: Dict[str, Any], key: Sequence[str]):
+        if len(key) == 1:
+            return row.get(key[0])
+        return tuple(row.get(col) for col in key)
+
+    def _dedupe(self, rows: Iterable[Dict[str, Any]], unique_keys: Sequence[Sequence[str]]) -> List[Dict[str, Any]]:
+        seen = [set() for _ in unique_keys]
+        unique_rows = []
+        for row in rows:
+            keys = [self._key(row, key) for key in unique_keys]
+            if any(k in s for k, s in zip(keys, seen)):
+                continue
+            for k, s in zip(keys, seen):
+                s.add(k)
+            unique_rows.append(row)
+        return unique_rows
@@ -0,0 +1,109 @@
+import difflib
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+import os
+
+from connection.database import SessionLocal
+from models.projects import Projects
+
+load_dotenv()
+# project renames made outside the sync show up in question parsing within this many seconds
+PROJECT_INDEX_TTL_SECONDS = int(os.getenv('PROJECT_INDEX_TTL_SECONDS', '300'))
+# how close a misspelt "project <name>" must be to a real name (difflib ratio)
+PROJECT_MATCH_CUTOFF = float(os.getenv('PROJECT_MATCH_CUTOFF', '0.85'))
+
+
+def normalize_name(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class ProjectIndex:
+    """Project names from the ``Projects`` table, for spotting them in free text.
+
+    Names are compared lower-cased with punctuation collapsed, so
+    "ace-sync v2" in a question matches the project "ACE Sync V2". The
+    index is reloaded after ``ttl`` seconds or when the project sync
+    calls ``invalidate``.
+    """
+
+    def __init__(self, session_factory=SessionLocal, ttl: int = PROJECT_INDEX_TTL_SECONDS):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self._names: Dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        db = self.session_factory()
+        try:
+            rows = db.query(Projects.project_name).distinct().all()
+        finally:
+            db.close()
+        names = {}
+        for (name,) in rows:
+            key = normalize_name(name or "")
+            if len(key) >= 3:  # "QA" and the like would match inside ordinary questions
+                names[key] = name
+        return names
+
+    def names(self) -> Dict[str, str]:
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._names = self._load()
+                self._loaded_at = time.monotonic()
+            return self._names
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def match(self, text: str) -> Optional[str]:
+        """The project named in ``text``: the longest exact name, else a close match after "project".
+
+        A name only counts when the text says it is a project, by using the
+        word "project" or by quoting the name; otherwise a project called
+        "Support" would be read into every question about support work.
+        """
+        names = self.names()
+        padded = f" {normalize_name(text)} "
+        if " project " in padded or " projects " in padded:
+            scope = padded
+        else:
+            scope = "".join(f" {normalize_name(a or b)} " for a, b in re.findall(r'"([^"]+)"|(?<!\w)\'([^\']+)\'(?!\w)', text))
+        found = [key for key in names if f" {key} " in scope]
+        if found:
+            return names[max(found, key=len)]
+
+        for candidate in self._candidates(padded):
+            close = difflib.get_close_matches(candidate, names, n=1, cutoff=PROJECT_MATCH_CUTOFF)
+            if close:
+                return names[close[0]]
+        return None
+
+    @staticmethod
+    def _candidates(padded: str) -> List[str]:
+        # "project <up to four words>" / "<up to four words> project", longest first
+        words = padded.split()
+        candidates = []
+        for position, word in enumerate(words):
+            if word not in ("project", "projects"):
+                continue
+            for size in range(4, 0, -1):
+                after = words[position + 1:position + 1 + size]
+                before = words[max(position - size, 0):position]
+                for phrase in (after, before):
+                    if len(phrase) == size:
+                        candidates.append(" ".join(phrase))
+        return candidates
+
+
+_project_index: Optional[ProjectIndex] = None
+
+def get_project_index() -> ProjectIndex:
+    global _project_index
+    if _project_index is None:
+        _project_index = ProjectIndex()
+    return _project_index
@@ -0,0 +1,114 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from dto.report import DailyTotal, ProjectTotal, TimeReport, UserTotal
+from models.projects import Projects
+from models.rollups import ProjectDailyRollup, TaskDailyRollup, UserDailyRollup
+from models.users import Users
+
+
+class ReportService:
+    """Time reports served from the daily rollup tables only (never from task_logs)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def user_report(self, user_id: UUID, start: Optional[date] = None, end: Optional[date] = None) -> TimeReport:
+        self._check_range(start, end)
+        days = self._daily(UserDailyRollup, UserDailyRollup.user_id == user_id, start, end)
+
+        total = func.sum(TaskDailyRollup.total_duration)
+        stmt = (
+            select(TaskDailyRollup.ace_project_id, Projects.project_name, total, func.sum(TaskDailyRollup.log_count))
+            .outerjoin(Projects, Projects.ace_project_id == TaskDailyRollup.ace_project_id)
+            .where(TaskDailyRollup.user_id == user_id, *self._between(TaskDailyRollup, start, end))
+            .group_by(TaskDailyRollup.ace_project_id, Projects.project_name)
+            .order_by(total.desc())
+        )
+        projects = [
+            ProjectTotal(ace_project_id=project_id, project_name=name, total_duration=duration or 0.0, log_count=count or 0)
+            for project_id, name, duration, count in self.db.execute(stmt)
+        ]
+        return self._report(start, end, days, projects=projects)
+
+    def project_report(self, ace_project_id: int, start: Optional[date] = None, end: Optional[date] = None) -> TimeReport:
+        self._check_range(start, end)
+        days = self._daily(ProjectDailyRollup, ProjectDailyRollup.ace_project_id == ace_project_id, start, end)
+
+        total = func.sum(TaskDailyRollup.total_duration)
+        stmt = (
+            select(TaskDailyRollup.user_id, Users.email, total, func.sum(TaskDailyRollup.log_count))
+            .outerjoin(Users, Users.user_id == TaskDailyRollup.user_id)
+            .where(TaskDailyRollup.ace_project_id == ace_project_id, *self._between(TaskDailyRollup, start, end))
+            .group_by(TaskDailyRollup.user_id, Users.email)
+            .order_by(total.desc())
+        )
+        users = [
+            UserTotal(user_id=user_id, email=email, total_duration=duration or 0.0, log_count=count or 0)
+            for user_id, email, duration, count in self.db.execute(stmt)
+        ]
+        return self._report(start, end, days, users=users)
+
+    def projects_report(self, start: Optional[date] = None, end: Optional[date] = None) -> TimeReport:
+        """Totals per project over the range, largest first."""
+        self._check_range(start, end)
+        total = func.sum(ProjectDailyRollup.total_duration)
+        stmt = (
+            select(ProjectDailyRollup.ace_project_id, Projects.project_name, total, func.sum(ProjectDailyRollup.log_count))
+            .outerjoin(Projects, Projects.ace_project_id == ProjectDailyRollup.ace_project_id)
+            .where(*self._between(ProjectDailyRollup, start, end))
+            .group_by(ProjectDailyRollup.ace_project_id, Projects.project_name)
+            .order_by(total.desc())
+        )
+        projects = [
+            ProjectTotal(ace_project_id=project_id, project_name=name, total_duration=duration or 0.0, log_count=count or 0)
+            for project_id, name, duration, count in self.db.execute(stmt)
+        ]
+        return TimeReport(
+            start=start,
+            end=end,
+            total_duration=sum(project.total_duration for project in projects),
+            log_count=sum(project.log_count for project in projects),
+            projects=projects,
+        )
+
+    # -------- Helpers --------
+    def _daily(self, model, condition, start, end):
+        stmt = (
+            select(model.day, model.total_duration, model.log_count)
+            .where(condition, *self._between(model, start, end))
+            .order_by(model.day)
+        )
+        return [
+            DailyTotal(day=day, total_duration=duration, log_count=count)
+            for day, duration, count in self.db.execute(stmt)
+            if count
+        ]
+
+    @staticmethod
+    def _between(model, start, end):
+        conditions = []
+        if start is not None:
+            conditions.append(model.day >= start)
+        if end is not None:
+            conditions.append(model.day <= end)
+        return conditions
+
+    @staticmethod
+    def _check_range(start, end):
+        if start and end and start > end:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must not be after end")
+
+    @staticmethod
+    def _report(start, end, days, **breakdowns) -> TimeReport:
+        return TimeReport(
+            start=start,
+            end=end,
+            total_duration=sum(day.total_duration for day in days),
+            log_count=sum(day.log_count for day in days),
+            days=days,
+            **breakdowns,
+        )
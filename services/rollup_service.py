@@ -0,0 +1,144 @@
+from datetime import date, datetime
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Date, delete, func, insert, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.rollups import ProjectDailyRollup, TaskDailyRollup, UserDailyRollup
+from models.task_logs import TaskLogs
+from models.task_logs_archive import TaskLogArchive
+from models.tasks import Tasks
+
+ROLLUPS = (
+    (UserDailyRollup, ("user_id", "day")),
+    (ProjectDailyRollup, ("ace_project_id", "day")),
+    (TaskDailyRollup, ("ace_task_id", "user_id", "day")),
+)
+
+
+def log_day(start_time: Optional[datetime], end_time: Optional[datetime]) -> Optional[date]:
+    """The day a log is reported under: its start date, falling back to the end date."""
+    moment = start_time or end_time
+    return moment.date() if moment else None
+
+
+class RollupService:
+    """Maintains the daily rollup tables that back the report endpoints.
+
+    ``record`` adds a delta to all three grains with one atomic upsert per
+    table, so concurrent timers on the same user/project/day never lose an
+    update; ``rebuild`` recomputes the tables from ``task_logs`` and
+    ``task_logs_archive``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    # -------- Incremental updates --------
+    def record(self, user_id: UUID, ace_project_id: int, ace_task_id: int, day: date, duration: float, count: int = 1):
+        values = {
+            "user_id": user_id,
+            "ace_project_id": ace_project_id,
+            "ace_task_id": ace_task_id,
+            "day": day,
+            "total_duration": duration or 0.0,
+            "log_count": count,
+        }
+        for model, keys in ROLLUPS:
+            columns = {column.key for column in model.__table__.columns}
+            self.db.execute(self._increment(model, keys, {k: v for k, v in values.items() if k in columns}))
+
+    def record_stop(
+        self,
+        log: TaskLogs,
+        ace_project_id: int,
+        previous: Optional[Tuple[date, float]] = None,
+    ):
+        """Add a stopped log; ``previous`` is its earlier (day, duration) when it was already stopped once."""
+        if previous is not None:
+            self.record(log.user_id, ace_project_id, log.ace_task_id, previous[0], -(previous[1] or 0.0), count=-1)
+        day = log_day(log.start_time, log.end_time)
+        if day is not None:
+            self.record(log.user_id, ace_project_id, log.ace_task_id, day, log.duration)
+
+    def _increment(self, model, keys, values: dict):
+        table = model.__table__
+        if self.dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as upsert
+
+            stmt = upsert(table).values(values)
+            return stmt.on_duplicate_key_update(
+                total_duration=table.c.total_duration + stmt.inserted.total_duration,
+                log_count=table.c.log_count + stmt.inserted.log_count,
+            )
+        if self.dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+
+        stmt = upsert(table).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                "total_duration": table.c.total_duration + stmt.excluded.total_duration,
+                "log_count": table.c.log_count + stmt.excluded.log_count,
+            },
+        )
+
+    # -------- Rebuild --------
+    def rebuild(self, start: Optional[date] = None, end: Optional[date] = None) -> dict:
+        """Recompute the rollups for ``[start, end]`` (everything when unset) from the live and archived logs.
+
+        Runs as DELETE + INSERT ... SELECT per table inside the caller's
+        transaction and returns the number of rows written per table.
+        """
+        source = union_all(*[self._closed_logs(model, start, end) for model in (TaskLogs, TaskLogArchive)]).subquery()
+
+        written = {}
+        for model, keys in ROLLUPS:
+            cleanup = delete(model)
+            if start is not None:
+                cleanup = cleanup.where(model.day >= start)
+            if end is not None:
+                cleanup = cleanup.where(model.day <= end)
+            self.db.execute(cleanup)
+
+            group = [source.c[key] for key in keys]
+            if model is TaskDailyRollup:
+                # a task belongs to exactly one project, so grouping by it adds no rows
+                group.append(source.c.ace_project_id)
+            aggregate = select(
+                *group,
+                func.sum(source.c.duration).label("total_duration"),
+                func.count().label("log_count"),
+            ).group_by(*group)
+            columns = [column.key for column in group] + ["total_duration", "log_count"]
+            result = self.db.execute(insert(model).from_select(columns, aggregate))
+            written[model.__tablename__] = result.rowcount
+        return written
+
+    @staticmethod
+    def _closed_logs(model, start: Optional[date], end: Optional[date]):
+        day = func.date(func.coalesce(model.start_time, model.end_time), type_=Date)
+        stmt = (
+            select(
+                model.ace_task_id,
+                model.user_id,
+                Tasks.ace_project_id,
+                day.label("day"),
+                model.duration,
+            )
+            .join(Tasks, Tasks.ace_task_id == model.ace_task_id)
+            .where(model.end_time.is_not(None), model.duration.is_not(None), Tasks.ace_project_id.is_not(None))
+        )
+        if start is not None:
+            stmt = stmt.where(day >= start)
+        if end is not None:
+            stmt = stmt.where(day <= end)
+        return stmt
+
+
+async def arecord_stop(db: AsyncSession, log: TaskLogs, ace_project_id: int, previous: Optional[Tuple[date, float]] = None):
+    """``RollupService.record_stop`` for an AsyncSession (the /tasks/stop endpoint)."""
+    await db.run_sync(lambda session: RollupService(session).record_stop(log, ace_project_id, previous))
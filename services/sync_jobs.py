@@ -0,0 +1,727 @@
+import asyncio
+import json
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from concurrent.futures import ThreadPoolExecutor as TenantPool
+
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import delete, select, update
+from dotenv import load_dotenv
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, every worker runs a scheduler
+    fcntl = None
+
+from connection.database import SessionLocal
+from models.sync_jobs import SyncBatchRecord, SyncJobRecord, SyncScheduleRecord
+from services.sync_service import SYNC_STAGES, SyncCancelled, SyncCoordinator, SyncProgress
+
+load_dotenv()
+SYNC_JOB_WORKERS = int(os.getenv('SYNC_JOB_WORKERS', '4'))
+SYNC_JOB_HISTORY = int(os.getenv('SYNC_JOB_HISTORY', '200'))
+# comma separated "guid:interval_minutes" pairs saved as schedules at startup
+SYNC_SCHEDULES = os.getenv('SYNC_SCHEDULES', '')
+# worker pool size for the blocking multi-tenant runner (CLI)
+SYNC_TENANT_WORKERS = int(os.getenv('SYNC_TENANT_WORKERS', '4'))
+# the app worker holding this lock runs the scheduler; the others only queue, read and cancel jobs (empty: every worker schedules)
+SYNC_JOB_LOCK_FILE = os.getenv('SYNC_JOB_LOCK_FILE', os.path.join(tempfile.gettempdir(), 'ace-sync-jobs.lock'))
+# how often the scheduler worker picks up queued jobs, cancel requests and schedule changes
+SYNC_JOB_POLL_SECONDS = float(os.getenv('SYNC_JOB_POLL_SECONDS', '5'))
+# a running job whose heartbeat is older than this is marked failed (its worker died)
+SYNC_JOB_STALE_SECONDS = int(os.getenv('SYNC_JOB_STALE_SECONDS', '300'))
+# minimum interval between progress writes of a running job
+SYNC_JOB_PROGRESS_SECONDS = float(os.getenv('SYNC_JOB_PROGRESS_SECONDS', '1'))
+
+SCHEDULE_PREFIX = "sync-schedule:"
+DISPATCH_JOB_ID = "sync-job-dispatch"
+DISPATCH_EXECUTOR = "dispatch"
+ACTIVE_STATUSES = ("queued", "running")
+
+logger = logging.getLogger(__name__)
+
+
+def json_safe(value: Any) -> Any:
+    # datetimes in stage counters and sync reports are stored as strings
+    return json.loads(json.dumps(value, default=str)) if value is not None else None
+
+
+class SyncJob(SyncProgress):
+    """One guid's sync run; ``save``, when given, persists its state as it changes."""
+
+    def __init__(self, guid: str, full_resync: bool = False, stream: bool = False, trigger: str = "manual",
+                 loop: asyncio.AbstractEventLoop | None = None, job_id: Optional[str] = None,
+                 save: Optional[Callable[["SyncJob"], None]] = None, session_factory=SessionLocal):
+        self.job_id = job_id or str(uuid4())
+        self.guid = guid
+        self.full_resync = full_resync
+        self.stream = stream
+        self.trigger = trigger
+        self.loop = loop
+        self.save = save
+        self.session_factory = session_factory
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.result: Optional[dict] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.stages = {
+            stage: {"fetched": 0, "inserted": 0, "updated": 0, "started_at": None, "elapsed_seconds": 0.0}
+            for stage in SYNC_STAGES
+        }
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._stage_clock: Dict[str, float] = {}
+        self._last_stage: Optional[str] = None
+        self._last_tick = 0.0
+        self._last_tick_at: Optional[datetime] = None
+        self._last_saved = 0.0
+
+    @classmethod
+    def from_record(cls, row: SyncJobRecord) -> "SyncJob":
+        """A read-only snapshot of a persisted job."""
+        job = cls(row.guid, full_resync=row.full_resync, stream=row.stream, trigger=row.trigger, job_id=row.job_id)
+        job.status = row.status
+        job.error = row.error
+        job.result = row.result
+        job.created_at = row.created_at
+        job.started_at = row.started_at
+        job.finished_at = row.finished_at
+        job._last_stage = row.current_stage
+        if row.stages:
+            job.stages = row.stages
+        return job
+
+    # -------- SyncProgress --------
+    def record(self, stage: str, fetched: int = 0, inserted: int = 0, updated: int = 0):
+        now = time.perf_counter()
+        with self._lock:
+            entry = self.stages[stage]
+            if entry["started_at"] is None:
+                # a stage's clock starts where the previous stage's update left off
+                entry["started_at"] = self._last_tick_at
+                self._stage_clock[stage] = self._last_tick
+            entry["fetched"] += fetched
+            entry["inserted"] += inserted
+            entry["updated"] += updated
+            entry["elapsed_seconds"] = round(now - self._stage_clock[stage], 3)
+            self._last_stage = stage
+            self._last_tick = now
+            self._last_tick_at = datetime.utcnow()
+        self._persist(force=False)
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise SyncCancelled(f"Sync job {self.job_id} was cancelled")
+
+    # -------- Lifecycle --------
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        if self._cancel.is_set():
+            self._finish("cancelled")
+            return
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self._last_tick = time.perf_counter()
+        self._last_tick_at = self.started_at
+        self._persist()
+        db = self.session_factory()
+        try:
+            coordinator = SyncCoordinator(db, progress=self, loop=self.loop)
+            if self.stream:
+                self.result = coordinator.run_streaming(self.guid, full_resync=self.full_resync)
+            else:
+                self.result = coordinator.run(self.guid, full_resync=self.full_resync)
+            self._finish("succeeded")
+        except SyncCancelled:
+            db.rollback()
+            self._finish("cancelled")
+        except Exception as e:
+            db.rollback()
+            self.error = getattr(e, "detail", None) or str(e)
+            self._finish("failed")
+        finally:
+            db.close()
+
+    def _finish(self, status: str):
+        self.status = status
+        self.finished_at = datetime.utcnow()
+        self._persist()
+
+    def _persist(self, force: bool = True):
+        if self.save is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_saved < SYNC_JOB_PROGRESS_SECONDS:
+            return
+        self._last_saved = now
+        try:
+            self.save(self)
+        except Exception:
+            # progress reporting must not fail the sync; the next save or the heartbeat catches up
+            logger.exception("Could not save sync job %s", self.job_id)
+
+    def record_values(self) -> dict:
+        """Column values for the job's ``sync_jobs`` row."""
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self.stages.items()}
+            current_stage = self._last_stage
+        return {
+            "status": self.status,
+            "current_stage": current_stage,
+            "stages": json_safe(stages),
+            "result": json_safe(self.result),
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": datetime.utcnow(),
+        }
+
+    def to_dict(self) -> dict:
+        end = self.finished_at or datetime.utcnow()
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self.stages.items()}
+        return {
+            "job_id": self.job_id,
+            "guid": self.guid,
+            "status": self.status,
+            "trigger": self.trigger,
+            "full_resync": self.full_resync,
+            "stream": self.stream,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round((end - self.started_at).total_seconds(), 3) if self.started_at else 0.0,
+            "current_stage": self._last_stage,
+            "stages": stages,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class SyncBatch:
+    """A multi-tenant sync request: one SyncJob per guid, reported together."""
+
+    def __init__(self, jobs: List[SyncJob], batch_id: Optional[str] = None, created_at: Optional[datetime] = None):
+        self.batch_id = batch_id or str(uuid4())
+        self.created_at = created_at or datetime.utcnow()
+        self.jobs = jobs
+
+    @property
+    def status(self) -> str:
+        statuses = [job.status for job in self.jobs]
+        if any(status in ACTIVE_STATUSES for status in statuses):
+            return "running"
+        if all(status == "succeeded" for status in statuses):
+            return "succeeded"
+        if any(status == "succeeded" for status in statuses):
+            return "partial"
+        return "failed"
+
+    def to_dict(self) -> dict:
+        tenants = [job.to_dict() for job in self.jobs]
+        summary: Dict[str, int] = {}
+        for tenant in tenants:
+            summary[tenant["status"]] = summary.get(tenant["status"], 0) + 1
+        return {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "summary": summary,
+            "tenants": tenants,
+        }
+
+
+class SyncJobManager:
+    """Background ACE syncs shared by every app worker through the database.
+
+    Jobs, batches and schedules are rows (see ``models.sync_jobs``), so any
+    worker can submit, read or cancel them and they survive restarts; at
+    most one job per guid is active, and submitting a guid that is already
+    queued or running returns the existing job.
+
+    One worker per host holds ``SYNC_JOB_LOCK_FILE`` and runs the
+    APScheduler. Every ``SYNC_JOB_POLL_SECONDS`` it claims queued jobs onto
+    its thread pool, passes cancel requests on to the jobs it runs, applies
+    schedule changes and fails running jobs whose heartbeat is older than
+    ``SYNC_JOB_STALE_SECONDS``. A claim is a conditional UPDATE, so
+    schedulers on several hosts never run the same job.
+    """
+
+    def __init__(self, workers: int = SYNC_JOB_WORKERS, history: int = SYNC_JOB_HISTORY,
+                 lock_path: str = SYNC_JOB_LOCK_FILE, session_factory=SessionLocal,
+                 poll_seconds: float = SYNC_JOB_POLL_SECONDS):
+        self.scheduler = BackgroundScheduler(
+            # the dispatcher has its own thread so long syncs and maintenance never delay it
+            executors={"default": ThreadPoolExecutor(workers), DISPATCH_EXECUTOR: ThreadPoolExecutor(1)},
+            job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": None},
+        )
+        self.workers = workers
+        self.history = history
+        self.lock_path = lock_path
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.is_scheduler = False
+        self._started = False
+        self._running: Dict[str, SyncJob] = {}
+        self._lock = threading.Lock()
+        self._lock_file = None
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> bool:
+        """Take the scheduler role unless another worker on the host has it; returns whether this worker runs jobs.
+
+        ``loop`` is the app's event loop used for async ACE fetches.
+        """
+        if loop is not None:
+            self.loop = loop
+        with self._lock:
+            if self._started:
+                return self.is_scheduler
+            self._started = True
+            self.is_scheduler = self._claim_scheduler()
+        if not self.is_scheduler:
+            return False
+        schedules = list(parse_schedules(SYNC_SCHEDULES))
+        if schedules:
+            db = self.session_factory()
+            try:
+                for guid, interval in schedules:
+                    self._store_schedule(db, guid, interval)
+                db.commit()
+            finally:
+                db.close()
+        self.scheduler.start()
+        self.scheduler.add_job(
+            self.dispatch, "interval", seconds=self.poll_seconds, id=DISPATCH_JOB_ID, name="sync job dispatch",
+            executor=DISPATCH_EXECUTOR, replace_existing=True,
+        )
+        return True
+
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        with self._lock:
+            running = list(self._running.values())
+            self._started = False
+            self.is_scheduler = False
+        # running jobs stop at their next checkpoint and record themselves as cancelled
+        for job in running:
+            job.cancel()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _claim_scheduler(self) -> bool:
+        if fcntl is None or not self.lock_path:
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _wake(self):
+        """Run the dispatcher now instead of at its next poll (scheduler worker only)."""
+        if self.is_scheduler and self.scheduler.running:
+            try:
+                self.scheduler.modify_job(DISPATCH_JOB_ID, next_run_time=datetime.now(timezone.utc))
+            except JobLookupError:
+                pass
+
+    # -------- One-off jobs --------
+    def submit(self, guid: str, full_resync: bool = False, stream: bool = False, trigger: str = "manual") -> SyncJob:
+        db = self.session_factory()
+        try:
+            active = db.execute(
+                select(SyncJobRecord)
+                .where(SyncJobRecord.guid == guid, SyncJobRecord.status.in_(ACTIVE_STATUSES))
+                .order_by(SyncJobRecord.created_at)
+                .limit(1)
+            ).scalars().first()
+            if active is not None:
+                return self._job(active)
+            job = SyncJob(guid, full_resync=full_resync, stream=stream, trigger=trigger)
+            db.add(SyncJobRecord(
+                job_id=job.job_id,
+                guid=guid,
+                status=job.status,
+                trigger=trigger,
+                full_resync=full_resync,
+                stream=stream,
+                stages=json_safe(job.stages),
+                created_at=job.created_at,
+                updated_at=job.created_at,
+            ))
+            db.commit()
+        finally:
+            db.close()
+        self._wake()
+        return job
+
+    def submit_many(self, guids: List[str], full_resync: bool = False, stream: bool = False) -> SyncBatch:
+        """Queue one job per distinct guid on the shared, bounded worker pool.
+
+        Each tenant runs in its own job and session, so a failing tenant only
+        marks its own job as failed.
+        """
+        jobs = [
+            self.submit(guid, full_resync=full_resync, stream=stream, trigger="batch")
+            for guid in dict.fromkeys(guids)
+        ]
+        batch = SyncBatch(jobs)
+        db = self.session_factory()
+        try:
+            db.add(SyncBatchRecord(
+                batch_id=batch.batch_id, job_ids=[job.job_id for job in jobs], created_at=batch.created_at
+            ))
+            db.commit()
+        finally:
+            db.close()
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[SyncBatch]:
+        db = self.session_factory()
+        try:
+            batch = db.get(SyncBatchRecord, batch_id)
+            if batch is None:
+                return None
+            rows = db.execute(select(SyncJobRecord).where(SyncJobRecord.job_id.in_(batch.job_ids))).scalars()
+            jobs = {row.job_id: self._job(row) for row in rows}
+            return SyncBatch(
+                [jobs[job_id] for job_id in batch.job_ids if job_id in jobs],
+                batch_id=batch.batch_id,
+                created_at=batch.created_at,
+            )
+        finally:
+            db.close()
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        with self._lock:
+            job = self._running.get(job_id)
+        if job is not None:
+            return job
+        db = self.session_factory()
+        try:
+            row = db.get(SyncJobRecord, job_id)
+            return self._job(row) if row is not None else None
+        finally:
+            db.close()
+
+    def list_jobs(self, guid: Optional[str] = None) -> List[SyncJob]:
+        """The newest ``history`` jobs, newest first."""
+        stmt = select(SyncJobRecord).order_by(SyncJobRecord.created_at.desc()).limit(self.history)
+        if guid:
+            stmt = stmt.where(SyncJobRecord.guid == guid)
+        db = self.session_factory()
+        try:
+            return [self._job(row) for row in db.execute(stmt).scalars()]
+        finally:
+            db.close()
+
+    def cancel(self, job_id: str) -> Optional[SyncJob]:
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            # not dispatched yet: nothing to stop, the job is final right away
+            db.execute(
+                update(SyncJobRecord)
+                .where(SyncJobRecord.job_id == job_id, SyncJobRecord.status == "queued")
+                .values(status="cancelled", cancel_requested=True, finished_at=now, updated_at=now)
+            )
+            # running: the scheduler worker passes the request on at its next poll
+            db.execute(
+                update(SyncJobRecord)
+                .where(SyncJobRecord.job_id == job_id, SyncJobRecord.status == "running")
+                .values(cancel_requested=True)
+            )
+            db.commit()
+            row = db.get(SyncJobRecord, job_id)
+            if row is None:
+                return None
+            snapshot = self._job(row)
+        finally:
+            db.close()
+        with self._lock:
+            job = self._running.get(job_id)
+        if job is not None:
+            job.cancel()
+            return job
+        return snapshot
+
+    def _job(self, row: SyncJobRecord) -> SyncJob:
+        # a job running in this worker is fresher than its last saved row
+        with self._lock:
+            return self._running.get(row.job_id) or SyncJob.from_record(row)
+
+    # -------- Dispatch (scheduler worker) --------
+    def dispatch(self) -> int:
+        """One scheduler round; returns the number of jobs started.
+
+        Beats the heartbeat of (and forwards cancel requests to) the jobs this
+        worker runs, fails stale ones, applies schedule changes and starts
+        queued jobs while the pool has free threads.
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            running = dict(self._running)
+        db = self.session_factory()
+        try:
+            if running:
+                db.execute(
+                    update(SyncJobRecord)
+                    .where(SyncJobRecord.job_id.in_(list(running)), SyncJobRecord.status == "running")
+                    .values(updated_at=now)
+                )
+                cancelled = db.execute(
+                    select(SyncJobRecord.job_id)
+                    .where(SyncJobRecord.job_id.in_(list(running)), SyncJobRecord.cancel_requested.is_(True))
+                ).scalars()
+                for job_id in cancelled:
+                    running[job_id].cancel()
+            db.execute(
+                update(SyncJobRecord)
+                .where(
+                    SyncJobRecord.status == "running",
+                    SyncJobRecord.updated_at < now - timedelta(seconds=SYNC_JOB_STALE_SECONDS),
+                    SyncJobRecord.job_id.not_in(list(running)),
+                )
+                .values(status="failed", error="The worker running this sync stopped", finished_at=now, updated_at=now)
+            )
+            db.commit()
+            self._apply_schedules(db)
+            self._trim(db)
+            db.commit()
+            return self._start_queued(db, self.workers - len(running))
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _start_queued(self, db, slots: int) -> int:
+        if slots <= 0:
+            return 0
+        busy = select(SyncJobRecord.guid).where(SyncJobRecord.status == "running")
+        candidates = db.execute(
+            select(
+                SyncJobRecord.job_id, SyncJobRecord.guid, SyncJobRecord.full_resync,
+                SyncJobRecord.stream, SyncJobRecord.trigger, SyncJobRecord.created_at,
+            )
+            .where(
+                SyncJobRecord.status == "queued",
+                SyncJobRecord.cancel_requested.is_(False),
+                # one job per guid at a time, even if two workers queued the same guid concurrently
+                SyncJobRecord.guid.not_in(busy),
+            )
+            .order_by(SyncJobRecord.created_at)
+            .limit(slots * 2)
+        ).all()
+        started, guids = 0, set()
+        for candidate in candidates:
+            if started >= slots:
+                break
+            if candidate.guid in guids:
+                continue
+            now = datetime.utcnow()
+            claimed = db.execute(
+                update(SyncJobRecord)
+                .where(
+                    SyncJobRecord.job_id == candidate.job_id,
+                    SyncJobRecord.status == "queued",
+                    SyncJobRecord.cancel_requested.is_(False),
+                )
+                .values(status="running", started_at=now, updated_at=now)
+            ).rowcount
+            db.commit()
+            if claimed != 1:
+                continue
+            guids.add(candidate.guid)
+            job = SyncJob(
+                candidate.guid, full_resync=candidate.full_resync, stream=candidate.stream,
+                trigger=candidate.trigger, loop=self.loop, job_id=candidate.job_id,
+                save=self._save_job, session_factory=self.session_factory,
+            )
+            job.created_at = candidate.created_at
+            with self._lock:
+                self._running[job.job_id] = job
+            self._execute(job)
+            started += 1
+        return started
+
+    def _execute(self, job: SyncJob):
+        self.scheduler.add_job(self._run, args=[job], id=job.job_id, name=f"sync {job.guid}")
+
+    def _run(self, job: SyncJob):
+        try:
+            job.run()
+        finally:
+            with self._lock:
+                self._running.pop(job.job_id, None)
+
+    def _save_job(self, job: SyncJob):
+        db = self.session_factory()
+        try:
+            db.execute(update(SyncJobRecord).where(SyncJobRecord.job_id == job.job_id).values(**job.record_values()))
+            db.commit()
+        finally:
+            db.close()
+
+    def _trim(self, db):
+        # keep the newest ``history`` finished jobs
+        finished = SyncJobRecord.status.not_in(ACTIVE_STATUSES)
+        cutoff = db.execute(
+            select(SyncJobRecord.created_at)
+            .where(finished)
+            .order_by(SyncJobRecord.created_at.desc())
+            .offset(self.history)
+            .limit(1)
+        ).scalar()
+        if cutoff is not None:
+            db.execute(delete(SyncJobRecord).where(finished, SyncJobRecord.created_at <= cutoff))
+            db.execute(delete(SyncBatchRecord).where(SyncBatchRecord.created_at <= cutoff))
+
+    # -------- Recurring schedules --------
+    def set_schedule(self, guid: str, interval_minutes: int, full_resync: bool = False, stream: bool = False) -> dict:
+        db = self.session_factory()
+        try:
+            self._store_schedule(db, guid, interval_minutes, full_resync, stream)
+            db.commit()
+            self._apply_schedules(db)
+            db.commit()
+            return self._schedule_dict(db.get(SyncScheduleRecord, guid))
+        finally:
+            db.close()
+
+    def get_schedule(self, guid: str) -> Optional[dict]:
+        db = self.session_factory()
+        try:
+            row = db.get(SyncScheduleRecord, guid)
+            return self._schedule_dict(row) if row is not None else None
+        finally:
+            db.close()
+
+    def list_schedules(self) -> List[dict]:
+        db = self.session_factory()
+        try:
+            rows = db.execute(select(SyncScheduleRecord).order_by(SyncScheduleRecord.guid)).scalars()
+            return [self._schedule_dict(row) for row in rows]
+        finally:
+            db.close()
+
+    def remove_schedule(self, guid: str) -> bool:
+        db = self.session_factory()
+        try:
+            removed = db.execute(delete(SyncScheduleRecord).where(SyncScheduleRecord.guid == guid)).rowcount
+            db.commit()
+            self._apply_schedules(db)
+        finally:
+            db.close()
+        return removed > 0
+
+    @staticmethod
+    def _store_schedule(db, guid: str, interval_minutes: int, full_resync: bool = False, stream: bool = False):
+        row = db.get(SyncScheduleRecord, guid)
+        if row is None:
+            row = SyncScheduleRecord(guid=guid)
+            db.add(row)
+        row.interval_minutes = interval_minutes
+        row.full_resync = full_resync
+        row.stream = stream
+        row.next_run_time = None
+
+    def _apply_schedules(self, db):
+        """Make this worker's APScheduler match the ``sync_schedules`` rows (scheduler worker only)."""
+        if not (self.is_scheduler and self.scheduler.running):
+            return
+        rows = {f"{SCHEDULE_PREFIX}{row.guid}": row for row in db.execute(select(SyncScheduleRecord)).scalars()}
+        for job in self.scheduler.get_jobs():
+            if job.id.startswith(SCHEDULE_PREFIX) and job.id not in rows:
+                self.scheduler.remove_job(job.id)
+        for job_id, row in rows.items():
+            kwargs = {"guid": row.guid, "full_resync": row.full_resync, "stream": row.stream, "trigger": "schedule"}
+            job = self.scheduler.get_job(job_id)
+            if job is None or job.kwargs != kwargs or job.trigger.interval != timedelta(minutes=row.interval_minutes):
+                job = self.scheduler.add_job(
+                    self.submit,
+                    "interval",
+                    minutes=row.interval_minutes,
+                    id=job_id,
+                    name=f"scheduled sync {row.guid}",
+                    kwargs=kwargs,
+                    replace_existing=True,
+                )
+            next_run_time = job.next_run_time.astimezone(timezone.utc).replace(tzinfo=None) if job.next_run_time else None
+            if row.next_run_time != next_run_time:
+                row.next_run_time = next_run_time
+        db.commit()
+
+    # -------- Maintenance --------
+    def set_maintenance(self, job_id: str, func, seconds: int) -> bool:
+        """Run ``func`` every ``seconds`` on the scheduler worker's pool.
+
+        Returns False (and schedules nothing) for ``seconds <= 0`` or on a
+        worker without the scheduler role. APScheduler never overlaps runs
+        of the same job, so a slow run just delays the next one.
+        """
+        if seconds <= 0 or not self.is_scheduler:
+            return False
+        self.scheduler.add_job(
+            func, "interval", seconds=seconds, id=job_id, name=job_id, coalesce=True, replace_existing=True
+        )
+        return True
+
+    @staticmethod
+    def _schedule_dict(row: SyncScheduleRecord) -> dict:
+        return {
+            "guid": row.guid,
+            "interval_minutes": row.interval_minutes,
+            "full_resync": row.full_resync,
+            "stream": row.stream,
+            "next_run_time": row.next_run_time,
+        }
+
+
+def sync_tenants(guids: List[str], workers: int = SYNC_TENANT_WORKERS, full_resync: bool = False, stream: bool = False) -> List[dict]:
+    """Blocking multi-tenant sync outside the scheduler (used by the CLI).
+
+    Runs at most ``workers`` tenants at once and returns one report per guid.
+    """
+    def run_tenant(guid: str) -> dict:
+        job = SyncJob(guid, full_resync=full_resync, stream=stream, trigger="cli")
+        job.run()
+        return job.to_dict()
+
+    with TenantPool(max_workers=max(workers, 1)) as pool:
+        return list(pool.map(run_tenant, dict.fromkeys(guids)))
+
+
+def parse_schedules(value: str):
+    for item in value.split(","):
+        guid, _, interval = item.strip().rpartition(":")
+        if guid and interval.isdigit() and int(interval) > 0:
+            yield guid, int(interval)
+
+
+_manager: SyncJobManager | None = None
+
+def get_sync_job_manager() -> SyncJobManager:
+    global _manager
+    if _manager is None:
+        _manager = SyncJobManager()
+    return _manager
@@ -0,0 +1,168 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from services.data_service import DataService, afetch_ace_results, fetch_ace_results, iter_ace_results, open_ace_stream
+from utils.json_stream import chunked
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+SYNC_CHUNK_SIZE = int(os.getenv('SYNC_CHUNK_SIZE', '1000'))
+
+# ACE list functions needed for one sync run, keyed by snapshot entity
+ACE_FUNCTIONS = {
+    "users": "getusers",
+    "projects": "getprojects",
+    "tasks": "gettasks",
+}
+SYNC_STAGES = ("fetch", "users", "projects", "tasks", "assignees")
+
+
+class SyncCancelled(Exception):
+    pass
+
+
+class SyncProgress:
+    """Receives per-stage counters from SyncCoordinator.
+
+    The base class ignores everything; background jobs subclass it to
+    report progress and to request cancellation.
+    """
+
+    def record(self, stage: str, fetched: int = 0, inserted: int = 0, updated: int = 0):
+        pass
+
+    def check_cancelled(self):
+        pass
+
+
+class SyncCoordinator:
+    """Runs one ACE -> database sync for a guid.
+
+    Each ACE list function is downloaded exactly once, all of them in
+    parallel, and the parsed snapshot is then persisted stage by stage in
+    foreign-key order: users, projects, tasks, task assignees. Unless
+    ``full_resync`` is set, projects and tasks older than the guid's stored
+    watermark are skipped; assignees are checked for every task.
+    """
+
+    def __init__(self, db: Session, progress: SyncProgress | None = None, loop: asyncio.AbstractEventLoop | None = None):
+        self.db = db
+        self.data_service = DataService(db)
+        self.progress = progress or SyncProgress()
+        # when set, ACE downloads run on this (running) loop's shared async client
+        self.loop = loop
+
+    def fetch_snapshot(self, guid: str) -> Dict[str, List[dict]]:
+        if self.loop is not None and self.loop.is_running():
+            snapshot = asyncio.run_coroutine_threadsafe(self.afetch_snapshot(guid), self.loop).result()
+        else:
+            with ThreadPoolExecutor(max_workers=len(ACE_FUNCTIONS)) as pool:
+                futures = {
+                    entity: pool.submit(fetch_ace_results, fct, guid)
+                    for entity, fct in ACE_FUNCTIONS.items()
+                }
+                snapshot = {entity: future.result() for entity, future in futures.items()}
+        self.progress.record("fetch", fetched=sum(len(records) for records in snapshot.values()))
+        return snapshot
+
+    async def afetch_snapshot(self, guid: str) -> Dict[str, List[dict]]:
+        results = await asyncio.gather(*(afetch_ace_results(fct, guid) for fct in ACE_FUNCTIONS.values()))
+        return dict(zip(ACE_FUNCTIONS, results))
+
+    def persist(self, guid: str, snapshot: Dict[str, List[dict]], full_resync: bool = False) -> dict:
+        """Persist a snapshot, only touching projects/tasks changed since the last run.
+
+        Watermarks advance only after the stage they belong to is committed.
+        """
+        service = self.data_service
+        progress = self.progress
+        progress.check_cancelled()
+        users_inserted, users_updated = service.save_users(snapshot["users"])
+        progress.record("users", fetched=len(snapshot["users"]), inserted=users_inserted, updated=users_updated)
+
+        progress.check_cancelled()
+        projects, projects_newest = service.changed_since(guid, "projects", snapshot["projects"], full_resync)
+        projects_inserted, projects_updated = service.save_projects(projects)
+        service.set_watermark(guid, "projects", projects_newest)
+        progress.record("projects", fetched=len(snapshot["projects"]), inserted=projects_inserted, updated=projects_updated)
+
+        progress.check_cancelled()
+        tasks, tasks_newest = service.changed_since(guid, "tasks", snapshot["tasks"], full_resync)
+        tasks_inserted, tasks_updated = service.save_tasks(tasks)
+        progress.record("tasks", fetched=len(snapshot["tasks"]), inserted=tasks_inserted, updated=tasks_updated)
+        # ACE does not bump a task's modification date when its assignees change,
+        # so assignees are matched against every task, not just the changed ones
+        assignees_inserted = service.save_assignees(snapshot["tasks"])
+        service.set_watermark(guid, "tasks", tasks_newest)
+        progress.record("assignees", inserted=assignees_inserted)
+
+        return {
+            "users_count": len(snapshot["users"]),
+            "projects_count": len(snapshot["projects"]),
+            "tasks_count": len(snapshot["tasks"]),
+            "projects_changed": len(projects),
+            "tasks_changed": len(tasks),
+            "users_updated": users_updated,
+            "projects_updated": projects_updated,
+            "tasks_updated": tasks_updated,
+            "assignees_inserted": assignees_inserted,
+        }
+
+    def run(self, guid: str, full_resync: bool = False) -> dict:
+        return self.persist(guid, self.fetch_snapshot(guid), full_resync)
+
+    # -------- Streaming mode --------
+    def run_streaming(self, guid: str, full_resync: bool = False, chunk_size: int = SYNC_CHUNK_SIZE) -> dict:
+        """Same stages as ``run`` but never holds a whole payload in memory.
+
+        Each ACE call is opened when its stage starts and closed when it
+        ends, so no response sits unread while an earlier stage is parsed
+        and committed. Bodies are parsed incrementally in FK order and
+        persisted in chunks of ``chunk_size`` records with one commit per
+        chunk. Only counts are kept.
+        """
+        service = self.data_service
+        counts = dict.fromkeys(
+            ("users_count", "projects_count", "tasks_count", "projects_changed", "tasks_changed",
+             "users_updated", "projects_updated", "tasks_updated", "assignees_inserted"), 0
+        )
+        progress = self.progress
+        for chunk in self._stream_chunks(guid, "users", chunk_size):
+            progress.check_cancelled()
+            counts["users_count"] += len(chunk)
+            inserted, updated = service.save_users(chunk, commit=False)
+            self.db.commit()
+            counts["users_updated"] += updated
+            progress.record("users", fetched=len(chunk), inserted=inserted, updated=updated)
+
+        for entity in ("projects", "tasks"):
+            watermark = None if full_resync else service.get_watermark(guid, entity)
+            newest = watermark
+            for chunk in self._stream_chunks(guid, entity, chunk_size):
+                progress.check_cancelled()
+                changed, newest = service.filter_changed(entity, chunk, watermark, newest)
+                counts[f"{entity}_count"] += len(chunk)
+                counts[f"{entity}_changed"] += len(changed)
+                assignees_inserted = 0
+                if entity == "projects":
+                    inserted, updated = service.save_projects(changed, commit=False)
+                else:
+                    inserted, updated = service.save_tasks(changed, commit=False)
+                    # whole chunk: reassigning a task does not bump its modification date
+                    assignees_inserted = service.save_assignees(chunk, commit=False)
+                    counts["assignees_inserted"] += assignees_inserted
+                self.db.commit()
+                counts[f"{entity}_updated"] += updated
+                progress.record(entity, fetched=len(chunk), inserted=inserted, updated=updated)
+                if assignees_inserted:
+                    progress.record("assignees", inserted=assignees_inserted)
+            service.set_watermark(guid, entity, newest)
+
+        return counts
+
+    def _stream_chunks(self, guid: str, entity: str, chunk_size: int):
+        # the call is made only when the stage starts; iter_ace_results closes the response
+        fct = ACE_FUNCTIONS[entity]
+        return chunked(iter_ace_results(fct, open_ace_stream(fct, guid)), chunk_size)
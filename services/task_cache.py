@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+from cachetools import LRUCache, TTLCache
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+# memory -> per-process TTL/LRU cache, redis -> shared across workers, none -> disabled
+TASK_CACHE_BACKEND = os.getenv('TASK_CACHE_BACKEND', 'memory')
+TASK_CACHE_TTL = int(os.getenv('TASK_CACHE_TTL', '300'))
+TASK_CACHE_MAX_USERS = int(os.getenv('TASK_CACHE_MAX_USERS', '10000'))
+# pages kept per user; older versions and rarely used filters fall out first
+TASK_CACHE_MAX_PAGES = int(os.getenv('TASK_CACHE_MAX_PAGES', '50'))
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# a stalled Redis must fail fast so the listing falls back to the database
+TASK_CACHE_REDIS_TIMEOUT = float(os.getenv('TASK_CACHE_REDIS_TIMEOUT', '0.2'))
+# after a cache error, skip the backend for this long instead of paying the timeout on every request
+TASK_CACHE_RETRY_SECONDS = float(os.getenv('TASK_CACHE_RETRY_SECONDS', '30'))
+
+
+class MemoryBackend:
+    """Per-process cache: one TTL/LRU slot per user holding an LRU of that user's pages.
+
+    Both levels are bounded, so memory stays within ``max_users * max_pages`` pages.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_users: int = TASK_CACHE_MAX_USERS, ttl: int = TASK_CACHE_TTL,
+                 max_pages: int = TASK_CACHE_MAX_PAGES):
+        self._users: TTLCache = TTLCache(maxsize=max_users, ttl=ttl)
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        with self._lock:
+            pages = self._users.get(user_id)
+            return pages.get(key) if pages is not None else None
+
+    def set(self, user_id: int, key: str, value: Any):
+        with self._lock:
+            pages = self._users.get(user_id)
+            if pages is None:
+                pages = self._users[user_id] = LRUCache(maxsize=self.max_pages)
+            pages[key] = value
+
+    def invalidate(self, user_ids: Iterable[int]):
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(len(pages) for pages in self._users.values())
+
+
+class RedisBackend:
+    """Shared cache: one Redis hash per user, expired as a whole after ``ttl``.
+
+    Socket timeouts are short so a stalled Redis raises instead of blocking the request.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = REDIS_URL, ttl: int = TASK_CACHE_TTL, timeout: float = TASK_CACHE_REDIS_TIMEOUT):
+        import redis
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.ttl = ttl
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"assigned-tasks:{user_id}"
+
+    def get(self, user_id: int, key: str) -> Optional[Any]:
+        raw = self._redis.hget(self._user_key(user_id), key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, user_id: int, key: str, value: Any):
+        pipe = self._redis.pipeline()
+        pipe.hset(self._user_key(user_id), key, json.dumps(value, default=str))
+        pipe.expire(self._user_key(user_id), self.ttl)
+        pipe.execute()
+
+    def invalidate(self, user_ids: Iterable[int]):
+        keys = [self._user_key(user_id) for user_id in user_ids]
+        if keys:
+            self._redis.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class AssignedTaskCache:
+    """Read-through cache for the assigned-task listing.
+
+    Entries are keyed on the user's change version (see ``TaskVersionService``)
+    plus the page parameters, so a page cached before a write can never be
+    served after it; ``invalidate`` additionally drops the user's pages as
+    soon as a write bumps their version. Backend errors fall back to the
+    loader, and the backend is skipped for ``retry_seconds`` afterwards.
+    """
+
+    def __init__(self, backend=None, retry_seconds: float = TASK_CACHE_RETRY_SECONDS):
+        self.backend = backend
+        self.retry_seconds = retry_seconds
+        self._skip_until = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, user_id: int, version: int, params: Hashable, loader: Callable[[], Any]) -> Any:
+        if self.backend is None:
+            return loader()
+        if not self._available():
+            self._count("bypassed")
+            return loader()
+        key = json.dumps([version, params], default=str)
+        try:
+            cached = self.backend.get(user_id, key)
+        except Exception:
+            # a cache outage must not take the listing down
+            self._failed()
+            return loader()
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        value = loader()
+        try:
+            self.backend.set(user_id, key, value)
+        except Exception:
+            self._failed()
+        return value
+
+    def invalidate(self, user_ids: Iterable[int]):
+        user_ids = list(user_ids)
+        if self.backend is None or not user_ids:
+            return
+        try:
+            self.backend.invalidate(user_ids)
+            self._count("invalidations", len(user_ids))
+        except Exception:
+            # versioned keys keep stale pages from being served; the TTL removes them
+            self._failed()
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._skip_until
+
+    def _failed(self):
+        self._count("errors")
+        self._skip_until = time.monotonic() + self.retry_seconds
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "bypassed": self.bypassed,
+            "entries": self.backend.size() if self.backend else 0,
+        }
+
+
+def create_backend(name: str = TASK_CACHE_BACKEND):
+    if name == "none":
+        return None
+    if name == "redis":
+        return RedisBackend()
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown task cache backend: {name}")
+
+
+_cache: AssignedTaskCache | None = None
+
+def get_task_cache() -> AssignedTaskCache:
+    global _cache
+    if _cache is None:
+        _cache = AssignedTaskCache(create_backend())
+    return _cache
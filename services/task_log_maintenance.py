@@ -0,0 +1,200 @@
+from datetime import date, datetime
+from typing import List, Tuple
+from sqlalchemy import delete, insert, literal, select, text
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+import os
+
+from connection.database import SessionLocal
+from models.task_logs import TaskLogs
+from models.task_logs_archive import TaskLogArchive
+
+load_dotenv()
+# closed logs that started before this many whole months ago are moved to task_logs_archive
+TASK_LOG_ARCHIVE_MONTHS = int(os.getenv('TASK_LOG_ARCHIVE_MONTHS', '12'))
+TASK_LOG_ARCHIVE_BATCH = int(os.getenv('TASK_LOG_ARCHIVE_BATCH', '5000'))
+# monthly partitions kept ready beyond the current month
+TASK_LOG_PARTITIONS_AHEAD = int(os.getenv('TASK_LOG_PARTITIONS_AHEAD', '3'))
+# how often the scheduler runs partition upkeep + archival; 0 disables it
+TASK_LOG_MAINTENANCE_HOURS = int(os.getenv('TASK_LOG_MAINTENANCE_HOURS', '24'))
+
+PARTITIONED_DIALECTS = ("postgresql", "mysql")
+PG_DEFAULT_PARTITION = "task_logs_default"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+class TaskLogPartitions:
+    """Monthly RANGE partitions of task_logs on start_time (PostgreSQL and MySQL).
+
+    The partitioned layout itself is created by Alembic; this keeps
+    partitions ready ``TASK_LOG_PARTITIONS_AHEAD`` months ahead and drops
+    old ones once archival has emptied them. Other dialects are a no-op.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    @property
+    def supported(self) -> bool:
+        return self.dialect in PARTITIONED_DIALECTS
+
+    def list_partitions(self) -> List[Tuple[str, date]]:
+        """Return ``(name, month)`` for every monthly partition, oldest first."""
+        if self.dialect == "postgresql":
+            rows = self.db.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'task_logs'"
+            )).scalars()
+            names = [name.removeprefix("task_logs_") for name in rows]
+        elif self.dialect == "mysql":
+            names = self.db.execute(text(
+                "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'task_logs' AND PARTITION_NAME IS NOT NULL"
+            )).scalars().all()
+        else:
+            return []
+        months = []
+        for name in names:
+            if len(name) == 7 and name.startswith("p") and name[1:].isdigit():
+                months.append((name, date(int(name[1:5]), int(name[5:7]), 1)))
+        return sorted(months, key=lambda item: item[1])
+
+    def ensure_ahead(self, months_ahead: int = TASK_LOG_PARTITIONS_AHEAD, today: date | None = None) -> List[str]:
+        """Create the missing monthly partitions up to ``months_ahead`` past the current month."""
+        partitions = self.list_partitions()
+        if not self.supported or not partitions:
+            return []
+        current = month_start(today or date.today())
+        last = partitions[-1][1]
+        missing = []
+        month = add_months(last, 1)
+        while month <= add_months(current, months_ahead):
+            missing.append(month)
+            month = add_months(month, 1)
+        if not missing:
+            return []
+
+        if self.dialect == "mysql":
+            # rows already in the catch-all partition are redistributed by REORGANIZE
+            ranges = ", ".join(
+                f"PARTITION {partition_name(m)} VALUES LESS THAN ('{add_months(m, 1):%Y-%m-%d}')" for m in missing
+            )
+            self.db.execute(text(
+                f"ALTER TABLE task_logs REORGANIZE PARTITION pmax INTO ({ranges}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+            ))
+        else:
+            for m in missing:
+                self._pg_add_partition(m)
+        self.db.commit()
+        return [partition_name(m) for m in missing]
+
+    def _pg_add_partition(self, month: date):
+        # built detached so rows that already landed in the default partition can be moved in first
+        name = f"task_logs_{partition_name(month)}"
+        lower, upper = f"{month:%Y-%m-%d}", f"{add_months(month, 1):%Y-%m-%d}"
+        self.db.execute(text(f"CREATE TABLE {name} (LIKE task_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        self.db.execute(text(
+            f"WITH moved AS (DELETE FROM {PG_DEFAULT_PARTITION} "
+            f"WHERE start_time >= '{lower}' AND start_time < '{upper}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ))
+        self.db.execute(text(f"ALTER TABLE task_logs ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+
+    def drop_empty_before(self, cutoff: date) -> List[str]:
+        """Drop monthly partitions that end on or before ``cutoff`` and hold no rows."""
+        dropped = []
+        for name, month in self.list_partitions():
+            if add_months(month, 1) > cutoff:
+                break
+            table = f"task_logs_{name}" if self.dialect == "postgresql" else f"task_logs PARTITION ({name})"
+            if self.db.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first():
+                continue
+            if self.dialect == "postgresql":
+                self.db.execute(text(f"DROP TABLE task_logs_{name}"))
+            else:
+                self.db.execute(text(f"ALTER TABLE task_logs DROP PARTITION {name}"))
+            dropped.append(name)
+        self.db.commit()
+        return dropped
+
+
+class TaskLogArchiver:
+    """Moves closed logs older than the horizon from task_logs to task_logs_archive.
+
+    Works in batches of ``batch_size`` rows, each copied and deleted in its
+    own transaction, so the live table is never locked for long. Open timers
+    are never archived. Rollups already hold the moved time, so reports are
+    unaffected.
+    """
+
+    def __init__(self, db: Session, batch_size: int = TASK_LOG_ARCHIVE_BATCH):
+        self.db = db
+        self.batch_size = max(int(batch_size), 1)
+
+    @staticmethod
+    def cutoff(months: int = TASK_LOG_ARCHIVE_MONTHS, today: date | None = None) -> date:
+        # whole months only, so archived months leave their partitions empty
+        return add_months(month_start(today or date.today()), -months)
+
+    def archive(self, cutoff: date) -> int:
+        boundary = datetime.combine(cutoff, datetime.min.time())
+        columns = [column.key for column in TaskLogs.__table__.columns]
+        moved = 0
+        while True:
+            keys = self.db.execute(
+                select(TaskLogs.log_id, TaskLogs.start_time)
+                .where(TaskLogs.start_time < boundary, TaskLogs.end_time.is_not(None))
+                .order_by(TaskLogs.start_time)
+                .limit(self.batch_size)
+            ).all()
+            if not keys:
+                return moved
+            ids = [log_id for log_id, _ in keys]
+            # bounding start_time as well keeps both statements inside the old partitions
+            window = (TaskLogs.log_id.in_(ids), TaskLogs.start_time <= keys[-1][1])
+            archived_at = datetime.utcnow()
+            self.db.execute(
+                insert(TaskLogArchive).from_select(
+                    columns + ["archived_at"],
+                    select(*[getattr(TaskLogs, column) for column in columns], literal(archived_at)).where(*window),
+                )
+            )
+            self.db.execute(delete(TaskLogs).where(*window))
+            self.db.commit()
+            moved += len(ids)
+
+
+def run_task_log_maintenance(months: int = TASK_LOG_ARCHIVE_MONTHS) -> dict:
+    """Partition upkeep plus archival; scheduled by the app and used by the CLI."""
+    db = SessionLocal()
+    try:
+        partitions = TaskLogPartitions(db)
+        created = partitions.ensure_ahead()
+        cutoff = TaskLogArchiver.cutoff(months)
+        archived = TaskLogArchiver(db).archive(cutoff)
+        dropped = partitions.drop_empty_before(cutoff)
+        return {
+            "cutoff": cutoff.isoformat(),
+            "archived": archived,
+            "partitions_created": created,
+            "partitions_dropped": dropped,
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
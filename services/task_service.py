@@ -1,26 +1,56 @@
-from chromadb.api.models.Collection import Collection
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
 from dto.document import DocumentRequest
 from dto.task import TaskStartRequest, TaskStartResponse, TaskStopRequest,TaskStopMessageResponse
+from models.open_timers import OpenTimer
 from models.task_logs import TaskLogs
 from models.tasks import Tasks
 from models.projects import Projects
 from models.users import Users
 from models.task_assignees import TasksAssignees
-from uuid import UUID
-from datetime import datetime
-from services.document_service import DocumentService
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
+from services.embedding_outbox import aenqueue_documents, task_log_document
+from services.task_versions import abump_tasks
+from services.rollup_service import arecord_stop, log_day
+from utils.pagination import decode_cursor, encode_cursor
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+TASK_PAGE_SIZE = int(os.getenv('TASK_PAGE_SIZE', '100'))
+TASK_PAGE_MAX = int(os.getenv('TASK_PAGE_MAX', '500'))
+# stops by log_id look in this recent window first so only the latest task_logs partitions are read
+OPEN_TIMER_LOOKBACK_DAYS = int(os.getenv('OPEN_TIMER_LOOKBACK_DAYS', '62'))
 
 
 class TaskService:
-    def __init__(self, db: Session):
+    # listings use a sync Session; the timer endpoints (start/stop) use an AsyncSession
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
-    def fetch_assigned_tasks(self, user_id: int):
+    def fetch_assigned_tasks(
+        self,
+        user_id: int,
+        limit: int = TASK_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        task_status: Optional[str] = None,
+        project_id: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One keyset page of the tasks assigned to ``user_id``, ordered by ace_task_id.
+
+        Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+        """
+        after = decode_cursor(cursor).get("task_id") if cursor else None
+        if cursor and not isinstance(after, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
         try:
             # Join tasks assigned to the ace_user_id, include project and supervisor
-            rows = (
+            query = (
                 self.db.query(
                     Tasks.ace_task_id.label("task_id"),
                     Projects.project_name.label("project_name"),
@@ -32,10 +62,17 @@ class TaskService:
                 .join(Projects, Projects.ace_project_id == Tasks.ace_project_id)
                 .outerjoin(Users, Users.ace_user_id == Projects.supervisor_id)
                 .filter(TasksAssignees.ace_user_id == user_id)
-                .all()
             )
+            if after is not None:
+                query = query.filter(TasksAssignees.ace_task_id > after)
+            if task_status:
+                query = query.filter(Tasks.status == task_status)
+            if project_id is not None:
+                query = query.filter(Tasks.ace_project_id == project_id)
+            # served by ix_tasks_assignees_user_task; one extra row tells whether a next page exists
+            rows = query.order_by(TasksAssignees.ace_task_id).limit(limit + 1).all()
 
-            return [
+            items = [
                 {
                     "task_id": r.task_id,
                     "project_name": r.project_name,
@@ -43,32 +80,23 @@ class TaskService:
                     "supervisor_name": r.supervisor_name,
                     "status": r.status,
                 }
-                for r in rows
+                for r in rows[:limit]
             ]
+            next_cursor = encode_cursor({"task_id": items[-1]["task_id"]}) if len(rows) > limit else None
+            return items, next_cursor
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e),
             )
     
-    def start_task(self, req: TaskStartRequest) -> TaskStartResponse:
+    async def start_task(self, req: TaskStartRequest) -> TaskStartResponse:
         now = datetime.utcnow()
 
-
-        existing_log = (
-            self.db.query(TaskLogs)
-            .filter(
-                TaskLogs.ace_task_id == req.ace_task_id,
-                TaskLogs.user_id == req.user_id,
-                TaskLogs.end_time.is_(None),
-            )
-            .first()
-        )
-
-        if existing_log:
-            log = existing_log
-        else:
+        log = await self._open_timer(req)
+        if not log:
             log = TaskLogs(
+                log_id=uuid4(),
                 ace_task_id=req.ace_task_id,
                 user_id=req.user_id,
                 start_time=now,
@@ -78,8 +106,17 @@ class TaskService:
                 end_time=None
             )
             self.db.add(log)
-            self.db.commit()
-            self.db.refresh(log)
+            self.db.add(OpenTimer(ace_task_id=req.ace_task_id, user_id=req.user_id, log_id=log.log_id, start_time=now))
+            try:
+                await self.db.commit()
+            except IntegrityError:
+                # a concurrent start for the same task and user won; its timer is the open one
+                await self.db.rollback()
+                log = await self._open_timer(req)
+                if not log:
+                    raise
+            else:
+                await self.db.refresh(log)
 
         return TaskStartResponse(
             log_id=log.log_id,
@@ -92,45 +129,79 @@ class TaskService:
             comment=log.comment
         )
 
-    async def stop_task(self, req: TaskStopRequest,col:Collection) -> TaskStopMessageResponse:
+    async def _open_timer(self, req: TaskStartRequest) -> Optional[TaskLogs]:
+        """The running log for the request's task and user, via two primary-key lookups.
+
+        open_timers gives the log's full key, so task_logs is read from one
+        partition however long the timer has been running.
+        """
+        result = await self.db.execute(
+            select(OpenTimer.log_id, OpenTimer.start_time)
+            .where(OpenTimer.ace_task_id == req.ace_task_id, OpenTimer.user_id == req.user_id)
+        )
+        key = result.first()
+        if key is None:
+            return None
+        result = await self.db.execute(
+            select(TaskLogs).where(TaskLogs.log_id == key.log_id, TaskLogs.start_time == key.start_time)
+        )
+        log = result.scalars().first()
+        if log is None or log.end_time is not None:
+            # a pointer that outlived its timer; cleared along with the new start
+            await self.db.execute(
+                delete(OpenTimer).where(OpenTimer.ace_task_id == req.ace_task_id, OpenTimer.user_id == req.user_id)
+            )
+            return None
+        return log
+
+    async def stop_task(self, req: TaskStopRequest) -> TaskStopMessageResponse:
         
-        log = self.db.query(TaskLogs).filter(TaskLogs.log_id == req.log_id).first()
+        recent = datetime.utcnow() - timedelta(days=OPEN_TIMER_LOOKBACK_DAYS)
+        result = await self.db.execute(
+            select(TaskLogs).where(TaskLogs.log_id == req.log_id, TaskLogs.start_time >= recent)
+        )
+        log = result.scalars().first()
+        if not log:
+            # older logs (re-stopping an old entry) fall back to a lookup across every partition
+            result = await self.db.execute(select(TaskLogs).where(TaskLogs.log_id == req.log_id))
+            log = result.scalars().first()
 
         if not log:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Log not found")
 
+        # a log stopped a second time replaces its earlier contribution to the rollups
+        previous = (log_day(log.start_time, log.end_time), log.duration) if log.end_time is not None else None
+
         now = datetime.utcnow()
         log.status = req.status
         log.comment = req.comment
         log.duration = req.duration
         log.end_time = now
+        await self.db.execute(
+            delete(OpenTimer).where(
+                OpenTimer.ace_task_id == log.ace_task_id,
+                OpenTimer.user_id == log.user_id,
+                OpenTimer.log_id == log.log_id,
+            )
+        )
 
-        task = self.db.query(Tasks).filter(Tasks.ace_task_id == log.ace_task_id).first()
+        result = await self.db.execute(
+            select(Tasks, Projects.project_name)
+            .outerjoin(Projects, Projects.ace_project_id == Tasks.ace_project_id)
+            .where(Tasks.ace_task_id == log.ace_task_id)
+        )
+        task, project_name = result.first() or (None, None)
         if task:
             task.status = req.status  
+            await abump_tasks(self.db, [task.ace_task_id])
+            if task.ace_project_id is not None:
+                await arecord_stop(self.db, log, task.ace_project_id, previous)
 
-        self.db.commit()
-        self.db.refresh(log)
-
-        task_name = task.task_title 
-        project = self.db.query(Projects).filter(Projects.ace_project_id == task.ace_project_id).first()
-        project_name = project.project_name 
-        comment = f"{project_name} - {task_name}: {log.comment}"
-        doc_request = {
-            "id": [str(log.log_id)],
-            "document": [comment],  # example: send the log comment
-            "metadata": [{
-                "status": log.status,
-                "duration": log.duration,
-                "start_time":str(log.start_time),
-                "end_time": str(log.end_time)
-            }]
-        }
-        request = DocumentRequest(**doc_request)
-        try:
-            response = await DocumentService(col).add_documents(request)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        # the embedding is queued in the same transaction and written to Chroma by the outbox worker
+        document = task_log_document(log, task.task_title if task else None, project_name)
+        await aenqueue_documents(self.db, DocumentRequest(
+            id=[document["id"]], document=[document["document"]], metadata=[document["metadata"]]
+        ))
+        await self.db.commit()
 
-        
         return TaskStopMessageResponse(message="Task stopped successfully")
\ No newline at end of file
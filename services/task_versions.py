@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Iterable, Set
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.projects import Projects
+from models.tasks import Tasks
+from models.task_assignees import TasksAssignees
+from models.user_task_versions import UserTaskVersion
+from services.ingestion import BulkUpserter
+from services.task_cache import get_task_cache
+
+
+class TaskVersionService:
+    """Per-user change counters behind the assigned-task listing ETags.
+
+    Writers bump every user whose listing a change can affect, in the same
+    transaction as the change; readers only need a primary-key lookup to
+    tell whether a cached listing is still current.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.upserter = BulkUpserter(db)
+
+    def get(self, ace_user_id: int) -> int:
+        version = self.db.get(UserTaskVersion, ace_user_id)
+        return version.version if version else 0
+
+    # -------- Bumps --------
+    def bump_users(self, ace_user_ids: Iterable[int]) -> int:
+        ids = sorted({user_id for user_id in ace_user_ids if user_id is not None})
+        if not ids:
+            return 0
+        self.upserter.insert_missing(
+            UserTaskVersion, [{"ace_user_id": user_id, "version": 0} for user_id in ids], [("ace_user_id",)]
+        )
+        now = datetime.utcnow()
+        for start in range(0, len(ids), self.upserter.batch_size):
+            self.db.execute(
+                update(UserTaskVersion)
+                .where(UserTaskVersion.ace_user_id.in_(ids[start:start + self.upserter.batch_size]))
+                .values(version=UserTaskVersion.version + 1, updated_at=now)
+            )
+        # free the cached pages now; keyed on the old version, they would never be served again
+        get_task_cache().invalidate(ids)
+        return len(ids)
+
+    def bump_tasks(self, ace_task_ids: Iterable[int]) -> int:
+        """Bump the assignees of the given tasks (title, status or project changed)."""
+        return self.bump_users(self._assignees(Tasks.ace_task_id, ace_task_ids))
+
+    def bump_projects(self, ace_project_ids: Iterable[int]) -> int:
+        """Bump the assignees of every task in the given projects."""
+        return self.bump_users(self._assignees(Tasks.ace_project_id, ace_project_ids))
+
+    def bump_supervisors(self, ace_user_ids: Iterable[int]) -> int:
+        """Bump the assignees of tasks in projects supervised by the given users."""
+        return self.bump_users(self._assignees(Projects.supervisor_id, ace_user_ids))
+
+    def _assignees(self, column, values: Iterable[int]) -> Set[int]:
+        values = sorted({value for value in values if value is not None})
+        users: Set[int] = set()
+        for start in range(0, len(values), self.upserter.batch_size):
+            stmt = (
+                select(TasksAssignees.ace_user_id)
+                .join(Tasks, Tasks.ace_task_id == TasksAssignees.ace_task_id)
+                .where(column.in_(values[start:start + self.upserter.batch_size]))
+                .distinct()
+            )
+            if column.class_ is Projects:
+                stmt = stmt.join(Projects, Projects.ace_project_id == Tasks.ace_project_id)
+            users.update(self.db.execute(stmt).scalars())
+        return users
+
+
+async def abump_tasks(db: AsyncSession, ace_task_ids: Iterable[int]) -> int:
+    """``TaskVersionService.bump_tasks`` for an AsyncSession (e.g. the timer endpoints)."""
+    ace_task_ids = list(ace_task_ids)
+    return await db.run_sync(lambda session: TaskVersionService(session).bump_tasks(ace_task_ids))
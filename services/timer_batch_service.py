@@ -0,0 +1,385 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+import os
+
+from dto.document import DocumentRequest
+from dto.task import TaskBatchRequest, TaskBatchResponse, TaskBatchResult, TimerStartEvent
+from models.open_timers import OpenTimer
+from models.projects import Projects
+from models.task_logs import TaskLogs
+from models.tasks import Tasks
+from models.users import Users
+from services.embedding_outbox import EmbeddingOutboxService, task_log_document
+from services.ingestion import BulkUpserter
+from services.rollup_service import RollupService, log_day
+from services.task_service import OPEN_TIMER_LOOKBACK_DAYS
+from services.task_versions import TaskVersionService
+
+load_dotenv()
+TASK_BATCH_MAX = int(os.getenv('TASK_BATCH_MAX', '500'))
+# device clocks drift; events stamped slightly in the future are clamped to the receipt time
+TASK_BATCH_CLOCK_SKEW_SECONDS = int(os.getenv('TASK_BATCH_CLOCK_SKEW_SECONDS', '300'))
+
+LOG_FIELDS = ("status", "comment", "duration", "end_time")
+
+
+class _PendingLog:
+    """A log's state while the batch is replayed."""
+
+    def __init__(self, row: dict, is_new: bool, previous: Optional[Tuple] = None):
+        self.row = row
+        self.is_new = is_new
+        # (day, duration) the rollups already hold for this log, when it was stopped before the batch
+        self.previous = previous
+        self.stopped = False
+        self.changed = set()
+
+
+class TimerBatchService:
+    """Applies a batch of queued timer start/stop events in one transaction.
+
+    Events are checked together before anything is written: every referenced
+    task, user and log is loaded with one query per table, the events are
+    replayed in order in memory, and the final state is written with one
+    bulk insert for new logs and one bulk update for stopped ones. Any
+    invalid event rejects the whole batch with the index of each problem.
+    A start that loses a race with a concurrent start for the same task and
+    user is reported as a conflict; the rest of the batch still applies.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.logs: Dict[UUID, _PendingLog] = {}
+
+    def apply(self, req: TaskBatchRequest, now: Optional[datetime] = None) -> TaskBatchResponse:
+        if len(req.events) > TASK_BATCH_MAX:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"A batch can hold at most {TASK_BATCH_MAX} events",
+            )
+        now = now or datetime.utcnow()
+        starts = [event for event in req.events if isinstance(event, TimerStartEvent)]
+        stops = [event for event in req.events if not isinstance(event, TimerStartEvent)]
+        self._load(starts, stops)
+
+        results, errors = [], []
+        for index, event in enumerate(req.events):
+            at, error = self._event_time(event.at, now)
+            if error is None:
+                if isinstance(event, TimerStartEvent):
+                    result, error = self._start(index, event, at)
+                else:
+                    result, error = self._stop(index, event, at)
+            if error is not None:
+                errors.append({"index": index, "type": event.type, "error": error})
+            else:
+                results.append(result)
+        if errors:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+
+        conflicts = self._write()
+        # every start that resolved to a log that lost the race, including retried starts aliased to it
+        conflicted = [result for result in results if result.log_id in conflicts]
+        for result in conflicted:
+            result.outcome = "conflict"
+        message = f"Applied {len(results) - len(conflicted)} timer events"
+        if conflicted:
+            message += f"; {len(conflicted)} conflicted with concurrent starts"
+        return TaskBatchResponse(message=message, results=results)
+
+    # -------- Loading --------
+    def _load(self, starts: List[TimerStartEvent], stops):
+        task_ids = {event.ace_task_id for event in starts}
+        user_ids = {event.user_id for event in starts}
+        self.known_tasks = set(self.db.execute(
+            select(Tasks.ace_task_id).where(Tasks.ace_task_id.in_(task_ids))
+        ).scalars()) if task_ids else set()
+        self.known_users = set(self.db.execute(
+            select(Users.user_id).where(Users.user_id.in_(user_ids))
+        ).scalars()) if user_ids else set()
+
+        # logs named by id (stops, or starts replayed from an earlier upload)
+        log_ids = {event.log_id for event in stops} | {event.log_id for event in starts if event.log_id}
+        if log_ids:
+            for log in self.db.execute(select(TaskLogs).where(TaskLogs.log_id.in_(log_ids))).scalars():
+                self.logs[log.log_id] = self._pending(log)
+
+        # open timers for the (task, user) pairs being started
+        self.open_timers: Dict[Tuple[int, UUID], UUID] = {}
+        # the open_timers rows the batch started with, so _write knows which ones to clear
+        self.open_rows: Dict[Tuple[int, UUID], UUID] = {}
+        if starts:
+            self._load_open_timers({(event.ace_task_id, event.user_id) for event in starts})
+        # device-generated ids that ended up pointing at an already open timer
+        self.aliases: Dict[UUID, UUID] = {}
+
+    def _load_open_timers(self, pairs: Set[Tuple[int, UUID]]):
+        keys = [
+            row for row in self.db.execute(
+                select(OpenTimer.ace_task_id, OpenTimer.user_id, OpenTimer.log_id, OpenTimer.start_time).where(
+                    OpenTimer.ace_task_id.in_({task_id for task_id, _ in pairs}),
+                    OpenTimer.user_id.in_({user_id for _, user_id in pairs}),
+                )
+            )
+            if (row.ace_task_id, row.user_id) in pairs
+        ]
+        if not keys:
+            return
+        # the full primary keys keep this read inside the partitions that hold the open logs
+        rows = self.db.execute(
+            select(TaskLogs).where(
+                TaskLogs.log_id.in_({key.log_id for key in keys}),
+                TaskLogs.start_time.in_({key.start_time for key in keys}),
+            )
+        ).scalars()
+        logs = {log.log_id: log for log in rows}
+        for key in keys:
+            pair = (key.ace_task_id, key.user_id)
+            self.open_rows[pair] = key.log_id
+            log = logs.get(key.log_id)
+            if log is not None and log.end_time is None:
+                self.logs.setdefault(log.log_id, self._pending(log))
+                self.open_timers[pair] = log.log_id
+
+    @staticmethod
+    def _pending(log: TaskLogs) -> _PendingLog:
+        row = {column.key: getattr(log, column.key) for column in TaskLogs.__table__.columns}
+        previous = (log_day(log.start_time, log.end_time), log.duration) if log.end_time is not None else None
+        return _PendingLog(row=row, is_new=False, previous=previous)
+
+    @staticmethod
+    def _event_time(at: Optional[datetime], now: datetime):
+        if at is None:
+            return now, None
+        if at.tzinfo is not None:
+            at = at.astimezone(timezone.utc).replace(tzinfo=None)
+        if at > now + timedelta(seconds=TASK_BATCH_CLOCK_SKEW_SECONDS):
+            return None, "Event time is in the future"
+        if at < now - timedelta(days=OPEN_TIMER_LOOKBACK_DAYS):
+            return None, f"Event is older than {OPEN_TIMER_LOOKBACK_DAYS} days"
+        return min(at, now), None
+
+    # -------- Replay --------
+    def _start(self, index: int, event: TimerStartEvent, at: datetime):
+        if event.ace_task_id not in self.known_tasks:
+            return None, "Task not found"
+        if event.user_id not in self.known_users:
+            return None, "User not found"
+
+        if event.log_id is not None and event.log_id in self.logs:
+            pending = self.logs[event.log_id]
+            if (pending.row["ace_task_id"], pending.row["user_id"]) != (event.ace_task_id, event.user_id):
+                return None, "log_id belongs to another task or user"
+            # the same start uploaded again (e.g. a retried batch)
+            return self._result(index, event.type, "resumed", pending), None
+
+        open_id = self.open_timers.get((event.ace_task_id, event.user_id))
+        if open_id is not None:
+            # like /tasks/start, an open timer is reused rather than duplicated
+            if event.log_id is not None:
+                self.aliases[event.log_id] = open_id
+            return self._result(index, event.type, "resumed", self.logs[open_id]), None
+
+        log_id = event.log_id or uuid4()
+        pending = _PendingLog(
+            row={
+                "log_id": log_id,
+                "ace_task_id": event.ace_task_id,
+                "user_id": event.user_id,
+                "start_time": at,
+                "status": None,
+                "duration": None,
+                "comment": None,
+                "end_time": None,
+            },
+            is_new=True,
+        )
+        self.logs[log_id] = pending
+        self.open_timers[(event.ace_task_id, event.user_id)] = log_id
+        return self._result(index, event.type, "started", pending), None
+
+    def _stop(self, index: int, event, at: datetime):
+        log_id = self.aliases.get(event.log_id, event.log_id)
+        pending = self.logs.get(log_id)
+        if pending is None:
+            return None, "Log not found"
+        if at < pending.row["start_time"]:
+            return None, "Stop time is before the log's start time"
+
+        pending.row.update(status=event.status, comment=event.comment, duration=event.duration, end_time=at)
+        pending.stopped = True
+        pending.changed.update(LOG_FIELDS)
+        key = (pending.row["ace_task_id"], pending.row["user_id"])
+        if self.open_timers.get(key) == log_id:
+            del self.open_timers[key]
+        return self._result(index, event.type, "stopped", pending), None
+
+    @staticmethod
+    def _result(index: int, event_type: str, outcome: str, pending: _PendingLog) -> TaskBatchResult:
+        return TaskBatchResult(
+            index=index,
+            type=event_type,
+            outcome=outcome,
+            log_id=pending.row["log_id"],
+            start_time=pending.row["start_time"],
+            end_time=pending.row["end_time"],
+        )
+
+    # -------- Writes --------
+    def _write(self) -> Set[UUID]:
+        """Write the replayed state; returns the ids of the started logs that lost a race and were not written."""
+        # open timers go first: a start that conflicts is dropped before its log is written
+        conflicts = self._write_open_timers()
+        for log_id in conflicts:
+            if self.logs[log_id].is_new:
+                del self.logs[log_id]
+        new_rows = [pending.row for pending in self.logs.values() if pending.is_new]
+        updates = [
+            {"log_id": pending.row["log_id"], "start_time": pending.row["start_time"],
+             **{name: pending.row[name] for name in pending.changed}}
+            for pending in self.logs.values()
+            if not pending.is_new and pending.changed
+        ]
+        if new_rows:
+            BulkUpserter(self.db).insert_rows(TaskLogs, new_rows)
+        if updates:
+            # ORM bulk UPDATE by primary key (log_id, start_time)
+            self.db.execute(update(TaskLogs), updates)
+
+        stopped = [pending for pending in self.logs.values() if pending.stopped]
+        if not new_rows and not stopped:
+            return conflicts
+        tasks = self._tasks({pending.row["ace_task_id"] for pending in stopped})
+        # like /tasks/stop, a task takes the status of its most recently stopped log
+        task_status: Dict[int, str] = {}
+        for pending in sorted(stopped, key=lambda item: item.row["end_time"]):
+            task_status[pending.row["ace_task_id"]] = pending.row["status"]
+        status_rows = [
+            {"task_id": tasks[ace_task_id][0], "status": value}
+            for ace_task_id, value in task_status.items() if ace_task_id in tasks
+        ]
+        if status_rows:
+            self.db.execute(update(Tasks), status_rows)
+        TaskVersionService(self.db).bump_tasks({row["ace_task_id"] for row in new_rows} | set(task_status))
+        self._record_rollups(stopped, {ace_task_id: task[1] for ace_task_id, task in tasks.items()})
+        return conflicts
+
+    def _write_open_timers(self) -> Set[UUID]:
+        """Bring open_timers in line with the replayed state: clear what closed or changed, add what opened.
+
+        Returns the log ids whose (task, user) row a concurrent start inserted first.
+        """
+        # (task, user, log) rows to clear: logs stopped in the batch, and pointers replaced or left dangling
+        stale = {
+            (pending.row["ace_task_id"], pending.row["user_id"], pending.row["log_id"])
+            for pending in self.logs.values() if pending.stopped and not pending.is_new
+        }
+        stale |= {pair + (log_id,) for pair, log_id in self.open_rows.items() if self.open_timers.get(pair) != log_id}
+        if stale:
+            # log_id alone identifies a row; the pair columns let the primary key find it
+            self.db.execute(delete(OpenTimer).where(
+                OpenTimer.ace_task_id.in_({task_id for task_id, _, _ in stale}),
+                OpenTimer.user_id.in_({user_id for _, user_id, _ in stale}),
+                OpenTimer.log_id.in_({log_id for _, _, log_id in stale}),
+            ))
+        opened = [
+            {"ace_task_id": task_id, "user_id": user_id, "log_id": log_id, "start_time": self.logs[log_id].row["start_time"]}
+            for (task_id, user_id), log_id in self.open_timers.items()
+            if self.open_rows.get((task_id, user_id)) != log_id
+        ]
+        if not opened:
+            return set()
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(OpenTimer), opened)
+            return set()
+        except IntegrityError:
+            pass
+        # like /tasks/start, a concurrent start that committed first keeps its timer; find which rows lost
+        conflicts = set()
+        for row in opened:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(OpenTimer), row)
+            except IntegrityError:
+                conflicts.add(row["log_id"])
+        return conflicts
+
+    def _record_rollups(self, stopped: List[_PendingLog], projects: Dict[int, Optional[int]]):
+        # one upsert per (user, project, task, day) instead of one per log
+        deltas: Dict[Tuple, List[float]] = {}
+
+        def add(row: dict, day, duration, count):
+            project_id = projects.get(row["ace_task_id"])
+            if project_id is None or day is None:
+                return
+            delta = deltas.setdefault((row["user_id"], project_id, row["ace_task_id"], day), [0.0, 0])
+            delta[0] += duration or 0.0
+            delta[1] += count
+
+        for pending in stopped:
+            if pending.previous is not None:
+                add(pending.row, pending.previous[0], -(pending.previous[1] or 0.0), -1)
+            add(pending.row, log_day(pending.row["start_time"], pending.row["end_time"]), pending.row["duration"], 1)
+
+        rollups = RollupService(self.db)
+        for (user_id, project_id, task_id, day), (duration, count) in deltas.items():
+            if duration or count:
+                rollups.record(user_id, project_id, task_id, day, duration, count=count)
+
+    def _tasks(self, ace_task_ids) -> Dict[int, Tuple[UUID, Optional[int]]]:
+        """``ace_task_id -> (task_id, ace_project_id)`` in one query."""
+        if not ace_task_ids:
+            return {}
+        rows = self.db.execute(
+            select(Tasks.ace_task_id, Tasks.task_id, Tasks.ace_project_id).where(Tasks.ace_task_id.in_(ace_task_ids))
+        )
+        return {ace_task_id: (task_id, project_id) for ace_task_id, task_id, project_id in rows}
+
+    # -------- Embeddings --------
+    def documents(self) -> Optional[DocumentRequest]:
+        """One document per stopped log, as /tasks/stop queues it for Chroma."""
+        stopped = [pending.row for pending in self.logs.values() if pending.stopped]
+        if not stopped:
+            return None
+        names = {
+            task_id: (task_title, project_name)
+            for task_id, task_title, project_name in self.db.execute(
+                select(Tasks.ace_task_id, Tasks.task_title, Projects.project_name)
+                .outerjoin(Projects, Projects.ace_project_id == Tasks.ace_project_id)
+                .where(Tasks.ace_task_id.in_({row["ace_task_id"] for row in stopped}))
+            )
+        }
+        documents = [task_log_document(row, *names.get(row["ace_task_id"], (None, None))) for row in stopped]
+        return DocumentRequest(
+            id=[document["id"] for document in documents],
+            document=[document["document"] for document in documents],
+            metadata=[document["metadata"] for document in documents],
+        )
+
+
+async def aapply_batch(db: AsyncSession, req: TaskBatchRequest) -> TaskBatchResponse:
+    """Apply a batch on an AsyncSession; the logs and their queued embeddings commit together."""
+
+    def run(session: Session) -> TaskBatchResponse:
+        service = TimerBatchService(session)
+        response = service.apply(req)
+        documents = service.documents()
+        if documents is not None:
+            EmbeddingOutboxService(session).enqueue(documents)
+        return response
+
+    try:
+        response = await db.run_sync(run)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return response
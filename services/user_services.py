@@ -4,12 +4,10 @@ from fastapi import HTTPException, status
 from dto.user_dto import UserRequest, UserResponse
 from dto.response import ErrorResponse, SuccessResponse, ErrorCode
 from auth.jwt_handler import create_access_token, create_refresh_token
+from auth.principal_cache import get_principal_cache
 from models.users import Users
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-ACE_API_URL = os.getenv('ACE_API_URL')
+from starlette.concurrency import run_in_threadpool
+from connection.ace_client import ACE_ERRORS, get_ace_client, get_async_ace_client
 
 
 class UserService:
@@ -17,7 +15,22 @@ class UserService:
         self.db = db
 
     def login_and_store_user(self, user_request: UserRequest) -> SuccessResponse | ErrorResponse:
-        params = {
+        try:
+            data = get_ace_client().get_json(self._login_params(user_request))
+        except requests.RequestException:
+            return self._service_unavailable()
+        return self._handle_login(data, user_request)
+
+    async def alogin_and_store_user(self, user_request: UserRequest) -> SuccessResponse | ErrorResponse:
+        # ACE I/O stays on the event loop; only the short DB write uses a worker thread
+        try:
+            data = await get_async_ace_client().get_json(self._login_params(user_request))
+        except ACE_ERRORS:
+            return self._service_unavailable()
+        return await run_in_threadpool(self._handle_login, data, user_request)
+
+    def _login_params(self, user_request: UserRequest) -> dict:
+        return {
             "fct": "Login",
             "accountid": user_request.account_id,
             "username": user_request.username,
@@ -27,85 +40,84 @@ class UserService:
             "format": "json"
         }
 
-        try:
-            response = requests.get(ACE_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            #print("API Response:", data)
+    def _handle_login(self, data: dict, user_request: UserRequest):
+        #print("API Response:", data)
 
-            if data.get("status") != "ok":
-                error_desc = data.get("results", [{}])[0].get("ERRORDESCRIPTION", "Unknown error")
-                
-                # Handle specific error cases and return appropriate error responses
-                if "invalid account" in error_desc.lower() or "account not found" in error_desc.lower():
-                    return ErrorResponse(
-                        error="Invalid Account ID",
-                        error_code=ErrorCode.INVALID_ACCOUNT_ID,
-                        message="The provided account ID is invalid or does not exist",
-                        data=None
-                    ), status.HTTP_404_NOT_FOUND
-                elif "invalid username" in error_desc.lower() or "invalid password" in error_desc.lower() or "authentication failed" in error_desc.lower():
-                    return ErrorResponse(
-                        error="Invalid Credentials",
-                        error_code=ErrorCode.INVALID_CREDENTIALS,
-                        message="The provided email/username or password is incorrect",
-                        data=None
-                    ), status.HTTP_401_UNAUTHORIZED
-                elif "account locked" in error_desc.lower() or "account disabled" in error_desc.lower():
-                    return ErrorResponse(
-                        error="Account Locked",
-                        error_code=ErrorCode.ACCOUNT_LOCKED,
-                        message="Your account has been locked or disabled. Please contact support",
-                        data=None
-                    ), status.HTTP_403_FORBIDDEN
-                else:
-                    return ErrorResponse(
-                        error="Login Failed",
-                        error_code=ErrorCode.LOGIN_FAILED,
-                        message=error_desc,
-                        data=None
-                    ), status.HTTP_400_BAD_REQUEST
-                
-            user_data = data["results"][0]
-            guid = user_data.get("GUID")
-            email = user_data.get("EMAIL_ALERT")
+        if data.get("status") != "ok":
+            error_desc = data.get("results", [{}])[0].get("ERRORDESCRIPTION", "Unknown error")
             
-            user = self.db.query(Users).filter(Users.email == email).first()
-            if user:
-                user.guid = guid
+            # Handle specific error cases and return appropriate error responses
+            if "invalid account" in error_desc.lower() or "account not found" in error_desc.lower():
+                return ErrorResponse(
+                    error="Invalid Account ID",
+                    error_code=ErrorCode.INVALID_ACCOUNT_ID,
+                    message="The provided account ID is invalid or does not exist",
+                    data=None
+                ), status.HTTP_404_NOT_FOUND
+            elif "invalid username" in error_desc.lower() or "invalid password" in error_desc.lower() or "authentication failed" in error_desc.lower():
+                return ErrorResponse(
+                    error="Invalid Credentials",
+                    error_code=ErrorCode.INVALID_CREDENTIALS,
+                    message="The provided email/username or password is incorrect",
+                    data=None
+                ), status.HTTP_401_UNAUTHORIZED
+            elif "account locked" in error_desc.lower() or "account disabled" in error_desc.lower():
+                return ErrorResponse(
+                    error="Account Locked",
+                    error_code=ErrorCode.ACCOUNT_LOCKED,
+                    message="Your account has been locked or disabled. Please contact support",
+                    data=None
+                ), status.HTTP_403_FORBIDDEN
             else:
-                user = Users(
-                    ace_user_id=user_data.get("USER_ID"),
-                    guid=guid,
-                    email=email,
-                    role="user"
-                )
-                self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+                return ErrorResponse(
+                    error="Login Failed",
+                    error_code=ErrorCode.LOGIN_FAILED,
+                    message=error_desc,
+                    data=None
+                ), status.HTTP_400_BAD_REQUEST
+            
+        user_data = data["results"][0]
+        guid = user_data.get("GUID")
+        email = user_data.get("EMAIL_ALERT")
+        
+        user = self.db.query(Users).filter(Users.email == email).first()
+        previous_guid = user.guid if user else None
+        if user:
+            user.guid = guid
+        else:
+            user = Users(
+                ace_user_id=user_data.get("USER_ID"),
+                guid=guid,
+                email=email,
+                role="user"
+            )
+            self.db.add(user)
+        self.db.commit()
+        self.db.refresh(user)
+        # tokens are keyed on the guid; drop whatever get_current_user cached for the old and new one
+        get_principal_cache().invalidate([previous_guid, str(user.guid)])
 
-            access_token = create_access_token({"sub": str(user.guid), "role": user.role})
-            refresh_token = create_refresh_token({"sub": str(user.guid)})
+        access_token = create_access_token({"sub": str(user.guid), "role": user.role})
+        refresh_token = create_refresh_token({"sub": str(user.guid)})
 
-            return SuccessResponse(
-                message="Login successful",
-                data={
-                    "guid": guid,
-                    "user_id": str(user.user_id),
-                    "ace_user_id": str(user.ace_user_id),
-                    "username": user_request.username,
-                    "account_id": user_request.account_id,
-                    "access_token": access_token,
-                    "refresh_token": refresh_token
-                },
-                error=None
-            ), status.HTTP_200_OK
+        return SuccessResponse(
+            message="Login successful",
+            data={
+                "guid": guid,
+                "user_id": str(user.user_id),
+                "ace_user_id": str(user.ace_user_id),
+                "username": user_request.username,
+                "account_id": user_request.account_id,
+                "access_token": access_token,
+                "refresh_token": refresh_token
+            },
+            error=None
+        ), status.HTTP_200_OK
 
-        except requests.RequestException as e:
-            return ErrorResponse(
-                message="Unable to connect to authentication service. Please try again later",
-                error="Service Unavailable",
-                error_code=ErrorCode.SERVICE_UNAVAILABLE,
-                data=None
-            ), status.HTTP_500_INTERNAL_SERVER_ERROR
+    def _service_unavailable(self):
+        return ErrorResponse(
+            message="Unable to connect to authentication service. Please try again later",
+            error="Service Unavailable",
+            error_code=ErrorCode.SERVICE_UNAVAILABLE,
+            data=None
+        ), status.HTTP_500_INTERNAL_SERVER_ERROR
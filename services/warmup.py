@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+from dotenv import load_dotenv
+import os
+
+from dependencies.gemini_dependency import get_llm
+from services.embedding_service import get_embedding_service
+from connection.vectordb import get_chroma_client
+
+load_dotenv()
+# load the GenAI models in the background at startup instead of on the first /genai request
+MODEL_WARMUP = os.getenv('MODEL_WARMUP', 'false').lower() in ('1', 'true', 'yes')
+
+WARMUP_COMPONENTS: Dict[str, Callable] = {
+    "embeddings": lambda: get_embedding_service().warmup(),
+    "llm": get_llm,
+    "chroma": get_chroma_client,
+}
+
+
+class ModelWarmup:
+    """Loads the heavy GenAI clients off the request path and tracks their state.
+
+    With warmup disabled every component stays ``lazy`` and is built by the
+    first request that needs it; readiness then only depends on the database.
+    """
+
+    def __init__(self, enabled: bool = MODEL_WARMUP, components: Dict[str, Callable] = WARMUP_COMPONENTS):
+        self.enabled = enabled
+        self.components = components
+        self.state = {
+            name: {"status": "pending" if enabled else "lazy", "seconds": None, "error": None}
+            for name in components
+        }
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Run the warmup in a daemon thread so startup does not wait for it."""
+        if self.enabled and self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+            self._thread.start()
+
+    def run(self):
+        for name, load in self.components.items():
+            entry = self.state[name]
+            entry["status"] = "loading"
+            started = time.perf_counter()
+            try:
+                load()
+                entry["status"] = "ready"
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+
+    @property
+    def ready(self) -> bool:
+        return all(entry["status"] in ("ready", "lazy") for entry in self.state.values())
+
+    def to_dict(self) -> dict:
+        return {"enabled": self.enabled, "ready": self.ready, "components": self.state}
+
+
+_warmup: ModelWarmup | None = None
+
+def get_model_warmup() -> ModelWarmup:
+    global _warmup
+    if _warmup is None:
+        _warmup = ModelWarmup()
+    return _warmup
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# connection.database reads these at import time; the tests create their own engines
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+
+# every model, as alembic/env.py imports them, so create_all builds the whole schema
+from connection.database import Base  # noqa: E402
+from models.users import Users  # noqa: E402,F401
+from models.projects import Projects  # noqa: E402,F401
+from models.tasks import Tasks  # noqa: E402,F401
+from models.task_assignees import TasksAssignees  # noqa: E402,F401
+from models.task_logs import TaskLogs  # noqa: E402,F401
+from models.sync_state import SyncState  # noqa: E402,F401
+from models.user_task_versions import UserTaskVersion  # noqa: E402,F401
+from models.rollups import UserDailyRollup, ProjectDailyRollup, TaskDailyRollup  # noqa: E402,F401
+from models.task_logs_archive import TaskLogArchive  # noqa: E402,F401
+from models.embedding_outbox import EmbeddingOutbox  # noqa: E402,F401
+from models.open_timers import OpenTimer  # noqa: E402,F401
+from models.sync_jobs import SyncJobRecord, SyncBatchRecord, SyncScheduleRecord  # noqa: E402,F401
+
+
+@pytest.fixture
+def session_factory():
+    """A sessionmaker over a fresh in-memory SQLite database with every table created."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
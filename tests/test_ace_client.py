@@ -0,0 +1,160 @@
+"""Circuit breaker, retries and tenant rate limiting of the ACE clients (no network)."""
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+from connection.ace_client import AceClient, AceUnavailableError, AsyncAceClient, CircuitBreaker, TenantLimiter
+
+URL = "https://ace.example.com/"
+
+
+class CountingLimiter(TenantLimiter):
+    def __init__(self):
+        super().__init__(max_concurrency=2, rate_per_second=0)
+        self.reserved = []
+
+    def reserve(self, tenant: str) -> float:
+        self.reserved.append(tenant)
+        return 0.0
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def sync_client(responder, **kwargs) -> AceClient:
+    client = AceClient(base_url=URL, **kwargs)
+    client.session.get = lambda url, params, timeout, stream: responder(params)
+    return client
+
+
+def ok_response(status: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{"status": "ok"}'
+    response.url = URL
+    return response
+
+
+# -------- CircuitBreaker --------
+def test_breaker_opens_after_threshold_and_lets_one_trial_through():
+    breaker = CircuitBreaker(threshold=2, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # the trial is in flight
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_open_breaker_fails_fast():
+    breaker = CircuitBreaker(threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    client = sync_client(lambda params: pytest.fail("ACE must not be called"), breaker=breaker)
+    with pytest.raises(AceUnavailableError):
+        client.get({"fct": "getusers"})
+    assert client.metrics.snapshot()["getusers"]["rejected"] == 1
+
+
+# -------- Sync client --------
+def test_trial_that_raises_a_non_http_error_releases_its_slot():
+    breaker = half_open_breaker()
+
+    def broken(params):
+        raise RuntimeError("not an ACE failure")
+
+    client = sync_client(broken, breaker=breaker)
+    with pytest.raises(RuntimeError):
+        client.get({"fct": "getusers"})
+    # another caller can run the trial, and its success closes the circuit
+    client.session.get = lambda url, params, timeout, stream: ok_response()
+    client.get({"fct": "getusers"})
+    assert breaker.state == "closed"
+
+
+def test_every_retry_spends_a_tenant_token():
+    limiter = CountingLimiter()
+    calls = []
+
+    def flaky(params):
+        calls.append(params)
+        if len(calls) == 1:
+            raise requests.ConnectionError("reset")
+        return ok_response()
+
+    client = sync_client(flaky, limiter=limiter, max_tries=2)
+    client.get({"fct": "getusers", "guid": "tenant-a"})
+    assert len(calls) == 2
+    assert limiter.reserved == ["tenant-a", "tenant-a"]
+    assert client.metrics.snapshot()["getusers"]["retries"] == 1
+
+
+def test_client_errors_are_not_retried_and_do_not_trip_the_breaker():
+    calls = []
+
+    def not_found(params):
+        calls.append(params)
+        response = ok_response(404)
+        response.raise_for_status()
+
+    breaker = CircuitBreaker(threshold=1, reset_seconds=60)
+    client = sync_client(not_found, breaker=breaker, max_tries=3)
+    with pytest.raises(requests.HTTPError):
+        client.get({"fct": "gettasks"})
+    assert len(calls) == 1
+    assert breaker.state == "closed"
+
+
+# -------- Async client --------
+def async_client(handler, **kwargs) -> AsyncAceClient:
+    client = AsyncAceClient(base_url=URL, **kwargs)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_cancelled_async_trial_releases_its_slot():
+    breaker = half_open_breaker()
+    started = asyncio.Event()
+
+    async def hang(request):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def scenario():
+        client = async_client(hang, breaker=breaker)
+        call = asyncio.ensure_future(client.get({"fct": "getusers"}))
+        await started.wait()
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        await client.get({"fct": "getusers"})
+        await client.aclose()
+
+    asyncio.run(scenario())
+    assert breaker.state == "closed"
+
+
+def test_async_retries_spend_a_tenant_token_each():
+    limiter = CountingLimiter()
+    calls = []
+
+    def flaky(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) == 1 else 200, json={"status": "ok"})
+
+    async def scenario():
+        client = async_client(flaky, limiter=limiter, max_tries=2)
+        response = await client.get({"fct": "getprojects", "guid": "tenant-b"})
+        await client.aclose()
+        return response
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert limiter.reserved == ["tenant-b", "tenant-b"]
@@ -0,0 +1,103 @@
+"""AuthContextMiddleware, the verified-token cache and the principal cache behind get_current_user."""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from jose import jwt
+
+import auth.jwt_handler as jwt_handler
+import dependencies.auth_dependencies as auth_dependencies
+import middleware.auth_context as auth_context
+from auth.principal_cache import PrincipalCache
+from auth.token_cache import VerifiedTokenCache
+from dependencies.auth_dependencies import get_current_user
+from dependencies.get_db import get_db
+from middleware.auth_context import AuthContextMiddleware
+from models.users import Users
+
+SECRET = "test-secret"
+
+
+def token(sub: str = "guid-1", minutes: int = 5, **claims) -> str:
+    payload = {"sub": sub, "role": "user", **claims}
+    if minutes is not None:
+        payload["exp"] = datetime.utcnow() + timedelta(minutes=minutes)
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    monkeypatch.setattr(jwt_handler, "SECRET_KEY", SECRET)
+    monkeypatch.setattr(jwt_handler, "ALGORITHM", "HS256")
+    tokens, principals = VerifiedTokenCache(), PrincipalCache()
+    monkeypatch.setattr(auth_context, "get_token_cache", lambda: tokens)
+    monkeypatch.setattr(auth_dependencies, "get_principal_cache", lambda: principals)
+    return tokens, principals
+
+
+@pytest.fixture
+def client(caches, session_factory):
+    db = session_factory()
+    db.add(Users(ace_user_id=1, guid="guid-1", email="ana@example.com", role="user"))
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.add_middleware(AuthContextMiddleware)
+
+    @app.get("/me")
+    def me(user: Users = Depends(get_current_user)):
+        return {"email": user.email}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    def override_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    return TestClient(app)
+
+
+def test_valid_token_is_verified_once_and_the_user_loaded_once(client, caches):
+    tokens, principals = caches
+    headers = {"Authorization": f"Bearer {token()}"}
+    for _ in range(3):
+        assert client.get("/me", headers=headers).json() == {"email": "ana@example.com"}
+    assert (tokens.misses, tokens.hits) == (1, 2)
+    assert (principals.misses, principals.hits) == (1, 2)
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Basic abc"},
+    {"Authorization": "Bearer not-a-jwt"},
+    {"Authorization": f"Bearer {token(minutes=-1)}"},
+])
+def test_missing_or_invalid_tokens_are_unauthenticated(client, caches, headers):
+    assert client.get("/me", headers=headers).status_code == 401
+    assert caches[0].stats()["entries"] == 0
+
+
+def test_unknown_subject_is_rejected(client):
+    assert client.get("/me", headers={"Authorization": f"Bearer {token(sub='guid-9')}"}).json() == {"detail": "User not found"}
+
+
+def test_tokens_without_exp_are_verified_every_time(caches):
+    tokens, _ = caches
+    raw = token(minutes=None)
+    tokens.verify(raw)
+    tokens.verify(raw)
+    assert tokens.misses == 2 and tokens.stats()["entries"] == 0
+
+
+def test_streamed_bodies_pass_through(client):
+    response = client.get("/stream", headers={"Authorization": f"Bearer {token()}"})
+    assert response.text == "ab"
@@ -0,0 +1,72 @@
+"""EmbeddingCache tiers, and how EmbeddingService behaves when the cache fails."""
+import gc
+
+from services.embedding_cache import DiskTier, EmbeddingCache
+from services.embedding_service import EmbeddingService
+from tests.test_embedding_service import FakeModel
+
+
+def cached_service(tmp_path, model=None) -> EmbeddingService:
+    embeddings = EmbeddingService(model=model or FakeModel(), use_cache=False, max_wait_ms=0)
+    embeddings.cache = EmbeddingCache("fake-model", size=100, directory=str(tmp_path))
+    return embeddings
+
+
+def test_repeated_texts_are_served_from_the_cache(tmp_path):
+    model = FakeModel()
+    embeddings = cached_service(tmp_path, model)
+    assert embeddings.embed(["ab", "ab", "c"], timeout=5) == [[2.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert embeddings.embed(["c", " ab "], timeout=5) == [[1.0, 1.0], [2.0, 1.0]]
+    assert model.calls == [["ab", "c"]]
+
+
+def test_failing_cache_write_still_answers_the_caller(tmp_path):
+    embeddings = cached_service(tmp_path)
+
+    def disk_full(keys, vectors):
+        raise OSError(28, "No space left on device")
+
+    embeddings.cache.put_many = disk_full
+    assert embeddings.submit(["abc"]).result(timeout=5) == [[3.0, 1.0]]
+
+
+def test_unwritable_cache_directory_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    cache = EmbeddingCache("fake-model", size=100, directory=str(blocker))
+    cache.put_many(["k"], [[1.0, 2.0]])
+    assert cache.get_many(["k"]) == [[1.0, 2.0]]
+    assert cache.stats()["disk_entries"] is None
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    cache = EmbeddingCache("fake-model", size=100, directory=str(tmp_path))
+    cache.put_many(["k1", "k2"], [[1.0, 2.0], [3.0, 4.0]])
+    cache._disk._lock_file.close()  # what process exit does
+    del cache
+    gc.collect()
+
+    restarted = EmbeddingCache("fake-model", size=100, directory=str(tmp_path))
+    restarted.open_disk()
+    assert restarted.get_many(["k2", "k1", "k3"]) == [[3.0, 4.0], [1.0, 2.0], None]
+    assert restarted.disk_hits == 2
+
+
+def test_shared_directory_is_owned_by_one_cache(tmp_path):
+    owner = EmbeddingCache("fake-model", size=100, directory=str(tmp_path))
+    owner.put_many(["k"], [[1.0, 2.0]])
+    other = EmbeddingCache("fake-model", size=100, directory=str(tmp_path))
+    other.open_disk()
+    other.put_many(["j"], [[5.0, 6.0]])
+    assert other.stats()["disk_entries"] is None
+    assert other.get_many(["j"]) == [[5.0, 6.0]]
+    assert len(owner._disk) == 1
+
+
+def test_disk_ring_overwrites_the_oldest_row(tmp_path):
+    tier = DiskTier(tmp_path, dim=2, rows=2)
+    for n in range(3):
+        tier.put(f"k{n}", [float(n), 0.0])
+    assert tier.get("k0") is None
+    assert tier.get("k2") == (2.0, 0.0)
+    assert len(tier) == 2
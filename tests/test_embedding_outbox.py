@@ -0,0 +1,129 @@
+"""EmbeddingOutboxWorker claim/deliver/settle against SQLite and a fake Chroma client."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text, update
+
+import services.embedding_outbox as outbox
+from dto.document import DocumentRequest
+from models.embedding_outbox import EmbeddingOutbox
+from services.embedding_outbox import DEAD, PENDING, EmbeddingOutboxService, EmbeddingOutboxWorker
+
+
+class FakeEmbeddings:
+    def embed(self, documents):
+        return [[float(len(document))] for document in documents]
+
+
+class FakeCollection:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.documents = {}
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        if self.fail:
+            raise ConnectionError("chroma down")
+        self.documents.update(zip(ids, documents))
+
+
+class FakeChroma:
+    def __init__(self, fail: bool = False):
+        self.collection = FakeCollection(fail)
+
+    def get_or_create_collection(self, name):
+        return self.collection
+
+
+@pytest.fixture(autouse=True)
+def fake_embeddings(monkeypatch):
+    monkeypatch.setattr(outbox, "get_embedding_service", FakeEmbeddings)
+
+
+def enqueue(session_factory, *documents, document_id: str = "log-1"):
+    db = session_factory()
+    EmbeddingOutboxService(db).enqueue(
+        DocumentRequest(id=[document_id] * len(documents), document=list(documents), metadata=[{"n": 1}] * len(documents)),
+        collection="tasks",
+    )
+    db.commit()
+    db.close()
+
+
+def rows(session_factory):
+    db = session_factory()
+    try:
+        return [(row.document, row.status) for row in db.execute(select(EmbeddingOutbox).order_by(EmbeddingOutbox.outbox_id)).scalars()]
+    finally:
+        db.close()
+
+
+def test_delivery_writes_latest_document_and_empties_the_outbox(session_factory):
+    enqueue(session_factory, "first stop", "second stop")
+    chroma = FakeChroma()
+    report = EmbeddingOutboxWorker(session_factory, client=chroma).drain()
+    assert chroma.collection.documents == {"log-1": "second stop"}
+    assert report == {"delivered": 1, "failed": 0, "dead": 0}
+    assert rows(session_factory) == []
+
+
+def test_superseded_row_is_not_claimed_and_is_deleted_with_the_newer_one(session_factory):
+    enqueue(session_factory, "old")
+    db = session_factory()
+    # the old row failed once and is backing off
+    db.execute(update(EmbeddingOutbox).values(available_at=datetime.utcnow() + timedelta(hours=1)))
+    db.commit()
+    db.close()
+    enqueue(session_factory, "new")
+
+    worker = EmbeddingOutboxWorker(session_factory, client=FakeChroma())
+    claimed = worker.claim()
+    assert [row["document"] for row in claimed] == ["new"]
+    worker.deliver(claimed)
+    assert rows(session_factory) == []
+
+
+def test_failed_delivery_backs_off_and_dead_letters_superseded_rows(session_factory, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 2)
+    enqueue(session_factory, "old")
+    enqueue(session_factory, "new")
+    db = session_factory()
+    # keep the older row out of the way (leased by another worker)
+    db.execute(update(EmbeddingOutbox).where(EmbeddingOutbox.document == "old")
+               .values(available_at=datetime.utcnow() + timedelta(hours=1)))
+    db.commit()
+    db.close()
+
+    worker = EmbeddingOutboxWorker(session_factory, client=FakeChroma(fail=True))
+    assert worker.deliver(worker.claim()) == {"delivered": 0, "failed": 1, "dead": 0}
+    assert rows(session_factory) == [("old", PENDING), ("new", PENDING)]
+
+    db = session_factory()
+    db.execute(update(EmbeddingOutbox).where(EmbeddingOutbox.document == "new").values(available_at=datetime.utcnow()))
+    db.commit()
+    db.close()
+    assert worker.deliver(worker.claim()) == {"delivered": 0, "failed": 0, "dead": 1}
+    # the older row would never be claimed again; it goes with the dead one instead of staying pending
+    assert rows(session_factory) == [("new", DEAD)]
+
+    db = session_factory()
+    assert EmbeddingOutboxService(db).stats()["pending"] == 0
+    assert EmbeddingOutboxService(db).requeue_dead() == 1
+    db.commit()
+    db.close()
+    assert EmbeddingOutboxWorker(session_factory, client=FakeChroma()).drain()["delivered"] == 1
+
+
+def test_claim_reads_documents_through_the_document_index(session_factory):
+    db = session_factory()
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT 1 FROM embedding_outbox AS newer "
+        "WHERE newer.collection = 'tasks' AND newer.document_id = 'log-1' AND newer.outbox_id > 5"
+    )).all()
+    db.close()
+    assert any("ix_embedding_outbox_document" in row[-1] for row in plan)
+
+
+def test_backoff_is_exponential_and_capped(monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF_SECONDS", 10)
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF_MAX_SECONDS", 60)
+    assert [EmbeddingOutboxWorker.backoff(n) for n in (1, 2, 3, 4)] == [10, 20, 40, 60]
@@ -0,0 +1,97 @@
+"""Micro-batching EmbeddingService with a fake model (no sentence-transformers needed)."""
+import asyncio
+import threading
+from concurrent.futures import TimeoutError
+
+import numpy as np
+import pytest
+
+from services.embedding_service import EmbeddingService
+
+
+class FakeModel:
+    """Embeds a text as ``[len(text), 1.0]``; ``gate`` (if set) holds every encode until released."""
+
+    def __init__(self, gate: threading.Event = None):
+        self.gate = gate
+        self.started = threading.Event()
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def service(model, max_wait_ms: float = 0, **kwargs) -> EmbeddingService:
+    return EmbeddingService(model=model, use_cache=False, max_wait_ms=max_wait_ms, **kwargs)
+
+
+def test_concurrent_requests_share_a_batch():
+    gate = threading.Event()
+    model = FakeModel(gate)
+    embeddings = service(model, max_wait_ms=200)
+    first = embeddings.submit(["a"])
+    model.started.wait(5)
+    # queued while the first batch is encoding, so they are collected together
+    second, third = embeddings.submit(["bb"]), embeddings.submit(["ccc", "dddd"])
+    gate.set()
+    assert first.result(5) == [[1.0, 1.0]]
+    assert second.result(5) == [[2.0, 1.0]]
+    assert third.result(5) == [[3.0, 1.0], [4.0, 1.0]]
+    assert model.calls == [["a"], ["bb", "ccc", "dddd"]]
+
+
+def test_cancelled_aembed_does_not_kill_the_worker():
+    gate = threading.Event()
+    model = FakeModel(gate)
+    embeddings = service(model)
+
+    async def cancel_one():
+        blocker = asyncio.ensure_future(embeddings.aembed(["busy"]))
+        await asyncio.get_running_loop().run_in_executor(None, model.started.wait, 5)
+        cancelled = asyncio.ensure_future(embeddings.aembed(["gone"]))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await blocker
+
+    assert asyncio.run(cancel_one()) == [[4.0, 1.0]]
+    assert embeddings.embed(["after"], timeout=5) == [[5.0, 1.0]]
+    assert embeddings._worker.is_alive()
+
+
+def test_dead_worker_is_restarted():
+    embeddings = service(FakeModel())
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    embeddings._worker = dead
+    assert embeddings.embed(["abc"], timeout=5) == [[3.0, 1.0]]
+    assert embeddings._worker is not dead
+
+
+def test_embed_times_out():
+    gate = threading.Event()
+    embeddings = service(FakeModel(gate))
+    try:
+        with pytest.raises(TimeoutError):
+            embeddings.embed(["slow"], timeout=0.05)
+    finally:
+        gate.set()
+
+
+def test_model_error_reaches_every_caller_and_worker_survives():
+    class Broken(FakeModel):
+        def encode(self, texts, **kwargs):
+            raise ValueError("bad input")
+
+    embeddings = service(Broken())
+    with pytest.raises(ValueError):
+        embeddings.embed(["x"], timeout=5)
+    embeddings._model = FakeModel()
+    assert embeddings.embed(["xy"], timeout=5) == [[2.0, 1.0]]
@@ -0,0 +1,98 @@
+"""TaskLogExporter over live and archived task logs."""
+import csv
+import io
+import json
+from datetime import date, datetime
+from uuid import uuid4
+
+from models.projects import Projects
+from models.task_logs import TaskLogs
+from models.tasks import Tasks
+from models.users import Users
+from services.export_service import EXPORT_FIELDS, TaskLogExporter
+from services.task_log_maintenance import TaskLogArchiver, add_months
+
+USER_ID = uuid4()
+
+
+def seed(session_factory):
+    db = session_factory()
+    db.add_all([
+        Users(user_id=USER_ID, ace_user_id=1, email="ana@example.com", role="user"),
+        Projects(ace_project_id=10, project_name="Website"),
+        Tasks(ace_task_id=100, task_title="Login", ace_project_id=10),
+    ])
+    db.flush()
+    db.add_all([
+        log(datetime(2024, 1, 5, 9), datetime(2024, 1, 5, 10)),
+        log(datetime(2024, 1, 20, 9), None),  # open timers are never archived
+        log(datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 11)),
+    ])
+    db.commit()
+    db.close()
+
+
+def log(start: datetime, end, comment: str = "work") -> TaskLogs:
+    return TaskLogs(
+        log_id=uuid4(), ace_task_id=100, user_id=USER_ID, start_time=start, end_time=end,
+        duration=(end - start).total_seconds() if end else None, comment=comment, status="done" if end else "open",
+    )
+
+
+def archive(session_factory, cutoff: date) -> int:
+    db = session_factory()
+    try:
+        return TaskLogArchiver(db, batch_size=1).archive(cutoff)
+    finally:
+        db.close()
+
+
+def test_archiver_moves_only_closed_logs_before_the_cutoff(session_factory):
+    seed(session_factory)
+    assert archive(session_factory, date(2025, 1, 1)) == 1
+    db = session_factory()
+    assert [row.start_time for row in db.query(TaskLogs).order_by(TaskLogs.start_time)] == [
+        datetime(2024, 1, 20, 9), datetime(2026, 3, 2, 9),
+    ]
+    db.close()
+
+
+def test_archiver_cutoff_is_whole_months():
+    assert TaskLogArchiver.cutoff(12, today=date(2026, 10, 18)) == date(2025, 10, 1)
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+
+
+def test_export_includes_archived_logs(session_factory):
+    seed(session_factory)
+    archive(session_factory, date(2025, 1, 1))
+
+    rows = list(TaskLogExporter(session_factory).rows())
+    assert [row["start_time"] for row in rows] == [
+        datetime(2024, 1, 5, 9), datetime(2024, 1, 20, 9), datetime(2026, 3, 2, 9),
+    ]
+    assert rows[0]["user_email"] == "ana@example.com"
+    assert rows[0]["project_name"] == "Website"
+    assert list(rows[0]) == EXPORT_FIELDS
+
+
+def test_export_date_range_applies_to_archived_logs(session_factory):
+    seed(session_factory)
+    archive(session_factory, date(2025, 1, 1))
+
+    exporter = TaskLogExporter(session_factory, start=date(2024, 1, 1), end=date(2024, 1, 10))
+    assert [row["start_time"] for row in exporter.rows()] == [datetime(2024, 1, 5, 9)]
+    exporter = TaskLogExporter(session_factory, user_id=uuid4())
+    assert list(exporter.rows()) == []
+
+
+def test_csv_and_ndjson_encoders(session_factory):
+    seed(session_factory)
+    exporter = TaskLogExporter(session_factory, end=date(2024, 12, 31))
+
+    table = list(csv.reader(io.StringIO(b"".join(exporter.iter_csv()).decode())))
+    assert table[0] == EXPORT_FIELDS
+    assert [line[EXPORT_FIELDS.index("start_time")] for line in table[1:]] == [
+        "2024-01-05T09:00:00", "2024-01-20T09:00:00",
+    ]
+    lines = b"".join(exporter.iter_ndjson()).decode().splitlines()
+    assert [json.loads(line)["comment"] for line in lines] == ["work", "work"]
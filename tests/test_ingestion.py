@@ -0,0 +1,110 @@
+"""Re-ingesting an unchanged ACE payload must not report new rows.
+
+SQLite runs the preload strategy. Set ``INGEST_TEST_DATABASE_URLS`` to a
+comma-separated list of MySQL/PostgreSQL URLs (throwaway databases: all
+tables are created and dropped) to exercise the native upsert as well.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from connection.database import Base
+from models.task_assignees import TasksAssignees
+from models.users import Users
+from services.data_service import DataService  # imports every model the sync writes
+from services.ingestion import BulkUpserter
+
+EXTRA_URLS = [url.strip() for url in os.getenv("INGEST_TEST_DATABASE_URLS", "").split(",") if url.strip()]
+
+USERS = [{"USER_ID": n, "EMAIL_ALERT": f"user{n}@example.com", "ROLE": "user"} for n in (1, 2, 3)]
+PROJECTS = [{"PROJECT_ID": "10", "PROJECT_NAME": "Website"}]
+TASKS = [
+    {"TASK_ID": "100", "PROJECT_ID": "10", "TASK_RESUME": "Login", "ASSIGNED_ID": "1,2"},
+    {"TASK_ID": "101", "PROJECT_ID": "10", "TASK_RESUME": "Export", "ASSIGNED_ID": "3"},
+]
+
+
+@pytest.fixture(params=["sqlite://", *EXTRA_URLS])
+def db(request):
+    url = request.param
+    if url.startswith("sqlite"):
+        engine = create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def ingest(db) -> DataService:
+    service = DataService(db)
+    service.save_users(USERS)
+    service.save_projects(PROJECTS)
+    service.save_tasks(TASKS)
+    return service
+
+
+def test_identical_assignees_batch_inserts_nothing(db):
+    service = ingest(db)
+    assert service.save_assignees(TASKS) == 3
+
+    bumped = []
+    service.versions.bump_users = lambda ids: bumped.extend(ids)
+    assert service.save_assignees(TASKS) == 0
+    assert bumped == []
+    assert db.scalar(select(func.count()).select_from(TasksAssignees)) == 3
+
+
+def test_partly_new_batch_reports_only_new_pairs(db):
+    service = ingest(db)
+    service.save_assignees(TASKS[:1])
+
+    bumped = []
+    service.versions.bump_users = lambda ids: bumped.extend(ids)
+    assert service.save_assignees(TASKS) == 1
+    assert bumped == [3]
+
+
+def test_identical_users_batch_inserts_nothing(db):
+    service = ingest(db)
+    assert service.save_users(USERS) == (0, 0)
+
+
+class RecordingMySQLSession:
+    """Just enough of a MySQL Session for BulkUpserter: key probes find ``existing``, writes are recorded."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.writes = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=mysql.dialect())
+
+    def execute(self, statement, params=None):
+        if params is None:
+            return SimpleNamespace(all=lambda: [(value,) for value in self.existing])
+        self.writes.append((str(statement.compile(dialect=mysql.dialect())), params))
+
+
+def test_mysql_native_insert_skips_known_keys_and_keeps_errors_raising():
+    db = RecordingMySQLSession(existing=[1])
+    upserter = BulkUpserter(db, strategy="native")
+    inserted_keys = set()
+    rows = [{"ace_user_id": 1, "email": "a@example.com"}, {"ace_user_id": 2, "email": "b@example.com"}]
+    assert upserter.insert_missing(Users, rows, [("ace_user_id",)], inserted_keys=inserted_keys) == 1
+    assert inserted_keys == {2}
+    [(sql, params)] = db.writes
+    # only duplicate keys are absorbed; INSERT IGNORE would also swallow FK and truncation errors
+    assert "IGNORE" not in sql
+    assert sql.endswith("ON DUPLICATE KEY UPDATE user_id = users.user_id")
+    assert [row["ace_user_id"] for row in params] == [2]
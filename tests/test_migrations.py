@@ -0,0 +1,64 @@
+"""The Alembic chain builds the models' schema on an empty database and adopts create_all databases."""
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+import connection.database as database
+from connection.database import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def migrate(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    # env.py migrates the app's DATABASE_URL
+    monkeypatch.setattr(database, "DATABASE_URL", url)
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    engine = create_engine(url)
+    yield config, engine
+    engine.dispose()
+
+
+def test_upgrade_head_on_an_empty_database_matches_the_models(migrate):
+    config, engine = migrate
+    command.upgrade(config, "head")
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+
+
+# the tables the pre-Alembic app created with create_all() (tasks.status came with 98a1f5c29107)
+CREATE_ALL_TABLES = [
+    "CREATE TABLE users (user_id CHAR(32) PRIMARY KEY, ace_user_id INTEGER NOT NULL UNIQUE, "
+    "guid VARCHAR(250), email VARCHAR(200) NOT NULL UNIQUE, role VARCHAR(150))",
+    "CREATE TABLE projects (project_id CHAR(32) PRIMARY KEY, ace_project_id INTEGER NOT NULL UNIQUE, "
+    "project_name VARCHAR(100) NOT NULL, description VARCHAR(255), start_date DATETIME, end_date DATETIME, "
+    "supervisor_id INTEGER REFERENCES users (ace_user_id))",
+    "CREATE TABLE tasks (task_id CHAR(32) PRIMARY KEY, ace_task_id INTEGER NOT NULL UNIQUE, "
+    "task_title VARCHAR(100) NOT NULL, description VARCHAR(255), "
+    "ace_project_id INTEGER REFERENCES projects (ace_project_id), start_date DATETIME, end_date DATETIME)",
+    "CREATE TABLE tasks_assignees (task_assignee_id CHAR(32) PRIMARY KEY, "
+    "ace_task_id INTEGER REFERENCES tasks (ace_task_id), assigned_at DATETIME, "
+    "ace_user_id INTEGER REFERENCES users (ace_user_id))",
+    "CREATE TABLE task_logs (log_id CHAR(32) PRIMARY KEY, ace_task_id INTEGER REFERENCES tasks (ace_task_id), "
+    "user_id CHAR(32) REFERENCES users (user_id), duration FLOAT, comment TEXT, status VARCHAR(50), "
+    "start_time DATETIME, end_time DATETIME)",
+]
+
+
+def test_database_created_by_create_all_is_adopted(migrate):
+    config, engine = migrate
+    with engine.begin() as conn:
+        for ddl in CREATE_ALL_TABLES:
+            conn.exec_driver_sql(ddl)
+    command.stamp(config, "fbc504733127")
+    command.upgrade(config, "head")
+    assert {"tasks", "open_timers", "embedding_outbox"} <= set(inspect(engine).get_table_names())
+    command.downgrade(config, "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
@@ -0,0 +1,128 @@
+"""Local question parsing: date rules, project matching, confidence and the retrieval filter."""
+from datetime import date, datetime
+
+import pytest
+
+import utils.query_parser as query_parser
+from genai.rag_pipeline import build_filter
+from models.projects import Projects
+from services.project_index import ProjectIndex
+from utils.query_parser import extract_keywords, parse_dates, parse_locally
+
+TODAY = date(2026, 10, 18)  # a Sunday
+
+
+@pytest.mark.parametrize("question, start, end", [
+    ("what did I do today", TODAY, TODAY),
+    ("hours logged yesterday", date(2026, 10, 17), date(2026, 10, 17)),
+    ("work in the last 3 days", date(2026, 10, 15), TODAY),
+    ("tasks from the past two weeks", date(2026, 10, 4), TODAY),
+    ("summary of last month", date(2026, 9, 1), date(2026, 9, 30)),
+    ("this week so far", date(2026, 10, 12), TODAY),
+    ("last quarter", date(2026, 7, 1), date(2026, 9, 30)),
+    ("what happened in march", date(2026, 3, 1), date(2026, 3, 31)),
+    ("what happened in december", date(2025, 12, 1), date(2025, 12, 31)),
+    ("between november and february", date(2025, 11, 1), date(2026, 2, 28)),
+    ("from 2026-01-01 to 2026-01-31", date(2026, 1, 1), date(2026, 1, 31)),
+    ("since june 2025", date(2025, 6, 1), TODAY),
+    ("logs on 2026-05-04", date(2026, 5, 4), date(2026, 5, 4)),
+    ("3 days ago", date(2026, 10, 15), date(2026, 10, 15)),
+    ("during 2025", date(2025, 1, 1), date(2025, 12, 31)),
+    ("what did I do on Monday", date(2026, 10, 12), date(2026, 10, 12)),
+    ("last friday", date(2026, 10, 16), date(2026, 10, 16)),
+    ("tasks on sunday", TODAY, TODAY),
+    ("last sunday", date(2026, 10, 11), date(2026, 10, 11)),
+])
+def test_date_rules(question, start, end):
+    assert parse_dates(question, TODAY)[:2] == (start, end)
+
+
+def test_invalid_dates_and_plain_questions_resolve_to_nothing():
+    assert parse_dates("logs on 2026-02-30", TODAY)[:2] == (None, None)
+    assert parse_dates("may I see my tasks", TODAY)[:2] == (None, None)
+
+
+def test_keywords_skip_stopwords_and_duplicates():
+    assert extract_keywords("Show my tasks about the login bug and login page") == ["login", "bug", "page"]
+
+
+# -------- Projects --------
+@pytest.fixture
+def index(session_factory, monkeypatch):
+    db = session_factory()
+    db.add_all([
+        Projects(ace_project_id=1, project_name="Support"),
+        Projects(ace_project_id=2, project_name="ACE Sync V2"),
+        Projects(ace_project_id=3, project_name="QA"),
+    ])
+    db.commit()
+    db.close()
+    projects = ProjectIndex(session_factory)
+    monkeypatch.setattr(query_parser, "get_project_index", lambda: projects)
+    return projects
+
+
+def test_project_name_needs_a_project_cue(index):
+    assert index.match("how much support work did I do last week") is None
+    assert index.match("time on the support project last week") == "Support"
+    assert index.match('what did I log on "ace-sync v2"') == "ACE Sync V2"
+    assert index.match("what's new with support's backlog") is None
+
+
+def test_misspelt_project_after_the_cue(index):
+    assert index.match("status of project ace sync v3") == "ACE Sync V2"
+    assert index.match("status of project QA") is None  # names under 3 characters are not indexed
+
+
+def test_parse_locally_keeps_common_words_that_are_project_names(index):
+    parsed = parse_locally("support tickets last month", TODAY)
+    assert parsed["project_name"] is None
+    assert parsed["keywords"] == ["support", "tickets"]
+    assert (parsed["start_date"], parsed["end_date"]) == ("2026-09-01", "2026-09-30")
+    assert parsed["confidence"] == 1.0
+
+
+def test_weekday_resolves_to_a_date(index):
+    parsed = parse_locally("what did I do on Monday", TODAY)
+    assert (parsed["start_date"], parsed["end_date"]) == ("2026-10-12", "2026-10-12")
+    assert parsed["confidence"] == 1.0
+
+
+def test_unresolved_time_words_or_unknown_project_lower_confidence(index):
+    assert parse_locally("what did I do before the release", TODAY)["confidence"] < 0.75
+    assert parse_locally("hours on project zeppelin", TODAY)["confidence"] < 0.75
+    # the rule resolves one weekday; a second one is left unresolved
+    assert parse_locally("work between monday and friday", TODAY)["confidence"] < 0.75
+
+
+def test_project_name_does_not_filter_retrieval():
+    parsed = {"project_name": "Support", "start_date": None, "end_date": None}
+    assert build_filter("user-1", parsed) == {"user_id": {"$eq": "user-1"}}
+
+
+def date_filter(start_date, end_date):
+    parsed = {"start_date": start_date, "end_date": end_date}
+    return build_filter("user-1", parsed)["$and"][1:]
+
+
+def stamp(year, month, day, hour=0):
+    return int(datetime(year, month, day, hour).timestamp())
+
+
+def matches(conditions, timestamp):
+    checks = {"$gte": timestamp.__ge__, "$lt": timestamp.__lt__, "$lte": timestamp.__le__}
+    return all(checks[op](value) for condition in conditions for op, value in condition["date"].items())
+
+
+def test_single_day_filter_covers_the_whole_day():
+    conditions = date_filter("2026-10-12", "2026-10-12")
+    assert matches(conditions, stamp(2026, 10, 12, 9))
+    assert matches(conditions, stamp(2026, 10, 12, 23))
+    assert not matches(conditions, stamp(2026, 10, 13))
+
+
+def test_multi_day_filter_keeps_its_last_day():
+    conditions = date_filter("2026-09-01", "2026-09-30")
+    assert matches(conditions, stamp(2026, 9, 30, 17))
+    assert not matches(conditions, stamp(2026, 8, 31, 23))
+    assert not matches(conditions, stamp(2026, 10, 1))
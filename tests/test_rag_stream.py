@@ -0,0 +1,96 @@
+"""Single retrieval and Server-Sent Events framing of the RAG pipeline (fake LLM, embeddings and store)."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import genai.rag_pipeline as rag_pipeline
+from genai.rag_pipeline import RagPipeline, Retrieval, sse_event
+
+
+class FakeChain:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def astream(self, inputs):
+        for n, chunk in enumerate(self.chunks):
+            if n == self.fail_after:
+                raise RuntimeError("quota exceeded")
+            yield SimpleNamespace(content=chunk)
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        return [0.1, 0.2]
+
+
+class FakeStore:
+    def __init__(self):
+        self.searches = []
+
+    def similarity_search_by_vector(self, vector, k, filter):
+        self.searches.append((vector, k, filter))
+        return [SimpleNamespace(page_content="Fixed login", metadata={"user_id": "u1"})]
+
+
+def frames(body: str):
+    """Parse an SSE body into (event, data) pairs, checking each frame's shape."""
+    parsed = []
+    assert body.endswith("\n\n")
+    for frame in body[:-2].split("\n\n"):
+        lines = frame.split("\n")
+        assert len(lines) == 2 and lines[0].startswith("event: ") and lines[1].startswith("data: ")
+        parsed.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return parsed
+
+
+def collect(pipeline, retrieval) -> str:
+    async def run():
+        return "".join([frame async for frame in pipeline.stream(retrieval)])
+
+    return asyncio.run(run())
+
+
+def retrieval() -> Retrieval:
+    return Retrieval("what did I fix?", {"keywords": ["fix"]}, [SimpleNamespace(page_content="Fixed login", metadata={})], {})
+
+
+def test_multiline_data_stays_on_one_data_line():
+    assert frames(sse_event("token", {"text": "line one\n\nline two"})) == [("token", {"text": "line one\n\nline two"})]
+
+
+def test_stream_sends_retrieval_tokens_then_done(monkeypatch):
+    monkeypatch.setattr(rag_pipeline, "_chain", FakeChain(["You ", "", "fixed\nlogin."]))
+    events = frames(collect(RagPipeline(vectordb=None), retrieval()))
+    assert [event for event, _ in events] == ["retrieval", "token", "token", "done"]
+    assert events[0][1]["sources"] == [{"document": "Fixed login", "metadata": {}}]
+    assert events[-1][1]["answer"] == "You fixed\nlogin."
+    assert {"first_token", "llm"} <= set(events[-1][1]["timings_ms"])
+
+
+def test_llm_failure_mid_stream_ends_with_an_error_event(monkeypatch):
+    monkeypatch.setattr(rag_pipeline, "_chain", FakeChain(["partial", "never"], fail_after=1))
+    events = frames(collect(RagPipeline(vectordb=None), retrieval()))
+    assert events[1:] == [("token", {"text": "partial"}), ("error", {"detail": "quota exceeded"})]
+
+
+def test_question_is_embedded_and_searched_once(monkeypatch):
+    embeddings = FakeEmbeddings()
+    store = FakeStore()
+    monkeypatch.setattr(rag_pipeline, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(rag_pipeline, "parse_user_query",
+                        lambda question: {"start_date": "2026-10-01", "end_date": "2026-10-18"})
+    monkeypatch.setattr(rag_pipeline, "_chain", FakeChain(["ok"]))
+
+    pipeline = RagPipeline(store)
+    result = asyncio.run(pipeline.retrieve("what did I fix this month?", "u1", top_k=5))
+    body = collect(pipeline, result)
+    assert embeddings.calls == 1 and len(store.searches) == 1
+    vector, k, search_filter = store.searches[0]
+    assert k == 5 and search_filter["$and"][0] == {"user_id": {"$eq": "u1"}}
+    assert frames(body)[0][1]["sources"] == [{"document": "Fixed login", "metadata": {"user_id": "u1"}}]
+    assert set(result.timings) >= {"parse", "embed", "search"}
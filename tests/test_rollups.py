@@ -0,0 +1,96 @@
+"""Incremental rollup upserts agree with a rebuild from live and archived logs."""
+from datetime import date, datetime
+from uuid import uuid4
+
+from models.projects import Projects
+from models.rollups import ProjectDailyRollup, TaskDailyRollup, UserDailyRollup
+from models.task_logs import TaskLogs
+from models.tasks import Tasks
+from models.users import Users
+from services.rollup_service import RollupService, log_day
+from services.task_log_maintenance import TaskLogArchiver
+
+USER_ID = uuid4()
+
+
+def seed(db):
+    db.add_all([
+        Users(user_id=USER_ID, ace_user_id=1, email="ana@example.com"),
+        Projects(ace_project_id=10, project_name="Website"),
+        Tasks(ace_task_id=100, task_title="Login", ace_project_id=10),
+        Tasks(ace_task_id=101, task_title="Export", ace_project_id=10),
+    ])
+    db.flush()
+
+
+def stop(db, ace_task_id: int, start: datetime, seconds: float) -> TaskLogs:
+    log = TaskLogs(log_id=uuid4(), ace_task_id=ace_task_id, user_id=USER_ID, start_time=start,
+                   end_time=start.replace(hour=start.hour + 1), duration=seconds, status="done")
+    db.add(log)
+    RollupService(db).record_stop(log, 10)
+    return log
+
+
+def totals(db):
+    return {
+        "user": sorted((row.day, row.total_duration, row.log_count) for row in db.query(UserDailyRollup)),
+        "project": sorted((row.day, row.total_duration, row.log_count) for row in db.query(ProjectDailyRollup)),
+        "task": sorted((row.ace_task_id, row.day, row.total_duration, row.log_count) for row in db.query(TaskDailyRollup)),
+    }
+
+
+def test_records_accumulate_per_grain(session_factory):
+    db = session_factory()
+    seed(db)
+    stop(db, 100, datetime(2026, 10, 1, 9), 1800)
+    stop(db, 101, datetime(2026, 10, 1, 14), 600)
+    stop(db, 100, datetime(2026, 10, 2, 9), 300)
+    db.commit()
+    assert totals(db) == {
+        "user": [(date(2026, 10, 1), 2400.0, 2), (date(2026, 10, 2), 300.0, 1)],
+        "project": [(date(2026, 10, 1), 2400.0, 2), (date(2026, 10, 2), 300.0, 1)],
+        "task": [(100, date(2026, 10, 1), 1800.0, 1), (100, date(2026, 10, 2), 300.0, 1), (101, date(2026, 10, 1), 600.0, 1)],
+    }
+    db.close()
+
+
+def test_stopping_a_log_again_replaces_its_contribution(session_factory):
+    db = session_factory()
+    seed(db)
+    log = stop(db, 100, datetime(2026, 10, 1, 9), 1800)
+    previous = (log_day(log.start_time, log.end_time), log.duration)
+    log.duration = 2700
+    RollupService(db).record_stop(log, 10, previous=previous)
+    db.commit()
+    assert totals(db)["user"] == [(date(2026, 10, 1), 2700.0, 1)]
+    db.close()
+
+
+def test_rebuild_matches_incremental_totals_after_archival(session_factory):
+    db = session_factory()
+    seed(db)
+    stop(db, 100, datetime(2024, 1, 5, 9), 1800)
+    stop(db, 101, datetime(2026, 10, 1, 9), 600)
+    db.add(TaskLogs(log_id=uuid4(), ace_task_id=100, user_id=USER_ID, start_time=datetime(2026, 10, 3, 9)))  # open
+    db.commit()
+    incremental = totals(db)
+    TaskLogArchiver(db).archive(date(2025, 1, 1))
+
+    written = RollupService(db).rebuild()
+    db.commit()
+    assert totals(db) == incremental
+    assert written == {"rollup_user_daily": 2, "rollup_project_daily": 2, "rollup_task_daily": 2}
+    db.close()
+
+
+def test_rebuild_of_a_range_leaves_other_days_alone(session_factory):
+    db = session_factory()
+    seed(db)
+    stop(db, 100, datetime(2026, 10, 1, 9), 1800)
+    stop(db, 100, datetime(2026, 10, 2, 9), 300)
+    db.commit()
+    db.query(UserDailyRollup).update({"total_duration": 0.0})
+    RollupService(db).rebuild(start=date(2026, 10, 2), end=date(2026, 10, 2))
+    db.commit()
+    assert totals(db)["user"] == [(date(2026, 10, 1), 0.0, 1), (date(2026, 10, 2), 300.0, 1)]
+    db.close()
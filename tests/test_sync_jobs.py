@@ -0,0 +1,182 @@
+"""Sync jobs shared between app workers through the database; one worker per host runs them."""
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.sync_jobs as sync_jobs
+from connection.database import Base
+from models.sync_jobs import SyncJobRecord
+from services.sync_jobs import SyncJobManager
+
+
+class FakeCoordinator:
+    """Stands in for SyncCoordinator: reports one stage, honours cancellation, returns counts."""
+
+    calls = []
+
+    def __init__(self, db, progress, loop=None):
+        self.progress = progress
+
+    def run(self, guid, full_resync=False):
+        self.calls.append(guid)
+        self.progress.record("users", fetched=2, inserted=2)
+        self.progress.check_cancelled()
+        return {"users_count": 2, "finished_at": datetime(2026, 10, 18, 12)}
+
+
+@pytest.fixture(autouse=True)
+def fake_sync(monkeypatch):
+    monkeypatch.setattr(sync_jobs, "SYNC_SCHEDULES", "")
+    monkeypatch.setattr(sync_jobs, "SyncCoordinator", FakeCoordinator)
+    FakeCoordinator.calls = []
+
+
+@pytest.fixture
+def workers(session_factory, tmp_path):
+    """Two managers over one database, as two app workers on the same host would have."""
+    made = []
+
+    def make(**kwargs):
+        manager = SyncJobManager(workers=2, lock_path=str(tmp_path / "sync-jobs.lock"),
+                                 session_factory=session_factory, **kwargs)
+        made.append(manager)
+        return manager
+
+    yield make
+    for manager in made:
+        manager.shutdown()
+
+
+def scheduler_without_threads(manager: SyncJobManager) -> list:
+    """Make ``manager`` the scheduler worker but run dispatched jobs only when the test says so."""
+    manager.is_scheduler = True
+    dispatched = []
+    manager._execute = dispatched.append
+    return dispatched
+
+
+def test_only_one_worker_on_the_host_takes_the_scheduler_role(workers):
+    first, second = workers(poll_seconds=3600), workers(poll_seconds=3600)
+    assert first.start() is True and first.scheduler.running
+    assert second.start() is False and not second.scheduler.running
+    assert second.set_maintenance("task-log-maintenance", print, 60) is False
+    first.shutdown()
+    # the role is free again once the scheduler worker is gone
+    third = workers(poll_seconds=3600)
+    assert third.start() is True
+
+
+def test_any_worker_submits_reads_and_the_scheduler_runs(workers):
+    api, scheduler = workers(), workers()
+    dispatched = scheduler_without_threads(scheduler)
+
+    job = api.submit("guid-1")
+    assert api.submit("guid-1").job_id == job.job_id  # one active job per guid
+    assert scheduler.get(job.job_id).status == "queued"
+
+    assert scheduler.dispatch() == 1
+    assert api.get(job.job_id).status == "running"
+    scheduler._run(dispatched[0])
+
+    done = api.get(job.job_id).to_dict()
+    assert done["status"] == "succeeded"
+    assert done["stages"]["users"]["inserted"] == 2
+    assert done["result"] == {"users_count": 2, "finished_at": "2026-10-18 12:00:00"}
+    assert [listed.job_id for listed in api.list_jobs("guid-1")] == [job.job_id]
+
+
+def test_cancel_from_another_worker(workers):
+    api, scheduler = workers(), workers()
+    dispatched = scheduler_without_threads(scheduler)
+
+    queued = api.submit("guid-1")
+    assert api.cancel(queued.job_id).status == "cancelled"
+    assert scheduler.dispatch() == 0
+
+    running = api.submit("guid-2")
+    scheduler.dispatch()
+    api.cancel(running.job_id)
+    scheduler.dispatch()  # forwards the request to the job it runs
+    scheduler._run(dispatched[0])
+    assert api.get(running.job_id).status == "cancelled"
+    assert api.cancel("missing") is None
+
+
+def test_one_job_per_guid_runs_at_a_time_and_the_pool_is_bounded(workers, session_factory):
+    scheduler = workers()
+    dispatched = scheduler_without_threads(scheduler)
+    # two workers queued the same guid at the same moment
+    db = session_factory()
+    for job_id in ("a", "b"):
+        db.add(SyncJobRecord(job_id=job_id, guid="guid-1", status="queued", trigger="manual",
+                             full_resync=False, stream=False, cancel_requested=False))
+    db.commit()
+    db.close()
+    scheduler.submit("guid-2")
+    scheduler.submit("guid-3")
+
+    assert scheduler.dispatch() == 2  # workers=2
+    assert sorted(job.guid for job in dispatched) == ["guid-1", "guid-2"]
+    scheduler._run(dispatched[0])
+    scheduler._run(dispatched[1])
+    assert scheduler.dispatch() == 2
+    assert sorted(job.guid for job in dispatched[2:]) == ["guid-1", "guid-3"]
+
+
+def test_jobs_of_a_dead_worker_are_failed(workers, session_factory):
+    scheduler = workers()
+    scheduler_without_threads(scheduler)
+    db = session_factory()
+    db.add(SyncJobRecord(job_id="orphan", guid="guid-1", status="running", trigger="manual",
+                         full_resync=False, stream=False, cancel_requested=False,
+                         updated_at=datetime.utcnow() - timedelta(seconds=sync_jobs.SYNC_JOB_STALE_SECONDS + 1)))
+    db.commit()
+    db.close()
+    scheduler.dispatch()
+    assert scheduler.get("orphan").status == "failed"
+
+
+def test_batches_and_schedules_are_visible_to_every_worker(workers):
+    api, other = workers(), workers()
+    batch = api.submit_many(["guid-1", "guid-2", "guid-1"])
+    assert [job.guid for job in other.get_batch(batch.batch_id).jobs] == ["guid-1", "guid-2"]
+    assert other.get_batch(batch.batch_id).status == "running"
+
+    api.set_schedule("guid-1", 30, stream=True)
+    assert other.get_schedule("guid-1")["interval_minutes"] == 30
+    assert [schedule["guid"] for schedule in other.list_schedules()] == ["guid-1"]
+    assert other.remove_schedule("guid-1") and api.get_schedule("guid-1") is None
+
+
+def test_scheduler_worker_applies_saved_schedules(workers):
+    api, scheduler = workers(), workers(poll_seconds=3600)
+    api.set_schedule("guid-1", 15)
+    scheduler.start()
+    scheduler.dispatch()
+    job = scheduler.scheduler.get_job("sync-schedule:guid-1")
+    assert job.trigger.interval == timedelta(minutes=15)
+    assert api.get_schedule("guid-1")["next_run_time"] is not None
+    api.remove_schedule("guid-1")
+    scheduler.dispatch()
+    assert scheduler.scheduler.get_job("sync-schedule:guid-1") is None
+
+
+def test_submitted_job_runs_on_the_scheduler_threads(tmp_path):
+    # a file database: the scheduler's threads each get their own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    Base.metadata.create_all(engine)
+    manager = SyncJobManager(workers=1, lock_path=str(tmp_path / "sync-jobs.lock"),
+                             session_factory=sessionmaker(bind=engine), poll_seconds=3600)
+    try:
+        assert manager.start()
+        job = manager.submit("guid-1")  # wakes the dispatcher instead of waiting for the poll
+        deadline = time.monotonic() + 10
+        while manager.get(job.job_id).status != "succeeded" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert manager.get(job.job_id).status == "succeeded"
+    finally:
+        manager.shutdown()
+        engine.dispose()
@@ -0,0 +1,144 @@
+"""Streamed ACE payloads: the status check in iter_ace_results and run_streaming's chunked stages."""
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import services.sync_service as sync_service
+from models.sync_state import SyncState
+from models.task_assignees import TasksAssignees
+from models.tasks import Tasks
+from services.data_service import iter_ace_results
+from services.sync_service import SyncCoordinator
+from utils.json_stream import JsonArrayStream, chunked
+
+
+class FakeStream:
+    """Stands in for a streamed ``requests.Response``; serves the body a few bytes at a time."""
+
+    def __init__(self, body: str, chunk: int = 7):
+        self.body = body.encode("utf-8")
+        self.chunk = chunk
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for start in range(0, len(self.body), self.chunk):
+            yield self.body[start:start + self.chunk]
+
+    def close(self):
+        self.closed = True
+
+
+RECORDS = [{"USER_ID": 1}, {"USER_ID": 2}]
+
+
+def test_status_before_results_is_checked_before_anything_is_yielded():
+    response = FakeStream('{"status": "error", "results": ' + json.dumps(RECORDS) + '}')
+    assert list(iter_ace_results("getusers", response)) == []
+    assert response.closed
+
+
+def test_ok_status_after_results_yields_every_record():
+    response = FakeStream('{"results": ' + json.dumps(RECORDS) + ', "status": "ok"}')
+    assert list(iter_ace_results("getusers", response)) == RECORDS
+
+
+def test_late_error_status_fails_the_stage():
+    # ACE is expected to send status first; if it ever does not, the stage must not report success
+    response = FakeStream('{"results": ' + json.dumps(RECORDS) + ', "status": "error"}')
+    seen = []
+    with pytest.raises(HTTPException) as error:
+        for item in iter_ace_results("getusers", response):
+            seen.append(item)
+    assert seen == RECORDS
+    assert "'error'" in error.value.detail
+    assert response.closed
+
+
+def test_getprojects_ignores_status():
+    response = FakeStream('{"results": ' + json.dumps(RECORDS) + ', "status": "error"}')
+    assert list(iter_ace_results("getprojects", response)) == RECORDS
+
+
+def test_json_array_stream_keeps_other_members_and_splits_numbers_across_chunks():
+    stream = JsonArrayStream(FakeStream('{"a": 1, "results": [12345678, {"b": "é"}], "z": [1]}', chunk=3).iter_content())
+    assert list(stream) == [12345678, {"b": "é"}]
+    assert stream.fields == {"a": 1, "z": [1]}
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+# -------- run_streaming --------
+USERS = [{"USER_ID": n, "EMAIL_ALERT": f"user{n}@example.com"} for n in (1, 2)]
+PROJECTS = [{"PROJECT_ID": "10", "PROJECT_NAME": "Website", "DATE_MODIFIED": "2026-01-02 10:00:00"}]
+TASKS = [
+    {"TASK_ID": str(100 + n), "PROJECT_ID": "10", "TASK_RESUME": f"Task {n}", "ASSIGNED_ID": "1",
+     "DATE_TASK_MODIFIED": f"2026-01-0{n + 1} 10:00:00"}
+    for n in range(3)
+]
+
+
+def serve(monkeypatch, payloads):
+    opened = []
+
+    def open_ace_stream(fct, guid):
+        opened.append(fct)
+        return FakeStream(payloads[fct])
+
+    monkeypatch.setattr(sync_service, "open_ace_stream", open_ace_stream)
+    return opened
+
+
+def ok(records) -> str:
+    return json.dumps({"status": "ok", "results": records})
+
+
+def test_run_streaming_persists_every_stage_in_chunks(monkeypatch, session_factory):
+    opened = serve(monkeypatch, {"getusers": ok(USERS), "getprojects": ok(PROJECTS), "gettasks": ok(TASKS)})
+    db = session_factory()
+    counts = SyncCoordinator(db).run_streaming("guid-1", chunk_size=2)
+    assert opened == ["getusers", "getprojects", "gettasks"]
+    assert counts["users_count"] == 2 and counts["tasks_count"] == 3 and counts["assignees_inserted"] == 3
+    assert db.query(Tasks).count() == 3
+    assert db.query(SyncState).filter_by(guid="guid-1", entity="tasks").one().watermark is not None
+    db.close()
+
+
+def reassigned_first_task():
+    # same modification date, so the watermark filter skips the task itself
+    return [{**TASKS[0], "ASSIGNED_ID": "1,2"}, *TASKS[1:]]
+
+
+def test_run_streaming_stores_new_assignees_of_unchanged_tasks(monkeypatch, session_factory):
+    serve(monkeypatch, {"getusers": ok(USERS), "getprojects": ok(PROJECTS), "gettasks": ok(TASKS)})
+    db = session_factory()
+    SyncCoordinator(db).run_streaming("guid-1", chunk_size=2)
+
+    serve(monkeypatch, {"getusers": ok(USERS), "getprojects": ok(PROJECTS), "gettasks": ok(reassigned_first_task())})
+    counts = SyncCoordinator(db).run_streaming("guid-1", chunk_size=2)
+    assert counts["tasks_changed"] == 1
+    assert counts["assignees_inserted"] == 1
+    assert db.query(TasksAssignees).filter_by(ace_task_id=100, ace_user_id=2).count() == 1
+    db.close()
+
+
+def test_persist_stores_new_assignees_of_unchanged_tasks(session_factory):
+    db = session_factory()
+    snapshot = {"users": USERS, "projects": PROJECTS, "tasks": TASKS}
+    SyncCoordinator(db).persist("guid-1", snapshot)
+
+    result = SyncCoordinator(db).persist("guid-1", {**snapshot, "tasks": reassigned_first_task()})
+    assert result["tasks_changed"] == 1
+    assert result["assignees_inserted"] == 1
+    assert db.query(TasksAssignees).filter_by(ace_task_id=100, ace_user_id=2).count() == 1
+    db.close()
+
+
+def test_late_error_status_does_not_advance_the_watermark(monkeypatch, session_factory):
+    late_error = '{"results": ' + json.dumps(TASKS) + ', "status": "error"}'
+    serve(monkeypatch, {"getusers": ok(USERS), "getprojects": ok(PROJECTS), "gettasks": late_error})
+    db = session_factory()
+    with pytest.raises(HTTPException):
+        SyncCoordinator(db).run_streaming("guid-1", chunk_size=2)
+    db.rollback()
+    assert db.query(SyncState).filter_by(guid="guid-1", entity="tasks").first() is None
+    db.close()
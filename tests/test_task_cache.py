@@ -0,0 +1,79 @@
+"""Assigned-task cache: per-user page bounds and falling back to the loader when Redis fails."""
+import redis
+
+from services.task_cache import AssignedTaskCache, MemoryBackend, RedisBackend
+
+
+class StalledBackend:
+    name = "redis"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, user_id, key):
+        self.calls += 1
+        raise redis.TimeoutError("Timeout reading from socket")
+
+    def set(self, user_id, key, value):
+        self.calls += 1
+        raise redis.TimeoutError("Timeout writing to socket")
+
+    def invalidate(self, user_ids):
+        self.calls += 1
+        raise redis.ConnectionError("Connection refused")
+
+    def size(self):
+        return None
+
+
+def test_memory_backend_bounds_pages_per_user():
+    backend = MemoryBackend(max_users=10, ttl=60, max_pages=3)
+    for page in range(5):
+        backend.set(1, f"page-{page}", [page])
+    backend.get(1, "page-2")  # recently read pages stay
+    backend.set(1, "page-5", [5])
+    assert backend.size() == 3
+    assert backend.get(1, "page-0") is None and backend.get(1, "page-3") is None
+    assert backend.get(1, "page-2") == [2] and backend.get(1, "page-5") == [5]
+    backend.invalidate([1])
+    assert backend.size() == 0
+
+
+def test_redis_backend_sets_socket_timeouts(monkeypatch):
+    seen = {}
+
+    def from_url(url, **kwargs):
+        seen.update(kwargs, url=url)
+        return object()
+
+    monkeypatch.setattr(redis.Redis, "from_url", from_url)
+    RedisBackend("redis://cache:6379/0", timeout=0.5)
+    assert seen == {"url": "redis://cache:6379/0", "socket_timeout": 0.5, "socket_connect_timeout": 0.5}
+
+
+def test_redis_errors_fall_back_to_the_loader_and_skip_the_backend():
+    backend = StalledBackend()
+    cache = AssignedTaskCache(backend, retry_seconds=60)
+    assert cache.get_or_load(1, 1, (100, None), lambda: ["from db"]) == ["from db"]
+    assert backend.calls == 1  # no write after a failed read
+    assert cache.get_or_load(1, 1, (100, None), lambda: ["from db"]) == ["from db"]
+    cache.invalidate([1])
+    assert backend.calls == 2
+    stats = cache.stats()
+    assert (stats["errors"], stats["bypassed"]) == (2, 1)
+
+
+def test_backend_is_retried_after_the_skip_window():
+    backend = StalledBackend()
+    cache = AssignedTaskCache(backend, retry_seconds=0)
+    cache.get_or_load(1, 1, (), list)
+    cache.get_or_load(1, 1, (), list)
+    assert backend.calls == 2 and cache.bypassed == 0
+
+
+def test_pages_are_keyed_on_version():
+    cache = AssignedTaskCache(MemoryBackend(max_users=10, ttl=60))
+    assert cache.get_or_load(1, 1, (100, None), lambda: ["v1"]) == ["v1"]
+    assert cache.get_or_load(1, 1, (100, None), lambda: ["unused"]) == ["v1"]
+    assert cache.get_or_load(1, 2, (100, None), lambda: ["v2"]) == ["v2"]
+    assert (cache.hits, cache.misses) == (1, 2)
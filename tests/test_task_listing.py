@@ -0,0 +1,95 @@
+"""Keyset pages, cursors and conditional-GET ETags for the assigned-task listing."""
+import pytest
+from fastapi import HTTPException
+
+from models.projects import Projects
+from models.task_assignees import TasksAssignees
+from models.tasks import Tasks
+from models.users import Users
+from services.task_service import TaskService
+from services.task_versions import TaskVersionService
+from utils.etag import etag_matches, make_etag
+from utils.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    session.add_all([
+        Users(ace_user_id=1, email="lead@example.com"),
+        Users(ace_user_id=2, email="dev@example.com"),
+        Projects(ace_project_id=10, project_name="Website", supervisor_id=1),
+        Projects(ace_project_id=20, project_name="Mobile", supervisor_id=None),
+    ])
+    for task_id in range(100, 107):
+        session.add(Tasks(ace_task_id=task_id, ace_project_id=10 if task_id % 2 else 20,
+                          task_title=f"Task {task_id}", status="done" if task_id == 103 else "open"))
+        session.add(TasksAssignees(ace_task_id=task_id, ace_user_id=2))
+    session.add(TasksAssignees(ace_task_id=100, ace_user_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+def walk(service, **filters):
+    pages, cursor = [], None
+    while True:
+        items, cursor = service.fetch_assigned_tasks(2, limit=3, cursor=cursor, **filters)
+        pages.append([item["task_id"] for item in items])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_every_task_once(db):
+    assert walk(TaskService(db)) == [[100, 101, 102], [103, 104, 105], [106]]
+
+
+def test_filters_apply_to_every_page(db):
+    assert walk(TaskService(db), project_id=10) == [[101, 103, 105]]
+    assert walk(TaskService(db), task_status="open", project_id=20) == [[100, 102, 104], [106]]
+
+
+def test_last_full_page_has_no_next_cursor(db):
+    items, cursor = TaskService(db).fetch_assigned_tasks(1, limit=1)
+    assert [item["supervisor_name"] for item in items] == [None] and cursor is None
+
+
+def test_rows_inserted_before_the_cursor_do_not_shift_later_pages(db):
+    service = TaskService(db)
+    first, cursor = service.fetch_assigned_tasks(2, limit=3)
+    db.add(TasksAssignees(ace_task_id=99, ace_user_id=2))
+    db.add(Tasks(ace_task_id=99, ace_project_id=10, task_title="Task 99", status="open"))
+    db.commit()
+    second, _ = service.fetch_assigned_tasks(2, limit=3, cursor=cursor)
+    assert [item["task_id"] for item in second] == [103, 104, 105]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor({"task_id": "100"}), "WzEsMl0"])
+def test_malformed_cursors_are_rejected(db, cursor):
+    with pytest.raises(HTTPException) as error:
+        TaskService(db).fetch_assigned_tasks(2, cursor=cursor)
+    assert error.value.status_code == 400
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor({"task_id": 105})) == {"task_id": 105}
+
+
+def test_etag_changes_when_the_users_version_is_bumped(db):
+    versions = TaskVersionService(db)
+    before = make_etag(2, versions.get(2), 100, None, None, None)
+    versions.bump_tasks([103])
+    db.commit()
+    after = make_etag(2, versions.get(2), 100, None, None, None)
+    assert before != after
+    # user 1 is not assigned task 103, so their listing keeps its ETag
+    assert versions.get(1) == 0
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag(2, 5, 100)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(make_etag(2, 6, 100), etag)
@@ -0,0 +1,90 @@
+"""Monthly partition upkeep (statement generation) and archival of task_logs."""
+from datetime import date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from models.task_logs import TaskLogs
+from models.task_logs_archive import TaskLogArchive
+from services.task_log_maintenance import TaskLogArchiver, TaskLogPartitions
+
+
+class Scalars(list):
+    def all(self):
+        return list(self)
+
+
+class RecordingSession:
+    """Just enough of a Session for TaskLogPartitions: records statements, serves partition names."""
+
+    def __init__(self, dialect: str, names):
+        self.dialect = dialect
+        self.names = names
+        self.statements = []
+        self.commits = 0
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name=self.dialect))
+
+    def execute(self, statement):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "PARTITION_NAME" in sql or "pg_inherits" in sql:
+            return SimpleNamespace(scalars=lambda: Scalars(self.names))
+        return SimpleNamespace(first=lambda: None)  # every partition is empty
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_mysql_partitions_are_added_ahead_by_reorganizing_pmax():
+    db = RecordingSession("mysql", ["p202609", "pmax", "p202610"])
+    created = TaskLogPartitions(db).ensure_ahead(months_ahead=2, today=date(2026, 10, 18))
+    assert created == ["p202611", "p202612"]
+    assert db.statements[-1] == (
+        "ALTER TABLE task_logs REORGANIZE PARTITION pmax INTO ("
+        "PARTITION p202611 VALUES LESS THAN ('2026-12-01'), "
+        "PARTITION p202612 VALUES LESS THAN ('2027-01-01'), "
+        "PARTITION pmax VALUES LESS THAN MAXVALUE)"
+    )
+
+
+def test_postgres_partition_moves_rows_out_of_the_default_before_attaching():
+    db = RecordingSession("postgresql", ["task_logs_p202610", "task_logs_default"])
+    assert TaskLogPartitions(db).ensure_ahead(months_ahead=1, today=date(2026, 10, 18)) == ["p202611"]
+    create, move, attach = db.statements[-3:]
+    assert create.startswith("CREATE TABLE task_logs_p202611 (LIKE task_logs")
+    assert "DELETE FROM task_logs_default WHERE start_time >= '2026-11-01' AND start_time < '2026-12-01'" in move
+    assert attach == "ALTER TABLE task_logs ATTACH PARTITION task_logs_p202611 FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')"
+
+
+def test_only_empty_partitions_before_the_cutoff_are_dropped():
+    db = RecordingSession("postgresql", ["task_logs_p202401", "task_logs_p202402", "task_logs_p202612"])
+    assert TaskLogPartitions(db).drop_empty_before(date(2024, 3, 1)) == ["p202401", "p202402"]
+    assert "DROP TABLE task_logs_p202612" not in db.statements
+
+
+def test_partition_upkeep_is_a_no_op_on_sqlite(session_factory):
+    db = session_factory()
+    partitions = TaskLogPartitions(db)
+    assert not partitions.supported
+    assert partitions.ensure_ahead(today=date(2026, 10, 18)) == []
+    assert partitions.drop_empty_before(date(2026, 1, 1)) == []
+    db.close()
+
+
+def test_archived_rows_keep_their_values_across_batches(session_factory):
+    db = session_factory()
+    logs = [
+        TaskLogs(log_id=uuid4(), start_time=datetime(2024, 1, day, 9), end_time=datetime(2024, 1, day, 10),
+                 duration=3600.0, comment=f"day {day}", status="done")
+        for day in range(1, 6)
+    ]
+    db.add_all(logs)
+    db.commit()
+    expected = {log.log_id: log.comment for log in logs}
+    assert TaskLogArchiver(db, batch_size=2).archive(date(2024, 2, 1)) == 5
+    archived = {row.log_id: row for row in db.query(TaskLogArchive)}
+    assert db.query(TaskLogs).count() == 0
+    assert {log_id: row.comment for log_id, row in archived.items()} == expected
+    assert all(row.archived_at is not None and row.duration == 3600.0 for row in archived.values())
+    db.close()
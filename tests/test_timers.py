@@ -0,0 +1,170 @@
+"""Open-timer bookkeeping in /tasks/start, /tasks/stop and the batch endpoint."""
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from connection.database import Base
+from dto.task import TaskBatchRequest, TaskStartRequest, TaskStopRequest
+from models.open_timers import OpenTimer
+from models.projects import Projects
+from models.task_logs import TaskLogs
+from models.tasks import Tasks
+from models.users import Users
+from services.task_service import OPEN_TIMER_LOOKBACK_DAYS, TaskService
+from services.timer_batch_service import TimerBatchService
+
+USER_ID = uuid4()
+
+
+def seed(db):
+    db.add_all([
+        Users(user_id=USER_ID, ace_user_id=1, email="ana@example.com", role="user"),
+        Projects(ace_project_id=10, project_name="Website"),
+    ])
+    db.flush()
+    db.add_all([Tasks(ace_task_id=100, task_title="Login", ace_project_id=10),
+                Tasks(ace_task_id=101, task_title="Export", ace_project_id=10)])
+
+
+def open_timers(db) -> dict:
+    return {(row.ace_task_id, row.user_id): row.log_id for row in db.execute(select(OpenTimer)).scalars()}
+
+
+# -------- /tasks/start and /tasks/stop --------
+@pytest.fixture
+def async_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'timers.db'}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as db:
+            await db.run_sync(seed)
+            await db.commit()
+
+    asyncio.run(setup())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def run(factory, action):
+    async def go():
+        async with factory() as db:
+            return await action(db)
+
+    return asyncio.run(go())
+
+
+def test_start_reuses_the_open_timer_and_stop_clears_it(async_factory):
+    start = TaskStartRequest(user_id=USER_ID, ace_task_id=100)
+    first = run(async_factory, lambda db: TaskService(db).start_task(start))
+    again = run(async_factory, lambda db: TaskService(db).start_task(start))
+    assert again.log_id == first.log_id
+
+    stop = TaskStopRequest(log_id=first.log_id, status="done", duration=60.0)
+    run(async_factory, lambda db: TaskService(db).stop_task(stop))
+    assert run(async_factory, lambda db: db.run_sync(open_timers)) == {}
+
+    restarted = run(async_factory, lambda db: TaskService(db).start_task(start))
+    assert restarted.log_id != first.log_id
+
+
+def test_start_finds_a_timer_older_than_the_lookback_window(async_factory):
+    started = datetime.utcnow() - timedelta(days=OPEN_TIMER_LOOKBACK_DAYS * 3)
+    log_id = uuid4()
+
+    async def old_timer(db):
+        db.add(TaskLogs(log_id=log_id, ace_task_id=100, user_id=USER_ID, start_time=started))
+        db.add(OpenTimer(ace_task_id=100, user_id=USER_ID, log_id=log_id, start_time=started))
+        await db.commit()
+
+    run(async_factory, old_timer)
+    start = TaskStartRequest(user_id=USER_ID, ace_task_id=100)
+    assert run(async_factory, lambda db: TaskService(db).start_task(start)).log_id == log_id
+
+
+def test_dangling_open_timer_row_is_replaced(async_factory):
+    async def dangling(db):
+        db.add(OpenTimer(ace_task_id=100, user_id=USER_ID, log_id=uuid4(), start_time=datetime(2025, 1, 1)))
+        await db.commit()
+
+    run(async_factory, dangling)
+    start = TaskStartRequest(user_id=USER_ID, ace_task_id=100)
+    log = run(async_factory, lambda db: TaskService(db).start_task(start))
+    assert run(async_factory, lambda db: db.run_sync(open_timers)) == {(100, USER_ID): log.log_id}
+
+
+# -------- Batch endpoint --------
+def apply(session_factory, *events):
+    db = session_factory()
+    try:
+        response = TimerBatchService(db).apply(TaskBatchRequest(events=list(events)))
+        db.commit()
+        return response
+    finally:
+        db.close()
+
+
+def test_batch_keeps_open_timers_in_step(session_factory):
+    db = session_factory()
+    seed(db)
+    db.commit()
+    db.close()
+
+    first = apply(session_factory, {"type": "start", "user_id": USER_ID, "ace_task_id": 100})
+    log_id = first.results[0].log_id
+    db = session_factory()
+    assert open_timers(db) == {(100, USER_ID): log_id}
+    db.close()
+
+    # a start for a running pair resumes it; stopping it and starting another task swaps the rows
+    second = apply(
+        session_factory,
+        {"type": "start", "user_id": USER_ID, "ace_task_id": 100},
+        {"type": "stop", "log_id": log_id, "status": "done", "duration": 30.0},
+        {"type": "start", "user_id": USER_ID, "ace_task_id": 101},
+    )
+    assert [result.outcome for result in second.results] == ["resumed", "stopped", "started"]
+    db = session_factory()
+    assert open_timers(db) == {(101, USER_ID): second.results[2].log_id}
+    assert db.scalar(select(func.count()).select_from(TaskLogs).where(TaskLogs.end_time.is_(None))) == 1
+    db.close()
+
+
+def test_batch_stop_without_start_clears_the_open_timer(session_factory):
+    db = session_factory()
+    seed(db)
+    db.commit()
+    db.close()
+    log_id = apply(session_factory, {"type": "start", "user_id": USER_ID, "ace_task_id": 100}).results[0].log_id
+
+    apply(session_factory, {"type": "stop", "log_id": log_id, "status": "done", "duration": 5.0})
+    db = session_factory()
+    assert open_timers(db) == {}
+    db.close()
+
+
+def test_batch_reports_a_start_that_lost_a_race_as_a_conflict(session_factory, monkeypatch):
+    db = session_factory()
+    seed(db)
+    db.commit()
+    db.close()
+    winner = apply(session_factory, {"type": "start", "user_id": USER_ID, "ace_task_id": 100}).results[0].log_id
+
+    # the concurrent start commits after the batch has looked for open timers
+    monkeypatch.setattr(TimerBatchService, "_load_open_timers", lambda self, pairs: None)
+    response = apply(
+        session_factory,
+        {"type": "start", "user_id": USER_ID, "ace_task_id": 100},
+        {"type": "start", "user_id": USER_ID, "ace_task_id": 101},
+    )
+    assert [result.outcome for result in response.results] == ["conflict", "started"]
+    db = session_factory()
+    assert open_timers(db) == {(100, USER_ID): winner, (101, USER_ID): response.results[1].log_id}
+    assert db.get(TaskLogs, (response.results[0].log_id, response.results[0].start_time)) is None
+    assert db.scalar(select(func.count()).select_from(TaskLogs)) == 2
+    db.close()
@@ -0,0 +1,117 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStream:
+    """Incrementally parse ``{"...": ..., "<key>": [item, item, ...]}`` payloads.
+
+    Iterating yields the elements of the array under ``key`` one at a time
+    while only the current element is held in memory. Other top-level
+    members (e.g. ACE's ``status``) are collected into ``fields`` as they
+    are read, so members that precede the array are available before the
+    first element is yielded.
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]], key: str = "results"):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._exhausted = False
+
+    # -------- Buffer handling --------
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the source is exhausted."""
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            if chunk:
+                self._buf = self._buf[self._pos:] + chunk
+                self._pos = 0
+                return True
+        tail = self._decoder.decode(b"", final=True)
+        self._buf = self._buf[self._pos:] + tail
+        self._pos = 0
+        self._exhausted = True
+        return bool(tail)
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self._pos} of JSON stream")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and not self._exhausted:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    # -------- Parsing --------
+    def __iter__(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            name = self._value()
+            self._expect(":")
+            if name == self.key and self._peek() == "[":
+                self._pos += 1
+                yield from self._items()
+            else:
+                self.fields[name] = self._value()
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def _items(self) -> Iterator[Any]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("]")
+            return
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,20 @@
+import base64
+import json
+from fastapi import HTTPException, status
+
+
+def encode_cursor(position: dict) -> str:
+    """Opaque keyset cursor: url-safe base64 of the last row's sort key."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (ValueError, TypeError):
+        position = None
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return position
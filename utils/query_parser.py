@@ -1,20 +1,21 @@
 import os
 import json
 import re
-from datetime import datetime
+import calendar
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
-from dependencies.gemini_dependency import llm #FIXME: this is not a dependency, move it to the connection folder
+from dependencies.gemini_dependency import get_llm #FIXME: this is not a dependency, move it to the connection folder
+from services.project_index import get_project_index
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import ChatPromptTemplate
-import google.generativeai as genai
 load_dotenv()
+# questions the local parser is less sure about than this go to the LLM
+QUERY_PARSER_MIN_CONFIDENCE = float(os.getenv('QUERY_PARSER_MIN_CONFIDENCE', '0.75'))
+QUERY_PARSER_LLM_FALLBACK = os.getenv('QUERY_PARSER_LLM_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-today = datetime.now().date()
-template = ChatPromptTemplate([
-    ("system", "You are a query parser. \
+SYSTEM_PROMPT = "You are a query parser. \
                 Convert the user question into a structured JSON object with these keys: \
                 - project_name:if project Name is mentioned     \
                 - start_date: (ISO format, if relative like \"last 6 months\")\
@@ -22,15 +23,234 @@ template = ChatPromptTemplate([
                 - keywords: (list of relevant keywords) Output ONLY valid JSON \
                 - do NOT include any explanations or extra text.\
                 - Date today for your context is {today}\
-    "),
-                 
-    ("human", "{question}")
-])
+    "
 
-def parse_user_query(question: str) -> dict:
-    prompt = template.invoke({"question": question,"today":str(today)})
-    response = llm.invoke(prompt)
-    if hasattr(response, "content"):  
+_template = None
+
+def get_template():
+    # langchain is imported on the first parsed question rather than at startup
+    global _template
+    if _template is None:
+        from langchain.prompts import ChatPromptTemplate
+
+        _template = ChatPromptTemplate([
+            ("system", SYSTEM_PROMPT),
+            ("human", "{question}")
+        ])
+    return _template
+
+
+# -------- Local parser --------
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+MONTHS["sept"] = 9
+# full names only: "sun", "wed" and "sat" are ordinary words
+WEEKDAYS = {name.lower(): number for number, name in enumerate(calendar.day_name)}
+NUMBERS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+UNITS = r"(day|week|month|quarter|year)s?"
+MONTH_NAMES = "|".join(sorted(MONTHS, key=len, reverse=True))
+_MONTH = rf"({MONTH_NAMES})\.?"
+_YEAR = r"((?:19|20)\d{2})"
+_ISO = r"(\d{4}-\d{2}-\d{2})"
+_COUNT = r"(\d{1,3}|" + "|".join(NUMBERS) + r")"
+_WEEKDAY = "(" + "|".join(WEEKDAYS) + ")"
+
+# words that mean the question is about a time range, resolved or not
+TEMPORAL_CUES = re.compile(
+    r"\b(today|yesterday|tomorrow|tonight|day|days|week|weeks|weekend|month|months|quarter|quarters|year|years|"
+    r"ago|since|until|till|before|after|recent|recently|lately|ytd|q[1-4]|(?:19|20)\d{2}|"
+    + "|".join(WEEKDAYS) + "|"
+    # "may" is left out: "may I see ..." is far more common than the month on its own
+    + MONTH_NAMES.replace("|may", "").replace("may|", "") + r")\b"
+)
+PROJECT_CUES = re.compile(r"\bprojects?\b|\"[^\"]+\"|'[^']+'")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be been before being between both but by can could
+did do does doing done during each few for from get got had has have having he her here hers him his how i if in
+into is it its just me mine more most my no nor not now of off on once only or other our ours out over own same
+she should so some such than that the their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours
+anything everything something give list show tell find see may many much summarize summarise summary
+task tasks project projects work worked working log logs logged time spent spend
+last past previous this next ago since today yesterday day days week weeks month months year years quarter quarters
+""".split())
+
+
+def _shift_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(month_index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _quarter_start(day: date) -> date:
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+
+
+def _latest_month(month: int, today: date) -> int:
+    """Year of the most recent ``month`` that has started: "in March" during January means last March."""
+    return today.year if month <= today.month else today.year - 1
+
+
+def _count(text: str) -> int:
+    return NUMBERS[text] if text in NUMBERS else int(text)
+
+
+def _back(today: date, count: int, unit: str) -> date:
+    if unit == "day":
+        return today - timedelta(days=count)
+    if unit == "week":
+        return today - timedelta(weeks=count)
+    return _shift_months(today, -count * {"month": 1, "quarter": 3, "year": 12}[unit])
+
+
+def _calendar_period(today: date, which: str, unit: str) -> Tuple[date, date]:
+    """this/last day, week (Monday-based), month, quarter or year."""
+    if unit == "day":
+        day = today if which == "this" else today - timedelta(days=1)
+        return day, day
+    if unit == "week":
+        start = today - timedelta(days=today.weekday())
+        return (start, today) if which == "this" else (start - timedelta(weeks=1), start - timedelta(days=1))
+    if unit == "month":
+        start = today.replace(day=1)
+    elif unit == "quarter":
+        start = _quarter_start(today)
+    else:
+        start = date(today.year, 1, 1)
+    if which == "this":
+        return start, today
+    previous = _shift_months(start, -{"month": 1, "quarter": 3, "year": 12}[unit])
+    return previous, start - timedelta(days=1)
+
+
+def _month_or_date(text: str, today: date, year: Optional[str] = None) -> Tuple[date, date]:
+    if re.fullmatch(_ISO, text):
+        day = date.fromisoformat(text)
+        return day, day
+    month = MONTHS[text.rstrip(".")]
+    return _month_range(int(year) if year else _latest_month(month, today), month)
+
+
+def _between(first: str, last: str, today: date, year: Optional[str]) -> Tuple[date, date]:
+    start = _month_or_date(first, today, year)[0]
+    if re.fullmatch(_ISO, last) or year:
+        return start, _month_or_date(last, today, year)[1]
+    # "between november and february" runs into the following year
+    month = MONTHS[last.rstrip(".")]
+    return start, _month_range(start.year if month >= start.month else start.year + 1, month)[1]
+
+
+def _weekday(today: date, weekday: str, before_today: bool) -> Tuple[date, date]:
+    """Most recent ``weekday``: "on monday" includes today, "last monday" does not."""
+    days = (today.weekday() - WEEKDAYS[weekday]) % 7
+    day = today - timedelta(days=days or (7 if before_today else 0))
+    return day, day
+
+
+def _ago(today: date, count: int, unit: str) -> Tuple[date, date]:
+    day = _back(today, count, unit)
+    # "3 days ago" is that day; "2 weeks ago" reads as "since then"
+    return (day, day) if unit == "day" else (day, today)
+
+
+def _rules(today: date):
+    """(pattern, resolver) pairs tried in order; a resolver returns (start, end) from the match."""
+    return [
+        # from 2025-01-01 to 2025-02-01 / between march and may 2024
+        (rf"\b(?:from|between)\s+(?:{_ISO}|{_MONTH})\s+(?:to|and|until|till|-)\s+(?:{_ISO}|{_MONTH})(?:\s+{_YEAR})?\b",
+         lambda m: _between(m[1] or m[2], m[3] or m[4], today, m[5])),
+        (rf"\bsince\s+{_ISO}", lambda m: (date.fromisoformat(m[1]), today)),
+        (rf"\bsince\s+{_MONTH}(?:\s+{_YEAR})?\b",
+         lambda m: (_month_or_date(m[1], today, m[2])[0], today)),
+        (rf"\bsince\s+{_YEAR}\b", lambda m: (date(int(m[1]), 1, 1), today)),
+        (rf"\b(?:on\s+)?{_ISO}\b", lambda m: _month_or_date(m[1], today)),
+        (r"\btoday\b", lambda m: (today, today)),
+        (r"\byesterday\b", lambda m: _calendar_period(today, "last", "day")),
+        # on monday / last friday
+        (rf"\b(?:(last|previous)\s+|on\s+)?{_WEEKDAY}\b", lambda m: _weekday(today, m[2], m[1] is not None)),
+        (rf"\b(?:last|past|previous|the\s+last|the\s+past)\s+{_COUNT}\s+{UNITS}\b",
+         lambda m: (_back(today, _count(m[1]), m[2]), today)),
+        (rf"\b{_COUNT}\s+{UNITS}\s+ago\b", lambda m: _ago(today, _count(m[1]), m[2])),
+        (rf"\b(?:the\s+)?past\s+{UNITS}\b", lambda m: (_back(today, 1, m[1]), today)),
+        (rf"\b(this|current|last|previous)\s+{UNITS}\b",
+         lambda m: _calendar_period(today, "this" if m[1] in ("this", "current") else "last", m[2])),
+        (rf"\b(?:in|during|for|of|last)\s+{_MONTH}(?:\s+{_YEAR})?\b", lambda m: _month_or_date(m[1], today, m[2])),
+        (rf"\b{_MONTH}\s+{_YEAR}\b", lambda m: _month_or_date(m[1], today, m[2])),
+        (rf"\b(?:in|during|for|of)\s+{_YEAR}\b",
+         lambda m: (date(int(m[1]), 1, 1), min(date(int(m[1]), 12, 31), today))),
+    ]
+
+
+def parse_dates(question: str, today: Optional[date] = None) -> Tuple[Optional[date], Optional[date], Optional[Tuple[int, int]]]:
+    """The first date range phrase in ``question`` as (start, end, span of the phrase)."""
+    today = today or date.today()
+    text = question.lower()
+    for pattern, resolve in _rules(today):
+        match = re.search(pattern, text)
+        if match is None:
+            continue
+        try:
+            start, end = resolve(match)
+        except (ValueError, KeyError):
+            continue  # e.g. 2025-02-30
+        if start > end:
+            start, end = end, start
+        return start, end, match.span()
+    return None, None, None
+
+
+def extract_keywords(text: str) -> List[str]:
+    keywords = []
+    for word in re.findall(r"[a-z0-9][a-z0-9_\-]*[a-z0-9]|[a-z0-9]", text.lower()):
+        if word in STOPWORDS or word.isdigit() or len(word) < 2 or word in keywords:
+            continue
+        keywords.append(word)
+    return keywords
+
+
+def parse_locally(question: str, today: Optional[date] = None) -> Dict:
+    """Dates, project and keywords without an LLM, plus how sure the parse is (0-1).
+
+    Confidence drops when the question has time words that no rule
+    resolved (e.g. "before the release") or names a project that is not in
+    the ``Projects`` table.
+    """
+    today = today or date.today()
+    start, end, span = parse_dates(question, today)
+    rest = (question if span is None else question[:span[0]] + " " + question[span[1]:]).lower()
+    project_name = get_project_index().match(question)
+    if project_name:
+        # its words are neither keywords nor time words ("Website 2024")
+        rest = re.sub(r"[^a-z0-9]+".join(re.findall(r"[a-z0-9]+", project_name.lower())), " ", rest)
+
+    confidence = 1.0
+    if TEMPORAL_CUES.search(rest):
+        confidence *= 0.4
+    if project_name is None and PROJECT_CUES.search(question.lower()):
+        confidence *= 0.4
+    return {
+        "project_name": project_name,
+        "start_date": start.isoformat() if start else None,
+        "end_date": end.isoformat() if end else None,
+        "keywords": extract_keywords(rest),
+        "confidence": round(confidence, 2),
+        "source": "local",
+    }
+
+
+# -------- LLM parser --------
+def parse_with_llm(question: str) -> dict:
+    prompt = get_template().invoke({"question": question,"today":str(datetime.now().date())})
+    response = get_llm().invoke(prompt)
+    if hasattr(response, "content"):
         text = response.content
     elif isinstance(response, dict) and "content" in response:
         text = response["content"]
@@ -51,3 +271,52 @@ def parse_user_query(question: str) -> dict:
         }
 
     return parsed_json
+
+
+class ParserStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local = 0
+        self.llm = 0
+        self.llm_failures = 0
+
+    def record(self, source: str, failed: bool = False):
+        with self._lock:
+            if source == "local":
+                self.local += 1
+            else:
+                self.llm += 1
+                self.llm_failures += int(failed)
+
+    def stats(self) -> Dict:
+        total = self.local + self.llm
+        return {
+            "local": self.local,
+            "llm": self.llm,
+            "llm_failures": self.llm_failures,
+            "local_ratio": round(self.local / total, 4) if total else 0.0,
+        }
+
+
+parser_stats = ParserStats()
+
+
+def parse_user_query(question: str) -> dict:
+    """Parse locally; ask the LLM only when the local parse is not confident enough.
+
+    A failed or unparseable LLM answer falls back to the local result.
+    """
+    local = parse_locally(question)
+    if local["confidence"] >= QUERY_PARSER_MIN_CONFIDENCE or not QUERY_PARSER_LLM_FALLBACK:
+        parser_stats.record("local")
+        return local
+
+    try:
+        parsed = parse_with_llm(question)
+    except Exception:
+        parsed = {"error": "llm call failed"}
+    if not isinstance(parsed, dict) or "error" in parsed:
+        parser_stats.record("llm", failed=True)
+        return local
+    parser_stats.record("llm")
+    return {**parsed, "confidence": local["confidence"], "source": "llm"}